@@ -0,0 +1,175 @@
+"""
+Benchmark cases for the core orchestration engine.
+
+Each case is registered with @case and returns (fn, ops): fn runs one round,
+ops is how many units of work (node steps, batch items) one round performs.
+Cases with kind="memory" return the memory (bytes or blocks) a run keeps per
+step instead of a callable to time.
+"""
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import (
+    Node, BatchNode, ParallelBatchNode, Flow, BatchFlow,
+    AsyncNode, AsyncParallelBatchNode, AsyncFlow
+)
+
+CASES = {}
+
+def case(name, kind="speed"):
+    def register(fn):
+        CASES[name] = (fn, kind)
+        return fn
+    return register
+
+# --- Node definitions ---
+
+class Step(Node):
+    pass
+
+class DecideAction(Node):
+    def post(self, shared, prep_res, exec_res):
+        shared["steps"] -= 1
+        return "search" if shared["steps"] > 0 else "answer"
+
+class Search(Node):
+    def post(self, shared, prep_res, exec_res):
+        return "decide"
+
+class Double(BatchNode):
+    def prep(self, shared): return shared["items"]
+    def exec(self, item): return item * 2
+
+class SlowDouble(ParallelBatchNode):
+    def prep(self, shared): return shared["items"]
+    def exec(self, item):
+        time.sleep(0.005)
+        return item * 2
+
+class AsyncSlowDouble(AsyncParallelBatchNode):
+    async def prep_async(self, shared): return shared["items"]
+    async def exec_async(self, item):
+        await asyncio.sleep(0.01)
+        return item * 2
+
+class Count(Node):
+    def post(self, shared, prep_res, exec_res):
+        shared["count"] += 1
+
+class Inner(BatchFlow):
+    def prep(self, shared): return [{"j": j} for j in range(100)]
+
+class Outer(BatchFlow):
+    def prep(self, shared): return [{"i": i} for i in range(100)]
+
+# --- Flow builders ---
+
+def linear_chain(n):
+    nodes = [Step() for _ in range(n)]
+    for a, b in zip(nodes, nodes[1:]):
+        a >> b
+    return Flow(start=nodes[0])
+
+def agent_loop():
+    decide, search = DecideAction(), Search()
+    decide - "search" >> search
+    decide - "answer" >> Step()
+    search - "decide" >> decide
+    return Flow(start=decide)
+
+def deep_nesting(depth):
+    flow = Flow(start=Step())
+    for _ in range(depth - 1):
+        flow = Flow(start=flow)
+    return flow
+
+# --- Cases ---
+
+@case("linear_chain_1000")
+def bench_linear_chain():
+    flow = linear_chain(1000)
+    return lambda: flow.run({}), 1000
+
+@case("linear_chain_1000_compiled")
+def bench_linear_chain_compiled():
+    flow = linear_chain(1000).compile()
+    return lambda: flow.run({}), 1000
+
+@case("agent_loop_5000")
+def bench_agent_loop():
+    flow = agent_loop()
+    return lambda: flow.run({"steps": 2500}), 5000
+
+@case("agent_loop_5000_compiled")
+def bench_agent_loop_compiled():
+    flow = agent_loop().compile()
+    return lambda: flow.run({"steps": 2500}), 5000
+
+@case("deep_nesting_200")
+def bench_deep_nesting():
+    flow = deep_nesting(200)
+    return lambda: flow.run({}), 200
+
+@case("wide_batch_10000")
+def bench_wide_batch():
+    node = Double()
+    items = list(range(10000))
+    return lambda: node.run({"items": items}), 10000
+
+@case("nested_batch_flow_100x100")
+def bench_nested_batch_flow():
+    flow = Outer(start=Inner(start=Count()))
+    return lambda: flow.run({"count": 0}), 10000
+
+@case("thread_batch_200x5ms")
+def bench_thread_batch():
+    node = SlowDouble(max_workers=50)
+    items = list(range(200))
+    return lambda: node.run({"items": items}), 200
+
+@case("async_fanout_1000x10ms")
+def bench_async_fanout():
+    flow = AsyncFlow(start=AsyncSlowDouble())
+    items = list(range(1000))
+    return lambda: asyncio.run(flow.run_async({"items": items})), 1000
+
+@case("async_fanout_1000x10ms_bounded")
+def bench_async_fanout_bounded():
+    flow = AsyncFlow(start=AsyncSlowDouble(max_concurrency=100))
+    items = list(range(1000))
+    return lambda: asyncio.run(flow.run_async({"items": items})), 1000
+
+def retained_per_step(measure):
+    """Growth of `measure()` per agent-loop step that outlives the run.
+
+    Two runs of different lengths are compared so that fixed costs (the copied
+    nodes, the shared dict, interpreter caches) cancel out; a flow that keeps
+    nothing per step scores 0.
+    """
+    flow, steps = agent_loop(), 5000
+    flow.run({"steps": 10})  # Warm up caches outside the measurement
+    def grown(n):
+        gc.collect()
+        before = measure()
+        shared = {"steps": n // 2}
+        flow.run(shared)
+        gc.collect()
+        return measure() - before
+    return (grown(2 * steps) - grown(steps)) / steps
+
+@case("agent_loop_bytes_per_step", kind="memory")
+def bench_memory_per_step():
+    tracemalloc.start()
+    try:
+        return retained_per_step(lambda: tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+
+@case("agent_loop_blocks_per_step", kind="memory")
+def bench_blocks_per_step():
+    return retained_per_step(sys.getallocatedblocks)
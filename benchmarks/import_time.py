@@ -0,0 +1,65 @@
+"""
+Measure how long importing PocketFlow takes in a fresh interpreter.
+
+Usage:
+    python benchmarks/import_time.py                        # pocketflow, pocketflow_tools
+    python benchmarks/import_time.py pocketflow --repeat 20
+    python benchmarks/import_time.py --budget-ms 5
+
+Each run starts a new `python -X importtime -c "import <module>"` and reads
+the cumulative time of the top-level module. Bytecode is compiled first, so the
+numbers reflect a warm install, not the first import after editing a file.
+Prints the median and the slowest imports of the median run, and exits with
+status 1 when a median is over the budget.
+"""
+import argparse
+import compileall
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+BUDGET_MS = 10.0
+
+def import_times(module):
+    """Run one fresh import and return {name: (self_us, cumulative_us)}."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         env=env, capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def measure(module, repeat):
+    """Return the import times of the median run."""
+    compileall.compile_dir(str(ROOT / module), quiet=1)
+    runs = sorted((import_times(module) for _ in range(repeat)), key=lambda t: t[module][1])
+    return runs[len(runs) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=["pocketflow", "pocketflow_tools"])
+    parser.add_argument("--repeat", type=int, default=10, help="fresh interpreters per module (default: 10)")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help=f"budget per module (default: {BUDGET_MS})")
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list (default: 8)")
+    args = parser.parse_args()
+
+    over = []
+    for module in args.modules:
+        times = measure(module, args.repeat)
+        total_ms = times[module][1] / 1000
+        status = "ok" if total_ms <= args.budget_ms else "OVER BUDGET"
+        print(f"{module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms) {status}")
+        for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda kv: -kv[1][0])[:args.top]:
+            print(f"  {self_us / 1000:7.2f} ms self {cumulative_us / 1000:7.2f} ms total  {name}")
+        if total_ms > args.budget_ms:
+            over.append(module)
+    sys.exit(1 if over else 0)
+
+if __name__ == "__main__":
+    main()
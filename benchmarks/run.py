@@ -0,0 +1,77 @@
+"""
+Run the core benchmark suite and compare it against a stored baseline.
+
+Usage:
+    python benchmarks/run.py                      # run and compare with baseline.json
+    python benchmarks/run.py --save               # run and overwrite baseline.json
+    python benchmarks/run.py -k agent --repeat 3  # only cases whose name contains "agent"
+
+Speed cases report ops/sec (higher is better); memory cases report
+bytes or blocks kept per step (lower is better). Exits with status 1 when any case is
+worse than the baseline by more than --threshold.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from cases import CASES
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+def measure(name, repeat):
+    setup, kind = CASES[name]
+    if kind == "memory":
+        return min(setup() for _ in range(repeat))
+    fn, ops = setup()
+    fn()  # Warm-up round
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return ops / best
+
+def compare(results, baseline, threshold):
+    """Print a comparison table and return the names of regressed cases."""
+    regressions = []
+    print(f"{'case':<36}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, value in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:<36}{'-':>14}{value:>14,.1f}{'new':>10}")
+            continue
+        higher_is_better = CASES[name][1] == "speed"
+        change = (value - old) / old if old else (float("inf") if value > old else 0.0)
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<36}{old:>14,.1f}{value:>14,.1f}{change:>+10.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="PocketFlow core benchmarks")
+    parser.add_argument("-k", default="", help="Only run cases whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {name: measure(name, args.repeat) for name in CASES if args.k in name}
+    stored = json.loads(BASELINE.read_text()) if BASELINE.exists() else {"results": {}}
+
+    if args.save:
+        stored["results"].update(results)
+        stored["machine"] = f"{platform.python_implementation()} {platform.python_version()} on {platform.machine()}"
+        BASELINE.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"Saved {len(results)} results to {BASELINE.name}")
+    regressions = compare(results, {} if args.save else stored["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
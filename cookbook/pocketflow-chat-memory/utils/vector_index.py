@@ -1,8 +1,67 @@
 import numpy as np
-import faiss
 
-def create_index(dimension=1536):
-    return faiss.IndexFlatL2(dimension)
+try:
+    import faiss
+except ImportError:  # Fall back to exact NumPy search below
+    faiss = None
+
+class VectorIndex:
+    """Exact cosine-similarity search in plain NumPy, used when faiss isn't installed.
+
+    Follows the faiss.IndexFlatL2 interface (ntotal, add, search). Rows are normalized
+    on add and kept in one preallocated float32 matrix that doubles when full. search()
+    scores a whole batch of queries with a single matmul and picks the top k with
+    argpartition. Distances are squared L2 between the normalized vectors (2 - 2·cosine).
+    """
+
+    def __init__(self, dimension, capacity=256):
+        self.d = dimension
+        self.ntotal = 0
+        self._matrix = np.empty((capacity, dimension), dtype=np.float32)
+
+    def _normalize(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.d)
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    def add(self, vectors):
+        vectors = self._normalize(vectors)
+        end = self.ntotal + len(vectors)
+        if end > len(self._matrix):
+            grown = np.empty((max(end, 2 * len(self._matrix)), self.d), dtype=np.float32)
+            grown[:self.ntotal] = self._matrix[:self.ntotal]
+            self._matrix = grown
+        self._matrix[self.ntotal:end] = vectors
+        self.ntotal = end
+
+    def search(self, queries, k):
+        """Return (distances, indices), each [M, k], nearest first; k is capped at ntotal"""
+        queries = self._normalize(queries)
+        k = min(k, self.ntotal)
+        scores = queries @ self._matrix[:self.ntotal].T
+        top = np.argpartition(scores, self.ntotal - k, axis=1)[:, self.ntotal - k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return 2 - 2 * np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+def create_index(dimension=1536, kind="flat", m=32, ef_construction=40):
+    """Create an empty index.
+
+    Memories are added one at a time, so only kinds that need no training fit here:
+    - "flat": exact search; cost grows linearly with the number of memories
+    - "hnsw": approximate graph search (m links per vector); stays fast on long histories
+    Without faiss, "flat" is served by VectorIndex.
+    """
+    if faiss is None:
+        if kind != "flat":
+            raise ImportError(f"Index kind {kind!r} needs faiss (pip install faiss-cpu)")
+        return VectorIndex(dimension)
+    if kind == "flat":
+        return faiss.IndexFlatL2(dimension)
+    if kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, m)
+        index.hnsw.efConstruction = ef_construction
+        return index
+    raise ValueError(f"Unknown index kind {kind!r}; expected 'flat' or 'hnsw'")
 
 def add_vector(index, vector):
     # Make sure the vector is a numpy array with the right shape for FAISS
@@ -14,13 +73,14 @@ def add_vector(index, vector):
     # Return the position (index.ntotal is the total number of vectors in the index)
     return index.ntotal - 1
 
-def search_vectors(index, query_vector, k=1):
+def search_vectors(index, query_vector, k=1, ef_search=None):
     """Search for the k most similar vectors to the query vector
     
     Args:
         index: The FAISS index
         query_vector: The query vector (numpy array or list)
         k: Number of results to return (default: 1)
+        ef_search: HNSW search width; higher means better recall, slower queries (default: keep the index's)
         
     Returns:
         tuple: (indices, distances) where:
@@ -35,6 +95,11 @@ def search_vectors(index, query_vector, k=1):
     # Make sure the query is a numpy array with the right shape for FAISS
     query_vector = np.array(query_vector).reshape(1, -1).astype(np.float32)
     
+    if ef_search is not None:
+        if faiss is None:
+            raise ImportError("ef_search needs a faiss HNSW index (pip install faiss-cpu)")
+        index.hnsw.efSearch = max(ef_search, k)
+    
     # Search the index
     distances, indices = index.search(query_vector, k)
     
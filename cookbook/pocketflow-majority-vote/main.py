@@ -1,16 +1,16 @@
 import argparse
-from pocketflow import BatchNode, Flow
-import collections
+import asyncio
+from pocketflow import AsyncQuorumBatchNode, AsyncFlow
 from utils import call_llm
 import yaml
 
-class MajorityVoteNode(BatchNode):
-    def prep(self, shared):
+class MajorityVoteNode(AsyncQuorumBatchNode):
+    async def prep_async(self, shared):
         question = shared.get("question", "(No question provided)")
         attempts_count = shared.get("num_tries", 3)
         return [question for _ in range(attempts_count)]
 
-    def exec(self, single_question: str):
+    async def exec_async(self, single_question: str):
         prompt = f"""
 You are a helpful assistant. Please answer the user's question below.
 Question: {single_question}
@@ -21,7 +21,7 @@ thinking: |
     (Your thinking process here)
 answer: 0.123 # Final answer as a decimal with 3 decimal places
 ```"""
-        raw_response = call_llm(prompt)
+        raw_response = await asyncio.to_thread(call_llm, prompt)
         yaml_part = raw_response.split("```yaml")[1].split("```")[0].strip()
         parsed = yaml.safe_load(yaml_part)
 
@@ -32,22 +32,19 @@ answer: 0.123 # Final answer as a decimal with 3 decimal places
         # Return only the 'answer' field for the majority vote.
         return str(parsed['answer'])
     
-    def exec_fallback(self, prep_res, exc):
+    async def exec_fallback_async(self, prep_res, exc):
+        # Failed attempts abstain from the vote
         return None
 
-    def post(self, shared, prep_res, exec_res_list):
-        # Count frequency for non-None answers
-        exec_res_list = [res for res in exec_res_list if res is not None]
-        counter = collections.Counter(exec_res_list)
-        best_answer, freq = counter.most_common(1)[0]
-
-        # Store final
+    async def post_async(self, shared, prep_res, best_answer):
+        # Answers are tallied as they arrive; attempts stop once the majority is decided
         shared["majority_answer"] = best_answer
 
         print("========================")
-        print("All structured answers:", exec_res_list)
+        print("All structured answers:", [res for res in self.results if res is not None])
         print("Majority vote =>", best_answer)
-        print("Frequency =>", freq)
+        print("Frequency =>", self.votes[best_answer])
+        print("Attempts skipped =>", self.cancelled)
         print("========================")
 
         # End the flow
@@ -69,8 +66,8 @@ if __name__ == "__main__":
     }
 
     majority_node = MajorityVoteNode()
-    flow = Flow(start=majority_node)
-    flow.run(shared)
+    flow = AsyncFlow(start=majority_node)
+    asyncio.run(flow.run_async(shared))
 
     print("\n=== Final Answer ===")
     print(shared["majority_answer"])
@@ -0,0 +1,68 @@
+import numpy as np
+
+from vector_index import VectorIndex
+
+try:
+    import faiss
+except ImportError:  # Exact search still works through VectorIndex; the ANN kinds need faiss
+    faiss = None
+
+# Index kinds and their build-time parameters:
+# - flat:     exact search, O(N·d) per query
+# - ivf_flat: nlist clusters; a query scans the nprobe nearest ones
+# - ivf_pq:   IVF with product-quantized vectors (m sub-vectors of nbits each), ~d*4/m times smaller
+# - hnsw:     graph with m links per node; efSearch sets how wide a query explores
+INDEX_KINDS = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+def create_index(kind, dim, nlist=1024, m=None, nbits=8, ef_construction=40):
+    """Create an empty (possibly untrained) CPU index of the given kind"""
+    if faiss is None:
+        if kind != "flat":
+            raise ImportError(f"Index kind {kind!r} needs faiss (pip install faiss-cpu)")
+        return VectorIndex(dim)
+    if kind == "flat":
+        return faiss.IndexFlatL2(dim)
+    if kind == "ivf_flat":
+        return faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+    if kind == "ivf_pq":
+        m = m or 16
+        if dim % m:
+            raise ValueError(f"ivf_pq needs dim ({dim}) divisible by m ({m})")
+        return faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, nlist, m, nbits)
+    if kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, m or 32)
+        index.hnsw.efConstruction = ef_construction
+        return index
+    raise ValueError(f"Unknown index kind {kind!r}; expected one of {INDEX_KINDS}")
+
+def min_train_size(kind, nlist=1024, nbits=8, **params):
+    """Fewest vectors needed to train an index of this kind (0 if it needs no training)"""
+    if kind == "ivf_flat":
+        return nlist
+    if kind == "ivf_pq":
+        return max(nlist, 2 ** nbits)
+    return 0
+
+def build_index(kind, vectors, train_size=100_000, seed=0, **params):
+    """Create an index, train it on a sample of `vectors` if needed, and add them all"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = create_index(kind, vectors.shape[1], **params)
+    if not index.is_trained:
+        if len(vectors) < min_train_size(kind, **params):
+            raise ValueError(f"{kind} needs at least {min_train_size(kind, **params)} vectors to train, got {len(vectors)}")
+        sample = vectors
+        if len(vectors) > train_size:
+            sample = vectors[np.sort(np.random.default_rng(seed).choice(len(vectors), train_size, replace=False))]
+        index.train(sample)
+    index.add(vectors)
+    return index
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """Set query-time knobs: more nprobe / efSearch means higher recall and lower QPS"""
+    if faiss is None and (nprobe is not None or ef_search is not None):
+        raise ImportError("nprobe and ef_search need a faiss index (pip install faiss-cpu)")
+    if nprobe is not None:
+        faiss.extract_index_ivf(index).nprobe = nprobe
+    if ef_search is not None:
+        index.hnsw.efSearch = ef_search
+    return index
@@ -0,0 +1,84 @@
+"""
+Compare ANN index kinds on a synthetic corpus: recall@k against queries per second.
+
+Usage:
+    python bench_ann.py                          # 100k vectors, d=128, k=10
+    python bench_ann.py --n 1000000 --d 256 --k 5
+    python bench_ann.py --kinds hnsw ivf_flat --threads 1
+
+The corpus is clustered Gaussian data scaled to unit length (like embeddings, it
+isn't uniform). Exact neighbours come from a flat index; each ANN index is built
+once and then queried at several nprobe / efSearch settings. The "numpy" row is
+the faiss-free exact VectorIndex, for comparison. Runs on CPU only.
+"""
+import argparse
+import time
+
+import numpy as np
+import faiss
+
+from ann import INDEX_KINDS, build_index, set_search_params
+from vector_index import VectorIndex, normalize
+
+# Build parameters and the query-time knob to sweep for each kind
+CONFIGS = {
+    "flat": ({}, None, [None]),
+    "ivf_flat": ({"nlist": 1024}, "nprobe", [1, 4, 16, 64]),
+    "ivf_pq": ({"nlist": 1024, "m": 16, "nbits": 8}, "nprobe", [1, 4, 16, 64]),
+    "hnsw": ({"m": 32, "ef_construction": 40}, "ef_search", [16, 32, 64, 128]),
+}
+
+def synthetic_corpus(n, d, queries, clusters=256, seed=0):
+    """Return unit-length (corpus, queries) drawn around shared random cluster centres"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, d)).astype(np.float32)
+    def sample(count):
+        return normalize(centres[rng.integers(clusters, size=count)] + 0.5 * rng.normal(size=(count, d)), d)
+    return sample(n), sample(queries)
+
+def recall_at_k(found, truth):
+    """Fraction of the true top-k neighbours present in the returned top-k, averaged over queries"""
+    return np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)])
+
+def timed_search(index, queries, k):
+    start = time.perf_counter()
+    _, found = index.search(queries, k)
+    return found, len(queries) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000, help="corpus size (default: 100000)")
+    parser.add_argument("--d", type=int, default=128, help="dimension (default: 128)")
+    parser.add_argument("--queries", type=int, default=1000, help="number of queries (default: 1000)")
+    parser.add_argument("--k", type=int, default=10, help="neighbours per query (default: 10)")
+    parser.add_argument("--kinds", nargs="*", default=list(INDEX_KINDS), choices=INDEX_KINDS)
+    parser.add_argument("--threads", type=int, help="FAISS OpenMP threads (default: all cores)")
+    args = parser.parse_args()
+    if args.threads:
+        faiss.omp_set_num_threads(args.threads)
+
+    corpus, queries = synthetic_corpus(args.n, args.d, args.queries)
+    truth = build_index("flat", corpus).search(queries, args.k)[1]
+
+    print(f"{args.n} vectors, d={args.d}, {args.queries} queries, k={args.k}")
+    print(f"{'index':<10} {'build s':>8} {'knob':>14} {'recall@k':>9} {'QPS':>10}")
+    start = time.perf_counter()
+    index = VectorIndex(args.d)
+    index.add(corpus)
+    build_s = time.perf_counter() - start
+    found, qps = timed_search(index, queries, args.k)
+    print(f"{'numpy':<10} {build_s:>8.2f} {'-':>14} {recall_at_k(found, truth):>9.3f} {qps:>10.0f}")
+    for kind in args.kinds:
+        build_params, knob, values = CONFIGS[kind]
+        start = time.perf_counter()
+        index = build_index(kind, corpus, **build_params)
+        build_s = time.perf_counter() - start
+        for value in values:
+            if knob:
+                set_search_params(index, **{knob: value})
+            found, qps = timed_search(index, queries, args.k)
+            label = f"{knob}={value}" if knob else "-"
+            print(f"{kind:<10} {build_s:>8.2f} {label:>14} {recall_at_k(found, truth):>9.3f} {qps:>10.0f}")
+
+if __name__ == "__main__":
+    main()
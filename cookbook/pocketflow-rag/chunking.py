@@ -0,0 +1,44 @@
+import hashlib
+import re
+from collections import deque
+
+# A sentence ends at . ! or ? followed by whitespace, or at a line break
+_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\s*\n\s*")
+
+def content_hash(text):
+    """Short, stable fingerprint of a document or chunk"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def iter_sentences(text):
+    """Yield (start, end) spans of the sentences in text, without surrounding whitespace"""
+    start, stop = len(text) - len(text.lstrip()), len(text.rstrip())
+    for match in _BOUNDARY.finditer(text):
+        if match.start() > start:
+            yield start, match.start()
+        start = match.end()
+    if start < stop:
+        yield start, stop
+
+def chunk_text(text, max_chars=2000, overlap=200):
+    """Yield chunks of whole sentences, each at most max_chars long.
+
+    Each chunk starts with the trailing sentences (up to `overlap` chars) of the one before,
+    so a fact split across a boundary is still whole in one chunk. Sentences longer than
+    max_chars are cut into pieces. Chunks are slices of text, so formatting is kept, and
+    they are produced lazily: a long document is never split into a list up front.
+    """
+    window, fresh = deque(), False
+    for start, end in iter_sentences(text):
+        for piece_start in range(start, end, max_chars):
+            span = (piece_start, min(piece_start + max_chars, end))
+            if window and span[1] - window[0][0] > max_chars:
+                if fresh:
+                    yield text[window[0][0]:window[-1][1]]
+                    fresh = False
+                # Carry the trailing sentences that fit in `overlap` into the next chunk
+                while window and (window[-1][1] - window[0][0] > overlap or span[1] - window[0][0] > max_chars):
+                    window.popleft()
+            window.append(span)
+            fresh = True
+    if fresh:
+        yield text[window[0][0]:window[-1][1]]
@@ -4,7 +4,8 @@ from nodes import EmbedDocumentsNode, CreateIndexNode, EmbedQueryNode, RetrieveD
 def get_offline_flow():
     # Create offline flow for document indexing
     chunk_docs_node = ChunkDocumentsNode()
-    embed_docs_node = EmbedDocumentsNode()
+    # Batches are embedded concurrently; each retry re-sends only its own batch
+    embed_docs_node = EmbedDocumentsNode(max_retries=3, wait=1, max_workers=4)
     create_index_node = CreateIndexNode()
     
     # Connect the nodes
@@ -16,7 +17,8 @@ def get_offline_flow():
 def get_online_flow():
     # Create online flow for document retrieval and answer generation
     embed_query_node = EmbedQueryNode()
-    retrieve_doc_node = RetrieveDocumentNode()
+    # Ten candidates, reranked by keyword match, packed into ~1500 prompt tokens
+    retrieve_doc_node = RetrieveDocumentNode(top_k=10, rerank="bm25", max_context_tokens=1500)
     generate_answer_node = GenerateAnswerNode()
     
     # Connect the nodes
@@ -0,0 +1,170 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from ann import build_index, faiss
+from chunking import content_hash
+
+class IndexStore:
+    """Append-only vector store on disk, loaded memory-mapped.
+
+    A store directory holds:
+    - vectors.f32: float32 rows, back to back (read with np.memmap)
+    - texts.bin:   UTF-8 chunk texts, back to back
+    - offsets.i64: int64 byte offsets into texts.bin, one per chunk plus a final end offset
+    - index.faiss: the search index over all vectors (only with faiss installed;
+                   otherwise an exact NumPy index is rebuilt from vectors.f32 on load)
+    - meta.json:   dim and count; written last, so a crash mid-append is ignored
+    - manifest.json: which documents are indexed, and their rows (see Manifest)
+    """
+
+    def __init__(self, path, dim=None):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta = self.path / "meta.json"
+        self.meta = json.loads(meta.read_text()) if meta.exists() else {"dim": dim, "count": 0}
+        if dim is not None and self.meta["dim"] not in (None, dim):
+            raise ValueError(f"Store at {self.path} has dim {self.meta['dim']}, not {dim}")
+        self._vectors = self._offsets = self._blob = None
+
+    def __len__(self):
+        return self.meta["count"]
+
+    @property
+    def dim(self):
+        return self.meta["dim"]
+
+    @property
+    def vectors(self):
+        """All vectors as a read-only [count, dim] memmap; pages load on first touch"""
+        if self._vectors is None:
+            if not len(self):
+                return np.empty((0, self.dim or 0), dtype=np.float32)
+            self._vectors = np.memmap(self.path / "vectors.f32", dtype=np.float32, mode="r", shape=(len(self), self.dim))
+        return self._vectors
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = np.memmap(self.path / "offsets.i64", dtype=np.int64, mode="r", shape=(len(self) + 1,)) if len(self) else np.zeros(1, dtype=np.int64)
+        return self._offsets
+
+    def text(self, i):
+        """Decode one chunk text without loading the others"""
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        if start == end:
+            return ""
+        if self._blob is None:
+            self._blob = np.memmap(self.path / "texts.bin", dtype=np.uint8, mode="r", shape=(int(self.offsets[-1]),))
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def texts(self, indices):
+        return [self.text(i) for i in indices]
+
+    def append(self, vectors, texts):
+        """Add vectors and their texts; existing data is never rewritten"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(vectors) != len(texts):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(texts)} texts")
+        if self.dim is None:
+            self.meta["dim"] = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Store at {self.path} has dim {self.dim}, got {vectors.shape[1]}")
+        encoded = [t.encode("utf-8") for t in texts]
+        end = int(self.offsets[-1])
+        offsets = end + np.cumsum([0] + [len(b) for b in encoded], dtype=np.int64)
+        if len(self):
+            # The first offset of the new chunks is the current end, already on disk
+            offsets, offsets_at = offsets[1:], (len(self) + 1) * 8
+        else:
+            offsets_at = 0
+        self._write(self.path / "vectors.f32", vectors.tobytes(), len(self) * self.dim * 4)
+        self._write(self.path / "texts.bin", b"".join(encoded), end)
+        self._write(self.path / "offsets.i64", offsets.tobytes(), offsets_at)
+        self._commit(count=len(self) + len(vectors))
+
+    def _write(self, path, data, at):
+        # Drop leftovers of an interrupted append, then write after the committed end
+        with open(path, "ab") as f:
+            f.truncate(at)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _commit(self, **meta):
+        self.meta.update(meta)
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(self.meta))
+        os.replace(tmp, self.path / "meta.json")
+        self._vectors = self._offsets = self._blob = None
+
+    def load_index(self, kind="flat", **params):
+        """Load the saved index, adding any vectors appended since it was written.
+
+        Without a saved index, build one of `kind` (see ann.py) over all stored vectors.
+        A saved index keeps its own kind; new vectors go into its existing IVF lists or graph.
+        """
+        file = self.path / "index.faiss"
+        if faiss is None or not file.exists():
+            return build_index(kind, self.vectors, **params)
+        index = faiss.read_index(str(file))
+        if index.ntotal < len(self):
+            index.add(np.asarray(self.vectors[index.ntotal:]))
+        return index
+
+    def save_index(self, index):
+        if faiss is None:
+            return
+        tmp = self.path / "index.faiss.tmp"
+        faiss.write_index(index, str(tmp))
+        os.replace(tmp, self.path / "index.faiss")
+
+class Manifest:
+    """Which documents an IndexStore holds, and in which rows (manifest.json).
+
+    `documents` maps a document id to its content hash and the store rows of its chunks;
+    `chunks` maps each chunk hash to the row that holds it, so identical chunks are stored
+    once and shared. Rows that no current document points to (left over from an edited or
+    removed document) stay in the store but are filtered out at query time (live_rows).
+
+    Chunk hashes can always be recomputed from the store's texts, so chunks appended after
+    the manifest was last saved (e.g. by a run that crashed in between) are picked up on
+    load. Document entries only let unchanged documents skip chunking altogether.
+    """
+
+    def __init__(self, store):
+        self.store, self.file = store, store.path / "manifest.json"
+        data = json.loads(self.file.read_text()) if self.file.exists() else {}
+        if data.get("count", 0) > len(store) or not isinstance(data.get("documents", {}), dict):
+            data = {}  # The store was reset, or the manifest predates row tracking; rebuild from the store
+        self.documents = data.get("documents", {})
+        self.chunks = data.get("chunks", {})
+        start = data.get("count", 0)
+        for row, text in enumerate(store.texts(range(start, len(store))), start):
+            self.chunks.setdefault(content_hash(text), row)
+
+    def add_chunks(self, hashes, start):
+        """Record the rows of chunks just appended to the store, starting at row `start`"""
+        for row, chunk_hash in enumerate(hashes, start):
+            self.chunks.setdefault(chunk_hash, row)
+
+    def update(self, documents, current):
+        """Point new or changed documents ({id: (hash, chunk hashes)}) at their rows,
+        and forget documents whose id is not in `current`"""
+        self.documents = {i: d for i, d in self.documents.items() if i in current}
+        for doc_id, (doc_hash, chunk_hashes) in documents.items():
+            self.documents[doc_id] = {"hash": doc_hash, "rows": sorted({self.chunks[h] for h in chunk_hashes})}
+
+    def live_rows(self):
+        """Boolean mask over the store's rows: True where a row belongs to a current document"""
+        mask = np.zeros(len(self.store), dtype=bool)
+        for doc in self.documents.values():
+            mask[doc["rows"]] = True
+        return mask
+
+    def save(self):
+        tmp = self.file.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"count": len(self.store), "documents": self.documents, "chunks": self.chunks}))
+        os.replace(tmp, self.file)
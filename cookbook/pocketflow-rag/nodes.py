@@ -1,69 +1,104 @@
-from pocketflow import Node, Flow, BatchNode
+from pocketflow import Node, Flow, ParallelBatchNode
 import numpy as np
-import faiss
-from utils import call_llm, get_embedding, fixed_size_chunk
+from index_store import IndexStore, Manifest
+from chunking import chunk_text, content_hash
+from ann import set_search_params
+from rerank import bm25_rank, mmr_rank, pack_context, estimate_tokens
+from utils import call_llm, get_embeddings, batch_texts, EMBEDDING_DIM
 
 # Nodes for the offline flow
-class ChunkDocumentsNode(BatchNode):
+class ChunkDocumentsNode(Node):
     def prep(self, shared):
-        """Read texts from shared store"""
-        return shared["texts"]
+        """Read texts, and the manifest of what the index already holds"""
+        return shared["texts"], Manifest(IndexStore(shared["index_dir"]))
     
-    def exec(self, text):
-        """Chunk a single text into smaller pieces"""
-        return fixed_size_chunk(text)
+    def exec(self, inputs):
+        """Chunk new or changed documents, keeping only chunks not indexed yet.
+
+        Documents are identified by their key if texts is a dict, else by their position.
+        """
+        texts, manifest = inputs
+        items = texts.items() if isinstance(texts, dict) else enumerate(texts)
+        documents, current, chunks, hashes, seen = {}, set(), [], [], set()
+        for doc_id, text in items:
+            doc_id, doc_hash = str(doc_id), content_hash(text)
+            current.add(doc_id)
+            if manifest.documents.get(doc_id, {}).get("hash") == doc_hash:
+                continue
+            # Chunks are hashed as they stream out; duplicates never reach the embedding step
+            documents[doc_id] = (doc_hash, [])
+            for chunk in chunk_text(text):
+                chunk_hash = content_hash(chunk)
+                documents[doc_id][1].append(chunk_hash)
+                if chunk_hash not in manifest.chunks and chunk_hash not in seen:
+                    seen.add(chunk_hash)
+                    chunks.append(chunk)
+                    hashes.append(chunk_hash)
+        return documents, current, chunks, hashes
     
-    def post(self, shared, prep_res, exec_res_list):
-        """Store chunked texts in the shared store"""
-        # Flatten the list of lists into a single list of chunks
-        all_chunks = []
-        for chunks in exec_res_list:
-            all_chunks.extend(chunks)
-        
-        # Replace the original texts with the flat list of chunks
-        shared["texts"] = all_chunks
+    def post(self, shared, prep_res, exec_res):
+        """Replace the texts with the new chunks, and keep their hashes for the index step"""
+        documents, current, chunks, hashes = exec_res
+        shared["texts"], shared["chunk_hashes"] = chunks, hashes
+        shared["manifest"], shared["new_documents"], shared["current_documents"] = prep_res[1], documents, current
         
-        print(f"✅ Created {len(all_chunks)} chunks from {len(prep_res)} documents")
+        skipped = len(current) - len(documents)
+        print(f"✅ Created {len(chunks)} new chunks from {len(documents)} new or changed documents ({skipped} unchanged)")
         return "default"
     
-class EmbedDocumentsNode(BatchNode):
+class EmbedDocumentsNode(ParallelBatchNode):
     def prep(self, shared):
-        """Read texts from shared store and return as an iterable"""
-        return shared["texts"]
+        """Split texts into request-sized batches that share one preallocated matrix"""
+        texts = shared["texts"]
+        embeddings = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        return [(embeddings, start, batch) for start, batch in batch_texts(texts)] or [(embeddings, 0, [])]
     
-    def exec(self, text):
-        """Embed a single text"""
-        return get_embedding(text)
+    def exec(self, inputs):
+        """Embed one batch with a single request, writing rows in place"""
+        embeddings, start, batch = inputs
+        if batch:
+            get_embeddings(batch, out=embeddings[start:start + len(batch)])
+        return len(batch)
     
     def post(self, shared, prep_res, exec_res_list):
         """Store embeddings in the shared store"""
-        embeddings = np.array(exec_res_list, dtype=np.float32)
+        embeddings = prep_res[0][0]
         shared["embeddings"] = embeddings
-        print(f"✅ Created {len(embeddings)} document embeddings")
+        print(f"✅ Created {len(embeddings)} document embeddings in {sum(1 for n in exec_res_list if n)} requests")
         return "default"
 
 class CreateIndexNode(Node):
     def prep(self, shared):
-        """Get embeddings from shared store"""
-        return shared["embeddings"]
+        """Get embeddings, their texts and hashes, the manifest and index settings from shared store"""
+        return (shared["embeddings"], shared["texts"], shared["chunk_hashes"], shared["new_documents"],
+                shared["current_documents"], shared["manifest"], shared.get("index_config") or {})
     
-    def exec(self, embeddings):
-        """Create FAISS index and add embeddings"""
-        print("🔍 Creating search index...")
-        dimension = embeddings.shape[1]
-        
-        # Create a flat L2 index
-        index = faiss.IndexFlatL2(dimension)
+    def exec(self, inputs):
+        """Append new embeddings to the on-disk store and update its FAISS index"""
+        embeddings, texts, hashes, documents, current, manifest, index_config = inputs
+        print("🔍 Updating search index...")
+        store = manifest.store
         
-        # Add the embeddings to the index
-        index.add(embeddings)
+        # Existing vectors stay as they are; the index picks up only the new ones
+        # (or, on the first run, is built and trained over all of them)
+        start = len(store)
+        if texts:
+            store.append(embeddings, texts)
+        index = store.load_index(**index_config)
+        if texts:
+            store.save_index(index)
         
-        return index
+        # Recorded last: a crash before this only means re-chunking, never duplicate rows.
+        # Rows of edited or removed documents stay in the index; live_rows filters them out
+        manifest.add_chunks(hashes, start)
+        manifest.update(documents, current)
+        manifest.save()
+        return store, index, manifest.live_rows()
     
     def post(self, shared, prep_res, exec_res):
-        """Store the index in shared store"""
-        shared["index"] = exec_res
-        print(f"✅ Index created with {exec_res.ntotal} vectors")
+        """Store the index, and which of its rows are current, in shared store"""
+        shared["store"], shared["index"], shared["live_rows"] = exec_res
+        print(f"✅ Index has {exec_res[1].ntotal} vectors ({int(exec_res[2].sum())} current)")
         return "default"
 
 # Nodes for the online flow
@@ -75,8 +110,7 @@ class EmbedQueryNode(Node):
     def exec(self, query):
         """Embed the query"""
         print(f"🔍 Embedding query: {query}")
-        query_embedding = get_embedding(query)
-        return np.array([query_embedding], dtype=np.float32)
+        return get_embeddings([query])
     
     def post(self, shared, prep_res, exec_res):
         """Store query embedding in shared store"""
@@ -84,51 +118,74 @@ class EmbedQueryNode(Node):
         return "default"
 
 class RetrieveDocumentNode(Node):
+    """Fetch the top_k nearest chunks, optionally rerank them ("bm25" or "mmr"),
+    and keep the best ones that fit in max_context_tokens"""
+    def __init__(self, *args, top_k=10, rerank=None, max_context_tokens=1500, **kwargs):
+        super().__init__(*args, **kwargs)
+        if rerank not in (None, "bm25", "mmr"):
+            raise ValueError(f"Unknown rerank {rerank!r}; expected None, 'bm25' or 'mmr'")
+        self.top_k, self.rerank, self.max_context_tokens = top_k, rerank, max_context_tokens
+    
     def prep(self, shared):
-        """Get query embedding, index, and texts from shared store"""
-        return shared["query_embedding"], shared["index"], shared["texts"]
+        """Get query, its embedding, index, chunk store, current rows and search knobs from shared store"""
+        return (shared["query"], shared["query_embedding"], shared["index"], shared["store"],
+                shared.get("live_rows"), shared.get("search_params") or {})
     
     def exec(self, inputs):
-        """Search the index for similar documents"""
+        """Search the index for similar chunks, rerank them and pack them into the budget"""
         print("🔎 Searching for relevant documents...")
-        query_embedding, index, texts = inputs
-        
-        # Search for the most similar document
-        distances, indices = index.search(query_embedding, k=1)
+        query, query_embedding, index, store, live_rows, search_params = inputs
         
-        # Get the index of the most similar document
-        best_idx = indices[0][0]
-        distance = distances[0][0]
+        # Fetch candidates (nprobe / efSearch only apply to IVF / HNSW indexes), skipping rows
+        # of edited or removed documents; fetch more until top_k current chunks are found
+        set_search_params(index, **search_params)
+        k = self.top_k
+        while True:
+            distances, indices = index.search(query_embedding, k)
+            hits = [(int(i), float(d)) for i, d in zip(indices[0], distances[0])
+                    if i >= 0 and (live_rows is None or live_rows[i])]
+            if len(hits) >= self.top_k or k >= index.ntotal:
+                break
+            k *= 2
+        hits = hits[:self.top_k]
+        texts = store.texts([i for i, _ in hits])
         
-        # Get the corresponding text
-        most_relevant_text = texts[best_idx]
+        # Rerank locally: BM25 rewards exact terms (names, codes), MMR drops near-duplicates
+        if self.rerank == "bm25":
+            order = bm25_rank(query, texts)
+        elif self.rerank == "mmr":
+            order = mmr_rank(query_embedding[0], store.vectors[[i for i, _ in hits]])
+        else:
+            order = list(range(len(hits)))
         
-        return {
-            "text": most_relevant_text,
-            "index": best_idx,
-            "distance": distance
-        }
+        # Keep the best chunks that fit in the prompt budget
+        packed = pack_context([texts[j] for j in order], self.max_context_tokens)
+        return [{"text": texts[order[p]], "index": hits[order[p]][0], "distance": hits[order[p]][1]} for p in packed]
     
     def post(self, shared, prep_res, exec_res):
-        """Store retrieved document in shared store"""
-        shared["retrieved_document"] = exec_res
-        print(f"📄 Retrieved document (index: {exec_res['index']}, distance: {exec_res['distance']:.4f})")
-        print(f"📄 Most relevant text: \"{exec_res['text']}\"")
+        """Store retrieved chunks in shared store"""
+        shared["retrieved_documents"] = exec_res
+        print(f"📄 Retrieved {len(exec_res)} chunks (~{sum(estimate_tokens(d['text']) for d in exec_res)} tokens)")
+        for doc in exec_res:
+            preview = " ".join(doc["text"].split())[:80]
+            print(f"   [index: {doc['index']}, distance: {doc['distance']:.4f}] {preview}...")
         return "default"
     
 class GenerateAnswerNode(Node):
     def prep(self, shared):
-        """Get query, retrieved document, and any other context needed"""
-        return shared["query"], shared["retrieved_document"]
+        """Get query, retrieved chunks, and any other context needed"""
+        return shared["query"], shared["retrieved_documents"]
     
     def exec(self, inputs):
         """Generate an answer using the LLM"""
-        query, retrieved_doc = inputs
+        query, retrieved_docs = inputs
+        context = "\n\n".join(f"[{n}] {doc['text']}" for n, doc in enumerate(retrieved_docs, 1))
         
         prompt = f"""
 Briefly answer the following question based on the context provided:
 Question: {query}
-Context: {retrieved_doc['text']}
+Context:
+{context}
 Answer:
 """
         
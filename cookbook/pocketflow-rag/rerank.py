@@ -0,0 +1,67 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from vector_index import normalize
+
+_WORD = re.compile(r"\w+")
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+def estimate_tokens(text):
+    """Rough LLM token count (~4 characters per token for English), no tokenizer needed"""
+    return (len(text) + 3) // 4
+
+def bm25_rank(query, texts, k1=1.5, b=0.75):
+    """Order texts by BM25 score for query; IDF is computed over these texts only.
+
+    Returns positions into texts, best first. Ties keep the input (vector search) order.
+    """
+    docs = [Counter(tokenize(t)) for t in texts]
+    avg_len = sum(sum(d.values()) for d in docs) / max(len(docs), 1) or 1
+    idf = {}
+    for term in set(tokenize(query)):
+        df = sum(1 for d in docs if term in d)
+        idf[term] = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+    scores = []
+    for doc in docs:
+        norm = k1 * (1 - b + b * sum(doc.values()) / avg_len)
+        scores.append(sum(w * doc[t] * (k1 + 1) / (doc[t] + norm) for t, w in idf.items() if t in doc))
+    return sorted(range(len(texts)), key=lambda i: -scores[i])
+
+def mmr_rank(query_vector, vectors, diversity=0.3):
+    """Order vectors by maximal marginal relevance: similar to the query, unlike earlier picks.
+
+    `diversity` (0-1) weighs novelty against relevance; 0 keeps the plain similarity order.
+    Returns positions into vectors, best first.
+    """
+    vectors = normalize(vectors, len(query_vector))
+    relevance = vectors @ normalize(query_vector, len(query_vector))[0]
+    similarity = vectors @ vectors.T
+    order, redundancy = [], np.zeros(len(vectors), dtype=np.float32)
+    remaining = np.ones(len(vectors), dtype=bool)
+    for _ in range(len(vectors)):
+        score = (1 - diversity) * relevance - diversity * redundancy
+        best = int(np.argmax(np.where(remaining, score, -np.inf)))
+        order.append(best)
+        remaining[best] = False
+        # Highest similarity to anything picked so far (the first pick replaces the zeros)
+        redundancy = similarity[best] if len(order) == 1 else np.maximum(redundancy, similarity[best])
+    return order
+
+def pack_context(texts, max_tokens):
+    """Pick texts in the given order while they fit in max_tokens; returns their positions.
+
+    Texts that don't fit are skipped so smaller, lower-ranked ones can still fill the budget.
+    The first text is always included, so an oversized best match is never dropped.
+    """
+    picked, used = [], 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if not picked or used + tokens <= max_tokens:
+            picked.append(i)
+            used += tokens
+    return picked
@@ -2,8 +2,20 @@ import os
 import numpy as np
 from openai import OpenAI
 
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_DIM = 1536
+
+_client = None
+
+def get_client():
+    # One client for the whole process: it keeps a connection pool and is safe to share across threads
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", "your-api-key"))
+    return _client
+
 def call_llm(prompt):    
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", "your-api-key"))
+    client = get_client()
     r = client.chat.completions.create(
         model="gpt-4o",
         messages=[{"role": "user", "content": prompt}]
@@ -11,18 +23,38 @@ def call_llm(prompt):
     return r.choices[0].message.content
 
 def get_embedding(text):
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", "your-api-key"))
-    
-    response = client.embeddings.create(
-        model="text-embedding-ada-002",
-        input=text
+    return get_embeddings([text])[0]
+
+def get_embeddings(texts, out=None):
+    """Embed a list of texts in a single request.
+
+    Rows are written straight into `out` (a float32 array of shape
+    [len(texts), EMBEDDING_DIM]) when given, e.g. a slice of a larger matrix.
+    """
+    response = get_client().embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=list(texts)
     )
-    
-    # Extract the embedding vector from the response
-    embedding = response.data[0].embedding
-    
-    # Convert to numpy array for consistency with other embedding functions
-    return np.array(embedding, dtype=np.float32)
+    if out is None:
+        out = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for item in response.data:
+        out[item.index] = item.embedding
+    return out
+
+def batch_texts(texts, max_items=512, max_chars=400_000):
+    """Yield (start, batch) slices of texts that fit in one embedding request.
+
+    The API caps both the number of inputs and the total tokens per request;
+    max_chars is a cheap stand-in for the token limit (~4 chars per token).
+    """
+    start, size = 0, 0
+    for i, text in enumerate(texts):
+        if i > start and (i - start >= max_items or size + len(text) > max_chars):
+            yield start, texts[start:i]
+            start, size = i, 0
+        size += len(text)
+    if start < len(texts):
+        yield start, texts[start:]
 
 def fixed_size_chunk(text, chunk_size=2000):
     chunks = []
@@ -46,4 +78,7 @@ if __name__ == "__main__":
     oai_emb2 = get_embedding(text2)
     print(f"OpenAI Embedding 1 shape: {oai_emb1.shape}")
     oai_similarity = np.dot(oai_emb1, oai_emb2)
-    print(f"OpenAI similarity between texts: {oai_similarity:.4f}")
\ No newline at end of file
+    print(f"OpenAI similarity between texts: {oai_similarity:.4f}")
+
+    batch = get_embeddings([text1, text2])
+    print(f"Batched embeddings shape: {batch.shape}")
\ No newline at end of file
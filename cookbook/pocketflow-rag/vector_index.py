@@ -0,0 +1,49 @@
+import numpy as np
+
+def normalize(vectors, dim):
+    """Return vectors as a float32 [n, dim] matrix of unit-length rows"""
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, dim)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+class VectorIndex:
+    """Exact cosine-similarity search in plain NumPy, for when faiss isn't installed.
+
+    Follows the faiss.IndexFlatL2 interface (ntotal, add, search). Rows are normalized
+    on add and kept in one preallocated float32 matrix that doubles when full. search()
+    scores a whole batch of queries with a single matmul and picks the top k with
+    argpartition. Distances are squared L2 between the normalized vectors (2 - 2·cosine),
+    so results match IndexFlatL2 on unit-length embeddings such as OpenAI's.
+    """
+
+    is_trained = True
+
+    def __init__(self, dim, capacity=1024):
+        self.d = dim
+        self.ntotal = 0
+        self._matrix = np.empty((capacity, dim), dtype=np.float32)
+
+    @property
+    def vectors(self):
+        return self._matrix[:self.ntotal]
+
+    def add(self, vectors):
+        vectors = normalize(vectors, self.d)
+        end = self.ntotal + len(vectors)
+        if end > len(self._matrix):
+            grown = np.empty((max(end, 2 * len(self._matrix)), self.d), dtype=np.float32)
+            grown[:self.ntotal] = self.vectors
+            self._matrix = grown
+        self._matrix[self.ntotal:end] = vectors
+        self.ntotal = end
+
+    def search(self, queries, k):
+        """Return (distances, indices), each [M, k], nearest first; k is capped at ntotal"""
+        queries = normalize(queries, self.d)
+        k = min(k, self.ntotal)
+        if k == 0:
+            return np.empty((len(queries), 0), dtype=np.float32), np.empty((len(queries), 0), dtype=np.int64)
+        scores = queries @ self.vectors.T
+        top = np.argpartition(scores, self.ntotal - k, axis=1)[:, self.ntotal - k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return 2 - 2 * np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
@@ -1,6 +1,49 @@
-import asyncio, warnings, copy, time
+import time, sys, contextvars
+
+__all__=["add_hook","remove_hook","Hook","Profiler","BaseNode","Node","RetryBudget","RetryPolicy","BatchNode","ParallelBatchNode","StreamBatchNode","ProcessBatchNode",
+    "LRUCache","SQLiteCache","CachedNode","FileCheckpoint","SQLiteCheckpoint","DELETED","SharedStore","Appended","SetDelta","Flow","BatchFlow","ParallelBatchFlow","DAGFlow",
+    "time_left","Hedge","AsyncNode","AsyncBatchNode","RateLimiter","AsyncParallelBatchNode","Stream","AsyncStreamNode","AsyncQuorumBatchNode","AsyncFlow","AsyncDAGFlow","AsyncBatchFlow","AsyncParallelBatchFlow"]
+
+class _LazyModule:
+    def __init__(self,alias,name,ns=None): self.alias,self.name,self.ns=alias,name,globals() if ns is None else ns
+    def __getattr__(self,k): __import__(self.name); m=self.ns[self.alias]=sys.modules[self.name]; return getattr(m,k)
+asyncio,futures,copy,warnings,_isolation=(_LazyModule(a,n) for a,n in [("asyncio","asyncio"),("futures","concurrent.futures"),("copy","copy"),("warnings","warnings"),
+    ("_isolation","pocketflow.isolation")])
+
+# Optional features live in submodules that load on first use, e.g. `from pocketflow import FileCheckpoint`
+_EXTRAS={"Profiler":"profiler",**dict.fromkeys(("RetryBudget","RetryPolicy","Hedge","RateLimiter"),"policies"),
+    **dict.fromkeys(("LRUCache","SQLiteCache","FileCheckpoint","SQLiteCheckpoint","SharedStore"),"storage"),
+    **dict.fromkeys(("CachedNode","StreamBatchNode","ProcessBatchNode","Stream","AsyncStreamNode","AsyncQuorumBatchNode"),"nodes"),**dict.fromkeys(("DAGFlow","AsyncDAGFlow"),"dag"),
+    **dict.fromkeys(("Appended","SetDelta"),"isolation")}
+def __getattr__(name):
+    if name not in _EXTRAS: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    v=globals()[name]=getattr(__import__(f"{__name__}.{_EXTRAS[name]}",fromlist=[name]),name); return v
+
+_hooks=[]
+def add_hook(hook): _hooks.append(hook); return hook
+def remove_hook(hook): _hooks.remove(hook)
+
+class Hook:
+    def before(self,node,phase): pass
+    def after(self,node,phase,token,result,exc=None): pass
+    def on_retry(self,node,exc,attempt,delay): pass
+
+def _hooked(node,phase,fn,*args):
+    hs=tuple(_hooks); ts=[h.before(node,phase) for h in hs]; r=e=None
+    try: r=fn(*args); return r
+    except BaseException as x: e=x; raise
+    finally:
+        for h,t in zip(hs,ts): h.after(node,phase,t,r,e)
+
+async def _hooked_async(node,phase,fn,*args):
+    hs=tuple(_hooks); ts=[h.before(node,phase) for h in hs]; r=e=None
+    try: r=await fn(*args); return r
+    except BaseException as x: e=x; raise
+    finally:
+        for h,t in zip(hs,ts): h.after(node,phase,t,r,e)
 
 class BaseNode:
+    offload=None
     def __init__(self): self.params,self.successors={},{}
     def set_params(self,params): self.params=params
     def next(self,node,action="default"):
@@ -10,7 +53,9 @@ class BaseNode:
     def exec(self,prep_res): pass
     def post(self,shared,prep_res,exec_res): pass
     def _exec(self,prep_res): return self.exec(prep_res)
-    def _run(self,shared): p=self.prep(shared); e=self._exec(p); return self.post(shared,p,e)
+    def _run(self,shared):
+        if _hooks: p=_hooked(self,"prep",self.prep,shared); e=_hooked(self,"exec",self._exec,p); return _hooked(self,"post",self.post,shared,p,e)
+        p=self.prep(shared); e=self._exec(p); return self.post(shared,p,e)
     def run(self,shared): 
         if self.successors: warnings.warn("Node won't run successors. Use Flow.")  
         return self._run(shared)
@@ -24,77 +69,241 @@ class _ConditionalTransition:
     def __rshift__(self,tgt): return self.src.next(tgt,self.action)
 
 class Node(BaseNode):
-    def __init__(self,max_retries=1,wait=0): super().__init__(); self.max_retries,self.wait=max_retries,wait
+    def __init__(self,max_retries=1,wait=0,retry=None): super().__init__(); self.max_retries,self.wait,self.retry=max_retries,wait,retry
     def exec_fallback(self,prep_res,exc): raise exc
+    def _retry_delay(self,exc,attempt):
+        if self.retry: d=self.retry.delay(self.wait,attempt,exc,last=attempt==self.max_retries-1)
+        else: d=None if attempt==self.max_retries-1 else self.wait
+        if d is not None:
+            for h in _hooks: h.on_retry(self,exc,attempt,d)
+        return d
     def _exec(self,prep_res):
         for self.cur_retry in range(self.max_retries):
             try: return self.exec(prep_res)
             except Exception as e:
-                if self.cur_retry==self.max_retries-1: return self.exec_fallback(prep_res,e)
-                if self.wait>0: time.sleep(self.wait)
+                if (d:=self._retry_delay(e,self.cur_retry)) is None: return _hooked(self,"fallback",self.exec_fallback,prep_res,e) if _hooks else self.exec_fallback(prep_res,e)
+                if d>0: time.sleep(d)
 
 class BatchNode(Node):
     def _exec(self,items): return [super(BatchNode,self)._exec(i) for i in (items or [])]
 
+def _timed_exec(node,item): t=time.perf_counter(); r=Node._exec(node,item); return r,time.perf_counter()-t
+
+class ParallelBatchNode(BatchNode):
+    def __init__(self,*args,max_workers=None,**kwargs): super().__init__(*args,**kwargs); self.max_workers=max_workers
+    def _exec(self,items):
+        ctx=contextvars.copy_context()
+        with futures.ThreadPoolExecutor(self.max_workers) as ex: rs=list(ex.map(lambda i:ctx.copy().run(_timed_exec,copy.copy(self),i),items or []))
+        self.latencies=[t for _,t in rs]; return [r for r,_ in rs]
+
+def _visit(slots,nodes,i,p):
+    if sl:=slots[i]:
+        if sl[1] is None: sl[1]={**nodes[i].__dict__,"params":p,**({"cur_retry":0} if isinstance(sl[0],Node) else {})}
+        try:
+            if sl[0].__dict__==sl[1]: return sl[0]
+        except Exception: pass
+    c=copy.copy(nodes[i]); c.set_params(p); slots[i]=[c,sl and sl[1]]; return c
+
 class Flow(BaseNode):
-    def __init__(self,start=None): super().__init__(); self.start_node=start
-    def start(self,start): self.start_node=start; return start
+    checkpoint=restore=batch=None; done=frozenset(); run_plan=False
+    def __init__(self,start=None): super().__init__(); self.start_node,self.plan=start,None
+    def start(self,start): self.start_node,self.plan=start,None; return start
     def get_next_node(self,curr,action):
         nxt=curr.successors.get(action or "default")
         if not nxt and curr.successors: warnings.warn(f"Flow ends: '{action}' not found in {list(curr.successors)}")
         return nxt
+    def _build(self):
+        nodes,idx,todo=[],{},[self.start_node] if self.start_node else []
+        while todo:
+            n=todo.pop()
+            if id(n) not in idx: idx[id(n)]=len(nodes); nodes.append(n); todo.extend(reversed(list(n.successors.values())))
+        self.plan,self.plan_edges=(nodes,[{a:idx[id(s)] for a,s in n.successors.items()} for n in nodes]),[dict(n.successors) for n in nodes]; return nodes
+    def _stale(self): return any(n.successors!=e for n,e in zip(self.plan[0],self.plan_edges))
+    def compile(self):
+        for n in self._build():
+            if isinstance(n,Flow) and not n.plan: n.compile()
+        return self
+    def _next_index(self,i,action):
+        t=self.plan[1][i]; j=t.get(action or "default")
+        if j is None and t: warnings.warn(f"Flow ends: '{action}' not found in {list(t)}")
+        return j
+    def _plan_start(self,p):
+        st=self.restore
+        if st is None or st["batch"]!=self.batch: return (0 if self.plan[0] else None),p,None
+        self.restore=None; return self.plan[1][st["node"]].get(st["action"] or "default"),st["params"],st["action"]
+    def _save(self,i,action,p,shared): self.checkpoint.save({"done":sorted(self.done),"batch":self.batch,"node":i,"action":action,"params":p,"shared":shared})
     def _orch(self,shared,params=None):
-        curr,p,last_action =copy.copy(self.start_node),(params or {**self.params}),None
+        p,last_action=(params or {**self.params}),None
+        if self.plan and self._stale(): self._build()
+        if self.plan:
+            nodes,slots,ck=self.plan[0],[None]*len(self.plan[0]),self.checkpoint; i,p,last_action=self._plan_start(p)
+            while i is not None:
+                last_action=(curr:=_visit(slots,nodes,i,p))._run(shared)
+                if ck: self._save(i,last_action,p,shared)
+                i=self._next_index(i,last_action)
+            return last_action
+        curr=copy.copy(self.start_node)
         while curr: curr.set_params(p); last_action=curr._run(shared); curr=copy.copy(self.get_next_node(curr,last_action))
         return last_action
     def _run(self,shared): p=self.prep(shared); o=self._orch(shared); return self.post(shared,p,o)
     def post(self,shared,prep_res,exec_res): return exec_res
+    def _begin(self,checkpoint,shared,resume):
+        if isinstance(self,ParallelBatchFlow): raise TypeError(f"Checkpointing is not supported for {type(self).__name__}")
+        st=checkpoint.load() if resume else None
+        if st: shared.clear(); shared.update(st["shared"])
+        if not self.plan: self._build(); self.run_plan=True
+        self.checkpoint,self.restore,self.done=checkpoint,st,set(st["done"]) if st else set()
+    def _end(self):
+        if self.run_plan: self.plan,self.run_plan=None,False
+        self.checkpoint=self.restore=self.batch=None; self.done=frozenset()
+    def run(self,shared,checkpoint=None): return self._run_checkpointed(shared,checkpoint,False) if checkpoint else super().run(shared)
+    def resume(self,shared,checkpoint): return self._run_checkpointed(shared,checkpoint,True)
+    def _run_checkpointed(self,shared,checkpoint,resume):
+        self._begin(checkpoint,shared,resume)
+        try: r=super().run(shared)
+        finally: self._end()
+        checkpoint.clear(); return r
 
 class BatchFlow(Flow):
     def _run(self,shared):
         pr=self.prep(shared) or []
-        for bp in pr: self._orch(shared,{**self.params,**bp})
+        for self.batch,bp in enumerate(pr):
+            if self.batch in self.done: continue
+            self._orch(shared,{**self.params,**bp})
+            if self.checkpoint: self.done.add(self.batch)
         return self.post(shared,pr,None)
 
+class _Deleted: __repr__=__reduce__=lambda self:"DELETED"
+DELETED=_Deleted()
+
+class ParallelBatchFlow(BatchFlow):
+    def __init__(self,start=None,max_workers=None,isolate=True,readonly=()): super().__init__(start); self.max_workers,self.isolate,self.readonly=max_workers,isolate,readonly
+    def merge(self,shared,prep_res,updates):
+        for u in updates: _isolation._deep_update(shared,u)
+    def _branches(self,shared,pr): return [(_isolation._Overlay(shared,self.readonly) if self.isolate else shared,{**self.params,**bp}) for bp in pr]
+    def _join(self,shared,pr,branches):
+        if self.isolate: self.merge(shared,pr,[s.changes() for s,_ in branches])
+    def _run(self,shared):
+        pr=self.prep(shared) or []; bs=self._branches(shared,pr)
+        with futures.ThreadPoolExecutor(self.max_workers) as ex: list(ex.map(lambda b:self._orch(*b),bs))
+        self._join(shared,pr,bs); return self.post(shared,pr,None)
+
+_deadline=contextvars.ContextVar("pocketflow_deadline",default=None)
+def time_left():
+    d=_deadline.get(); return None if d is None else max(0.0,d-time.monotonic())
+
+async def _gather(aws):
+    ts=[asyncio.ensure_future(a) for a in aws]
+    try: return await asyncio.gather(*ts)
+    except BaseException:
+        for t in ts: t.cancel()
+        await asyncio.gather(*ts,return_exceptions=True); raise
+
 class AsyncNode(Node):
+    def __init__(self,*args,timeout=None,hedge=None,**kwargs): super().__init__(*args,**kwargs); self.timeout,self.hedge=timeout,hedge
+    def _attempt_timeout(self):
+        t,r=self.timeout,time_left()
+        return t if r is None else r if t is None else min(t,r)
     async def prep_async(self,shared): pass
     async def exec_async(self,prep_res): pass
     async def exec_fallback_async(self,prep_res,exc): raise exc
     async def post_async(self,shared,prep_res,exec_res): pass
     async def _exec(self,prep_res): 
         for i in range(self.max_retries):
-            try: return await self.exec_async(prep_res)
+            try: c=self._hedged(prep_res) if self.hedge else self.exec_async(prep_res); return await (c if (t:=self._attempt_timeout()) is None else asyncio.wait_for(c,t))
             except Exception as e:
-                if i==self.max_retries-1: return await self.exec_fallback_async(prep_res,e)
-                if self.wait>0: await asyncio.sleep(self.wait)
+                if (d:=self._retry_delay(e,i)) is None: return await (_hooked_async(self,"fallback",self.exec_fallback_async,prep_res,e) if _hooks else self.exec_fallback_async(prep_res,e))
+                if d>0: await asyncio.sleep(d)
+    async def _hedged(self,prep_res):
+        h,t=self.hedge,time.monotonic(); ts=[asyncio.ensure_future(self.exec_async(prep_res))]; err=None
+        try:
+            if (d:=h.after()) is not None and not (await asyncio.wait(ts,timeout=d))[0]: ts.append(asyncio.ensure_future(self.exec_async(prep_res))); h.hedged+=1
+            pending=set(ts)
+            while pending:
+                done,pending=await asyncio.wait(pending,return_when=asyncio.FIRST_COMPLETED)
+                for f in done:
+                    if f.exception() is not None: err=err or f.exception(); continue
+                    if f is not ts[0]: h.wins+=1
+                    return f.result()
+            raise err
+        finally:
+            # A primary cut short took at least this long; recording that keeps the slow tail in the history
+            if not ts[0].done() or (not ts[0].cancelled() and ts[0].exception() is None): h.record(time.monotonic()-t)
+            for f in ts: f.cancel()
+            await asyncio.gather(*ts,return_exceptions=True)
     async def run_async(self,shared): 
         if self.successors: warnings.warn("Node won't run successors. Use AsyncFlow.")  
         return await self._run_async(shared)
-    async def _run_async(self,shared): p=await self.prep_async(shared); e=await self._exec(p); return await self.post_async(shared,p,e)
+    async def _run_async(self,shared):
+        if _hooks: p=await _hooked_async(self,"prep",self.prep_async,shared); e=await _hooked_async(self,"exec",self._exec,p); return await _hooked_async(self,"post",self.post_async,shared,p,e)
+        p=await self.prep_async(shared); e=await self._exec(p); return await self.post_async(shared,p,e)
     def _run(self,shared): raise RuntimeError("Use run_async.")
 
 class AsyncBatchNode(AsyncNode,BatchNode):
     async def _exec(self,items): return [await super(AsyncBatchNode,self)._exec(i) for i in items]
 
 class AsyncParallelBatchNode(AsyncNode,BatchNode):
-    async def _exec(self,items): return await asyncio.gather(*(super(AsyncParallelBatchNode,self)._exec(i) for i in items))
+    def __init__(self,*args,max_concurrency=None,rate_limiter=None,**kwargs): super().__init__(*args,**kwargs); self.max_concurrency,self.rate_limiter=max_concurrency,rate_limiter
+    def estimate_tokens(self,item): return 0
+    async def _exec_item(self,sem,item):
+        t=time.monotonic()
+        if sem: await sem.acquire()
+        try:
+            if self.rate_limiter: await self.rate_limiter.acquire(self.estimate_tokens(item))
+            w=time.monotonic()-t; return await super(AsyncParallelBatchNode,self)._exec(item),w
+        finally:
+            if sem: sem.release()
+    async def _exec(self,items):
+        sem=asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        rs=await _gather(self._exec_item(sem,i) for i in items); self.wait_times=[w for _,w in rs]; return [r for r,_ in rs]
 
 class AsyncFlow(Flow,AsyncNode):
+    def __init__(self,start=None,offload=False,timeout=None,**kwargs): super().__init__(start,**kwargs); self.offload,self.timeout=offload,timeout
+    async def _run_sync(self,node,shared):
+        o=self.offload if node.offload is None else node.offload
+        if not o: return node._run(shared)
+        if not isinstance(o,futures.Executor): o=self.offload if isinstance(self.offload,futures.Executor) else None
+        return await asyncio.get_running_loop().run_in_executor(o,contextvars.copy_context().run,node._run,shared)
     async def _orch_async(self,shared,params=None):
-        curr,p,last_action =copy.copy(self.start_node),(params or {**self.params}),None
-        while curr: curr.set_params(p); last_action=await curr._run_async(shared) if isinstance(curr,AsyncNode) else curr._run(shared); curr=copy.copy(self.get_next_node(curr,last_action))
+        p,last_action=(params or {**self.params}),None
+        if self.plan and self._stale(): self._build()
+        if self.plan:
+            nodes,slots,ck=self.plan[0],[None]*len(self.plan[0]),self.checkpoint; i,p,last_action=self._plan_start(p)
+            while i is not None:
+                curr=_visit(slots,nodes,i,p); last_action=await curr._run_async(shared) if isinstance(curr,AsyncNode) else await self._run_sync(curr,shared)
+                if ck: self._save(i,last_action,p,shared)
+                i=self._next_index(i,last_action)
+            return last_action
+        curr=copy.copy(self.start_node)
+        while curr: curr.set_params(p); last_action=await curr._run_async(shared) if isinstance(curr,AsyncNode) else await self._run_sync(curr,shared); curr=copy.copy(self.get_next_node(curr,last_action))
         return last_action
-    async def _run_async(self,shared): p=await self.prep_async(shared); o=await self._orch_async(shared); return await self.post_async(shared,p,o)
+    async def _run_async(self,shared):
+        if self.timeout is None: return await self._run_flow_async(shared)
+        d=time.monotonic()+self.timeout; d=d if (o:=_deadline.get()) is None else min(d,o); tok=_deadline.set(d)
+        try: return await asyncio.wait_for(self._run_flow_async(shared),d-time.monotonic())
+        finally: _deadline.reset(tok)
+    async def _run_flow_async(self,shared): p=await self.prep_async(shared); o=await self._orch_async(shared); return await self.post_async(shared,p,o)
     async def post_async(self,shared,prep_res,exec_res): return exec_res
+    async def run_async(self,shared,checkpoint=None): return await (self._run_checkpointed_async(shared,checkpoint,False) if checkpoint else super().run_async(shared))
+    async def resume_async(self,shared,checkpoint): return await self._run_checkpointed_async(shared,checkpoint,True)
+    async def _run_checkpointed_async(self,shared,checkpoint,resume):
+        self._begin(checkpoint,shared,resume)
+        try: r=await super().run_async(shared)
+        finally: self._end()
+        checkpoint.clear(); return r
 
 class AsyncBatchFlow(AsyncFlow,BatchFlow):
-    async def _run_async(self,shared):
+    async def _run_flow_async(self,shared):
         pr=await self.prep_async(shared) or []
-        for bp in pr: await self._orch_async(shared,{**self.params,**bp})
+        for self.batch,bp in enumerate(pr):
+            if self.batch in self.done: continue
+            await self._orch_async(shared,{**self.params,**bp})
+            if self.checkpoint: self.done.add(self.batch)
         return await self.post_async(shared,pr,None)
 
-class AsyncParallelBatchFlow(AsyncFlow,BatchFlow):
-    async def _run_async(self,shared): 
-        pr=await self.prep_async(shared) or []
-        await asyncio.gather(*(self._orch_async(shared,{**self.params,**bp}) for bp in pr))
+class AsyncParallelBatchFlow(AsyncFlow,ParallelBatchFlow):
+    def __init__(self,start=None,isolate=False,**kwargs): super().__init__(start,isolate=isolate,**kwargs)
+    async def _run_flow_async(self,shared): 
+        pr=await self.prep_async(shared) or []; bs=self._branches(shared,pr)
+        await _gather(self._orch_async(*b) for b in bs); self._join(shared,pr,bs)
         return await self.post_async(shared,pr,None)
\ No newline at end of file
@@ -1,5 +1,28 @@
 import asyncio
-from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Dict, Iterable, MutableMapping, List, Optional, Union, TypeVar, Generic
+
+from pocketflow.dag import AsyncDAGFlow as AsyncDAGFlow, DAGFlow as DAGFlow
+from pocketflow.isolation import Appended as Appended, SetDelta as SetDelta
+from pocketflow.nodes import (
+    AsyncQuorumBatchNode as AsyncQuorumBatchNode, AsyncStreamNode as AsyncStreamNode, CachedNode as CachedNode,
+    ProcessBatchNode as ProcessBatchNode, Stream as Stream, StreamBatchNode as StreamBatchNode,
+)
+from pocketflow.policies import Hedge as Hedge, RateLimiter as RateLimiter, RetryBudget as RetryBudget, RetryPolicy as RetryPolicy
+from pocketflow.profiler import Profiler as Profiler
+from pocketflow.storage import (
+    FileCheckpoint as FileCheckpoint, LRUCache as LRUCache, SharedStore as SharedStore,
+    SQLiteCache as SQLiteCache, SQLiteCheckpoint as SQLiteCheckpoint,
+)
+
+__all__ = [
+    'add_hook', 'remove_hook', 'Hook', 'Profiler', 'BaseNode', 'Node', 'RetryBudget', 'RetryPolicy', 'BatchNode',
+    'ParallelBatchNode', 'StreamBatchNode', 'ProcessBatchNode', 'LRUCache', 'SQLiteCache', 'CachedNode',
+    'FileCheckpoint', 'SQLiteCheckpoint', 'DELETED', 'SharedStore', 'Appended', 'SetDelta', 'Flow', 'BatchFlow',
+    'ParallelBatchFlow', 'DAGFlow', 'time_left', 'Hedge', 'AsyncNode', 'AsyncBatchNode', 'RateLimiter',
+    'AsyncParallelBatchNode', 'Stream', 'AsyncStreamNode', 'AsyncQuorumBatchNode', 'AsyncFlow', 'AsyncDAGFlow',
+    'AsyncBatchFlow', 'AsyncParallelBatchFlow'
+]
 
 # Type variables for better type relationships
 _PrepResult = TypeVar('_PrepResult')
@@ -8,10 +31,24 @@ _PostResult = TypeVar('_PostResult')
 
 # More specific parameter types
 ParamValue = Union[str, int, float, bool, None, List[Any], Dict[str, Any]]
-SharedData = Dict[str, Any]
+SharedData = MutableMapping[str, Any]
 Params = Dict[str, ParamValue]
 
+_HookT = TypeVar('_HookT', bound='Hook')
+_NodeT = TypeVar('_NodeT', bound='BaseNode[Any, Any, Any]')
+
+def add_hook(hook: _HookT) -> _HookT: ...
+def remove_hook(hook: Hook) -> None: ...
+
+class Hook:
+    def before(self, node: BaseNode[Any, Any, Any], phase: str) -> Any: ...
+    def after(
+        self, node: BaseNode[Any, Any, Any], phase: str, token: Any, result: Any, exc: Optional[BaseException] = None
+    ) -> None: ...
+    def on_retry(self, node: BaseNode[Any, Any, Any], exc: Exception, attempt: int, delay: float) -> None: ...
+
 class BaseNode(Generic[_PrepResult, _ExecResult, _PostResult]):
+    offload: Union[None, bool, Executor]
     params: Params
     successors: Dict[str, BaseNode[Any, Any, Any]]
     
@@ -37,33 +74,96 @@ class _ConditionalTransition:
 class Node(BaseNode[_PrepResult, _ExecResult, _PostResult]):
     max_retries: int
     wait: Union[int, float]
+    retry: Optional[RetryPolicy]
     cur_retry: int
     
-    def __init__(self, max_retries: int = 1, wait: Union[int, float] = 0) -> None: ...
+    def __init__(
+        self, max_retries: int = 1, wait: Union[int, float] = 0, retry: Optional[RetryPolicy] = None
+    ) -> None: ...
     def exec_fallback(self, prep_res: _PrepResult, exc: Exception) -> _ExecResult: ...
+    def _retry_delay(self, exc: Exception, attempt: int) -> Optional[float]: ...
     def _exec(self, prep_res: _PrepResult) -> _ExecResult: ...
 
 class BatchNode(Node[Optional[List[_PrepResult]], List[_ExecResult], _PostResult]):
     def _exec(self, items: Optional[List[_PrepResult]]) -> List[_ExecResult]: ...
 
+class ParallelBatchNode(BatchNode[_PrepResult, _ExecResult, _PostResult]):
+    max_workers: Optional[int]
+    latencies: List[float]
+    
+    def __init__(
+        self, max_retries: int = 1, wait: Union[int, float] = 0, *, max_workers: Optional[int] = None
+    ) -> None: ...
+    def _exec(self, items: Optional[List[_PrepResult]]) -> List[_ExecResult]: ...
+
+Checkpoint = Union[FileCheckpoint, SQLiteCheckpoint]
+
+class _Deleted: ...
+
+DELETED: _Deleted
+
 class Flow(BaseNode[_PrepResult, Any, _PostResult]):
     start_node: Optional[BaseNode[Any, Any, Any]]
+    plan: Optional[tuple[List[BaseNode[Any, Any, Any]], List[Dict[str, int]]]]
+    plan_edges: List[Dict[str, BaseNode[Any, Any, Any]]]
+    run_plan: bool
+    checkpoint: Optional[Checkpoint]
+    restore: Optional[Dict[str, Any]]
+    batch: Optional[int]
+    done: Union[set[int], frozenset[int]]
     
     def __init__(self, start: Optional[BaseNode[Any, Any, Any]] = None) -> None: ...
     def start(self, start: BaseNode[Any, Any, Any]) -> BaseNode[Any, Any, Any]: ...
     def get_next_node(
         self, curr: BaseNode[Any, Any, Any], action: Optional[str]
     ) -> Optional[BaseNode[Any, Any, Any]]: ...
+    def _build(self) -> List[BaseNode[Any, Any, Any]]: ...
+    def _stale(self) -> bool: ...
+    def compile(self) -> Flow[_PrepResult, Any, _PostResult]: ...
+    def _next_index(self, i: int, action: Optional[str]) -> Optional[int]: ...
     def _orch(
         self, shared: SharedData, params: Optional[Params] = None
     ) -> Any: ...
     def _run(self, shared: SharedData) -> _PostResult: ...
     def post(self, shared: SharedData, prep_res: _PrepResult, exec_res: Any) -> _PostResult: ...
+    def _plan_start(self, p: Params) -> tuple[Optional[int], Params, Optional[str]]: ...
+    def _save(self, i: int, action: Optional[str], p: Params, shared: SharedData) -> None: ...
+    def _begin(self, checkpoint: Checkpoint, shared: SharedData, resume: bool) -> None: ...
+    def _end(self) -> None: ...
+    def run(self, shared: SharedData, checkpoint: Optional[Checkpoint] = None) -> _PostResult: ...
+    def resume(self, shared: SharedData, checkpoint: Checkpoint) -> _PostResult: ...
+    def _run_checkpointed(self, shared: SharedData, checkpoint: Checkpoint, resume: bool) -> _PostResult: ...
 
 class BatchFlow(Flow[Optional[List[Params]], Any, _PostResult]):
     def _run(self, shared: SharedData) -> _PostResult: ...
 
+class ParallelBatchFlow(BatchFlow[_PostResult]):
+    max_workers: Optional[int]
+    isolate: bool
+    readonly: Iterable[str]
+    
+    def __init__(
+        self, start: Optional[BaseNode[Any, Any, Any]] = None, max_workers: Optional[int] = None, isolate: bool = True,
+        readonly: Iterable[str] = ()
+    ) -> None: ...
+    def merge(self, shared: SharedData, prep_res: Optional[List[Params]], updates: List[SharedData]) -> None: ...
+    def _branches(self, shared: SharedData, pr: List[Params]) -> List[tuple[SharedData, Params]]: ...
+    def _join(self, shared: SharedData, pr: List[Params], branches: List[tuple[SharedData, Params]]) -> None: ...
+    def _run(self, shared: SharedData) -> _PostResult: ...
+
+def time_left() -> Optional[float]: ...
+async def _gather(aws: Iterable[Awaitable[Any]]) -> List[Any]: ...
+
 class AsyncNode(Node[_PrepResult, _ExecResult, _PostResult]):
+    timeout: Optional[float]
+    hedge: Optional[Hedge]
+    
+    def __init__(
+        self, max_retries: int = 1, wait: Union[int, float] = 0, retry: Optional[RetryPolicy] = None,
+        timeout: Optional[float] = None, hedge: Optional[Hedge] = None
+    ) -> None: ...
+    def _attempt_timeout(self) -> Optional[float]: ...
+    async def _hedged(self, prep_res: _PrepResult) -> _ExecResult: ...
     async def prep_async(self, shared: SharedData) -> _PrepResult: ...
     async def exec_async(self, prep_res: _PrepResult) -> _ExecResult: ...
     async def exec_fallback_async(self, prep_res: _PrepResult, exc: Exception) -> _ExecResult: ...
@@ -79,19 +179,48 @@ class AsyncBatchNode(AsyncNode[Optional[List[_PrepResult]], List[_ExecResult], _
     async def _exec(self, items: Optional[List[_PrepResult]]) -> List[_ExecResult]: ...
 
 class AsyncParallelBatchNode(AsyncNode[Optional[List[_PrepResult]], List[_ExecResult], _PostResult], BatchNode[Optional[List[_PrepResult]], List[_ExecResult], _PostResult]):
+    max_concurrency: Optional[int]
+    rate_limiter: Optional[RateLimiter]
+    wait_times: List[float]
+    
+    def __init__(
+        self,
+        max_retries: int = 1,
+        wait: Union[int, float] = 0,
+        retry: Optional[RetryPolicy] = None,
+        *,
+        timeout: Optional[float] = None,
+        hedge: Optional[Hedge] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None: ...
+    def estimate_tokens(self, item: _PrepResult) -> float: ...
+    async def _exec_item(self, sem: Optional[asyncio.Semaphore], item: _PrepResult) -> tuple[_ExecResult, float]: ...
     async def _exec(self, items: Optional[List[_PrepResult]]) -> List[_ExecResult]: ...
 
 class AsyncFlow(Flow[_PrepResult, Any, _PostResult], AsyncNode[_PrepResult, Any, _PostResult]):
+    offload: Union[bool, Executor]  # type: ignore[assignment]
+    
+    def __init__(
+        self, start: Optional[BaseNode[Any, Any, Any]] = None, offload: Union[bool, Executor] = False,
+        timeout: Optional[float] = None, **kwargs: Any
+    ) -> None: ...
+    async def _run_sync(self, node: BaseNode[Any, Any, Any], shared: SharedData) -> Any: ...
     async def _orch_async(
         self, shared: SharedData, params: Optional[Params] = None
     ) -> Any: ...
     async def _run_async(self, shared: SharedData) -> _PostResult: ...
+    async def _run_flow_async(self, shared: SharedData) -> _PostResult: ...
     async def post_async(
         self, shared: SharedData, prep_res: _PrepResult, exec_res: Any
     ) -> _PostResult: ...
+    async def run_async(self, shared: SharedData, checkpoint: Optional[Checkpoint] = None) -> _PostResult: ...
+    async def resume_async(self, shared: SharedData, checkpoint: Checkpoint) -> _PostResult: ...
+    async def _run_checkpointed_async(self, shared: SharedData, checkpoint: Checkpoint, resume: bool) -> _PostResult: ...
 
 class AsyncBatchFlow(AsyncFlow[Optional[List[Params]], Any, _PostResult], BatchFlow[Optional[List[Params]], Any, _PostResult]):
-    async def _run_async(self, shared: SharedData) -> _PostResult: ...
+    async def _run_flow_async(self, shared: SharedData) -> _PostResult: ...
 
-class AsyncParallelBatchFlow(AsyncFlow[Optional[List[Params]], Any, _PostResult], BatchFlow[Optional[List[Params]], Any, _PostResult]):
-    async def _run_async(self, shared: SharedData) -> _PostResult: ...
\ No newline at end of file
+class AsyncParallelBatchFlow(AsyncFlow[Optional[List[Params]], Any, _PostResult], ParallelBatchFlow[_PostResult]):
+    def __init__(self, start: Optional[BaseNode[Any, Any, Any]] = None, isolate: bool = False, **kwargs: Any) -> None: ...
+    async def _run_flow_async(self, shared: SharedData) -> _PostResult: ...
\ No newline at end of file
@@ -0,0 +1,75 @@
+import time, copy
+from pocketflow import Flow, AsyncFlow, AsyncNode, _LazyModule
+
+asyncio,futures=(_LazyModule(a,n,globals()) for a,n in [("asyncio","asyncio"),("futures","concurrent.futures")])
+
+_SKIP=object()
+class DAGFlow(Flow):
+    def __init__(self,start=None,max_workers=None): super().__init__(start); self.deps,self.max_workers,self.timings,self.actions={},max_workers,{},{}
+    def add(self,node,after=None):
+        self.deps[node]=[d if isinstance(d,tuple) else (d,None) for d in (after if isinstance(after,list) else [after] if after else [])]; return node
+    def _begin(self,checkpoint,shared,resume): raise TypeError(f"Checkpointing is not supported for {type(self).__name__}")
+    def compile(self):
+        for n in self.deps:
+            if isinstance(n,Flow) and not n.plan: n.compile()
+        return self
+    def _graph(self):
+        kids={n:[] for n in self.deps}
+        for n,ds in self.deps.items():
+            for d,_ in ds:
+                if d not in kids: raise ValueError(f"{type(n).__name__} depends on {type(d).__name__}, which was not added to the DAGFlow")
+                kids[d].append(n)
+        left={n:len(ds) for n,ds in self.deps.items()}; order=[n for n in left if not left[n]]
+        for n in order:
+            for k in kids[n]:
+                left[k]-=1
+                if not left[k]: order.append(k)
+        if len(order)<len(self.deps): raise ValueError("DAGFlow has a cycle")
+        return kids,{n:len(ds) for n,ds in self.deps.items()},[n for n in self.deps if not self.deps[n]]
+    def _settle(self,n,kids,left,ready):
+        for k in kids[n]:
+            left[k]-=1
+            if left[k]: continue
+            if all(self.actions[d] is not _SKIP and (a is None or (self.actions[d] or "default")==a) for d,a in self.deps[k]): ready.append(k)
+            else: self.actions[k]=_SKIP; self._settle(k,kids,left,ready)
+    def _result(self):
+        a=self.actions.get(next(reversed(self.deps),None)); return None if a is _SKIP else a
+    def critical_path(self):
+        n,path=max(self.timings,key=lambda n:self.timings[n][1],default=None),[]
+        while n is not None: path.append((n,*self.timings[n])); n=max((d for d,_ in self.deps[n] if d in self.timings),key=lambda d:self.timings[d][1],default=None)
+        return path[::-1]
+    def _orch(self,shared,params=None):
+        p,(kids,left,ready),fs=(params or {**self.params}),self._graph(),{}; self.timings,self.actions,t0={},{},time.perf_counter()
+        def run(n):
+            c=copy.copy(n); c.set_params(p); s=time.perf_counter()-t0; a=c._run(shared); return a,s,time.perf_counter()-t0
+        with futures.ThreadPoolExecutor(self.max_workers) as ex:
+            try:
+                while ready or fs:
+                    for n in ready: fs[ex.submit(run,n)]=n
+                    ready=[]
+                    for f in futures.wait(fs,return_when=futures.FIRST_COMPLETED)[0]: n=fs.pop(f); self.actions[n],*self.timings[n]=f.result(); self._settle(n,kids,left,ready)
+            except BaseException:
+                for f in fs: f.cancel()
+                raise
+        return self._result()
+
+class AsyncDAGFlow(AsyncFlow,DAGFlow):
+    def __init__(self,start=None,max_concurrency=None,**kwargs): super().__init__(start,**kwargs); self.max_concurrency=max_concurrency
+    async def _orch_async(self,shared,params=None):
+        p,(kids,left,ready),ts=(params or {**self.params}),self._graph(),{}; self.timings,self.actions,t0={},{},time.perf_counter()
+        sem=asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        async def run(n):
+            c=copy.copy(n); c.set_params(p)
+            if sem: await sem.acquire()
+            try: s=time.perf_counter()-t0; a=await c._run_async(shared) if isinstance(c,AsyncNode) else await self._run_sync(c,shared); return a,s,time.perf_counter()-t0
+            finally:
+                if sem: sem.release()
+        try:
+            while ready or ts:
+                for n in ready: ts[asyncio.ensure_future(run(n))]=n
+                ready=[]
+                for t in (await asyncio.wait(ts,return_when=asyncio.FIRST_COMPLETED))[0]: n=ts.pop(t); self.actions[n],*self.timings[n]=t.result(); self._settle(n,kids,left,ready)
+        except BaseException:
+            for t in ts: t.cancel()
+            await asyncio.gather(*ts,return_exceptions=True); raise
+        return self._result()
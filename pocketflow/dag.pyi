@@ -0,0 +1,37 @@
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+
+from pocketflow import AsyncFlow, BaseNode, Flow, Params, SharedData, _PostResult, _PrepResult
+
+_NodeT = TypeVar('_NodeT', bound='BaseNode[Any, Any, Any]')
+
+_DAGDep = Union[BaseNode[Any, Any, Any], Tuple[BaseNode[Any, Any, Any], str]]
+
+class DAGFlow(Flow[_PrepResult, Any, _PostResult]):
+    deps: Dict[BaseNode[Any, Any, Any], List[Tuple[BaseNode[Any, Any, Any], Optional[str]]]]
+    max_workers: Optional[int]
+    timings: Dict[BaseNode[Any, Any, Any], List[float]]
+    actions: Dict[BaseNode[Any, Any, Any], Any]
+    
+    def __init__(self, start: Optional[BaseNode[Any, Any, Any]] = None, max_workers: Optional[int] = None) -> None: ...
+    def add(self, node: _NodeT, after: Union[_DAGDep, List[_DAGDep], None] = None) -> _NodeT: ...
+    def compile(self) -> "DAGFlow[_PrepResult, _PostResult]": ...  # type: ignore[override]
+    def _graph(
+        self,
+    ) -> Tuple[Dict[BaseNode[Any, Any, Any], List[BaseNode[Any, Any, Any]]], Dict[BaseNode[Any, Any, Any], int], List[BaseNode[Any, Any, Any]]]: ...
+    def _settle(
+        self, n: BaseNode[Any, Any, Any], kids: Dict[BaseNode[Any, Any, Any], List[BaseNode[Any, Any, Any]]],
+        left: Dict[BaseNode[Any, Any, Any], int], ready: List[BaseNode[Any, Any, Any]]
+    ) -> None: ...
+    def _result(self) -> Any: ...
+    def critical_path(self) -> List[Tuple[BaseNode[Any, Any, Any], float, float]]: ...
+    def _orch(self, shared: SharedData, params: Optional[Params] = None) -> Any: ...
+
+class AsyncDAGFlow(AsyncFlow[_PrepResult, Any, _PostResult], DAGFlow[_PrepResult, _PostResult]):  # type: ignore[misc]
+    max_concurrency: Optional[int]
+    
+    def __init__(
+        self, start: Optional[BaseNode[Any, Any, Any]] = None, max_concurrency: Optional[int] = None,
+        offload: Union[bool, Executor] = False, timeout: Optional[float] = None
+    ) -> None: ...
+    async def _orch_async(self, shared: SharedData, params: Optional[Params] = None) -> Any: ...
@@ -0,0 +1,60 @@
+import copy
+from collections.abc import MutableMapping
+from pocketflow import DELETED
+
+class Appended(list): pass
+class SetDelta(set):
+    def __init__(self,added=(),removed=()): super().__init__(added); self.removed=set(removed)
+_SAME=object()
+def _delta(old,new):
+    try:
+        if old is new or (type(old) is type(new) and old==new): return _SAME
+        if type(old) is list is type(new) and new[:len(old)]==old: return Appended(new[len(old):])
+        if type(old) is set is type(new): return SetDelta(new-old,old-new)
+        if type(old) is dict is type(new):
+            d={k:DELETED for k in old if k not in new}
+            for k,v in new.items():
+                if (x:=_delta(old[k],v) if k in old else v) is not _SAME: d[k]=x
+            return d
+    except Exception: pass
+    return new
+def _plain(v):
+    if isinstance(v,dict): return {k:_plain(x) for k,x in v.items() if x is not DELETED}
+    return list(v) if isinstance(v,Appended) else set(v) if isinstance(v,SetDelta) else v
+
+class _Overlay(MutableMapping):
+    def __init__(self,parent,readonly=()): self.parent,self.readonly,self.local,self.copied=parent,frozenset(readonly),{},set()
+    def __getitem__(self,k):
+        if k in self.local:
+            if (v:=self.local[k]) is DELETED: raise KeyError(k)
+            return v
+        v=self.parent[k]
+        if k in self.readonly or not isinstance(v,(dict,list,set)): return v
+        self.local[k]=v=copy.deepcopy(v); self.copied.add(k); return v
+    def __setitem__(self,k,v):
+        if k in self.readonly: raise TypeError(f"shared[{k!r}] is read-only in parallel branches")
+        self.local[k]=v; self.copied.discard(k)
+    def __delitem__(self,k):
+        if k in self.readonly: raise TypeError(f"shared[{k!r}] is read-only in parallel branches")
+        if k not in self: raise KeyError(k)
+        self.local[k]=DELETED; self.copied.discard(k)
+    def __contains__(self,k): return self.local[k] is not DELETED if k in self.local else k in self.parent
+    def _keys(self): return [k for k,v in {**dict.fromkeys(self.parent),**self.local}.items() if v is not DELETED]
+    def __iter__(self): return iter(self._keys())
+    def __len__(self): return len(self._keys())
+    def changes(self):
+        cs={}
+        for k,v in self.local.items():
+            if k not in self.copied: cs[k]=v
+            elif (d:=_delta(self.parent[k],v)) is not _SAME: cs[k]=d
+        return cs
+
+def _deep_update(dst,src):
+    for k,v in src.items():
+        cur=dst.get(k)
+        if v is DELETED: dst.pop(k,None); continue
+        if isinstance(v,dict) and isinstance(cur,dict): _deep_update(cur,v)
+        elif isinstance(v,Appended) and isinstance(cur,list): cur.extend(v)
+        elif isinstance(v,SetDelta) and isinstance(cur,set): cur-=v.removed; cur|=v
+        else: cur=_plain(v)
+        dst[k]=cur
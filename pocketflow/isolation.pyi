@@ -0,0 +1,8 @@
+from typing import Any, Iterable, List
+
+class Appended(List[Any]): ...
+
+class SetDelta(set[Any]):
+    removed: set[Any]
+    
+    def __init__(self, added: Iterable[Any] = ..., removed: Iterable[Any] = ...) -> None: ...
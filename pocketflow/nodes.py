@@ -0,0 +1,146 @@
+import sys, os, itertools, copy, collections, contextvars
+from pocketflow import Node, BatchNode, AsyncNode, AsyncParallelBatchNode, _hooks, _hooked, _timed_exec, _LazyModule
+from pocketflow.storage import LRUCache, _MISS
+
+asyncio,futures,shared_memory,pickle,hashlib,inspect=(_LazyModule(a,n,globals()) for a,n in [("asyncio","asyncio"),("futures","concurrent.futures"),
+    ("shared_memory","multiprocessing.shared_memory"),*((m,m) for m in ("pickle","hashlib","inspect"))])
+
+# Set by CachedNode around an uncached exec; items that fall back append to it, even on copies run in worker threads
+_fallbacks=contextvars.ContextVar("pocketflow_fallbacks",default=None)
+
+class CachedNode(Node):
+    def __init__(self,*args,cache=None,**kwargs): super().__init__(*args,**kwargs); self.cache=LRUCache() if cache is None else cache
+    def cache_key(self,prep_res):
+        try: data=pickle.dumps((type(self).__qualname__,prep_res))
+        except Exception: data=repr((type(self).__qualname__,prep_res)).encode()
+        return hashlib.sha256(data).hexdigest()
+    def _retry_delay(self,exc,attempt):
+        d=super()._retry_delay(exc,attempt)
+        if d is None and (fb:=_fallbacks.get()) is not None: fb.append(exc)
+        return d
+    def _exec(self,prep_res):
+        if isinstance(self,AsyncNode): return self._exec_cached_async(prep_res)
+        k=self.cache_key(prep_res); r=self.cache.get(k,_MISS)
+        if r is _MISS:
+            tok=_fallbacks.set(fb:=[])
+            try: r=super()._exec(prep_res)
+            finally: _fallbacks.reset(tok)
+            if not fb: self.cache[k]=r
+        return r
+    async def _exec_cached_async(self,prep_res):
+        k=self.cache_key(prep_res); r=self.cache.get(k,_MISS)
+        if r is _MISS:
+            tok=_fallbacks.set(fb:=[])
+            try: r=await super()._exec(prep_res)
+            finally: _fallbacks.reset(tok)
+            if not fb: self.cache[k]=r
+        return r
+
+class StreamBatchNode(BatchNode):
+    def __init__(self,*args,window=100,max_workers=None,**kwargs): super().__init__(*args,**kwargs); self.window,self.max_workers=window,max_workers
+    def post_item(self,shared,item,exec_res): pass
+    def post_batch(self,shared,items,exec_res_list): pass
+    def _stream(self,shared,items):
+        it,count,ctx=iter(items or []),0,contextvars.copy_context(); ex=futures.ThreadPoolExecutor(self.max_workers) if self.max_workers else None
+        try:
+            while win:=list(itertools.islice(it,self.window)):
+                rs=list(ex.map(lambda i:ctx.copy().run(Node._exec,copy.copy(self),i),win)) if ex else [Node._exec(self,i) for i in win]
+                for i,r in zip(win,rs): self.post_item(shared,i,r)
+                self.post_batch(shared,win,rs); count+=len(win)
+        finally:
+            if ex: ex.shutdown()
+        return count
+    def _run(self,shared):
+        if _hooks: p=_hooked(self,"prep",self.prep,shared); n=_hooked(self,"exec",self._stream,shared,p); return _hooked(self,"post",self.post,shared,p,n)
+        p=self.prep(shared); return self.post(shared,p,self._stream(shared,p))
+
+class _SharedArray:
+    def __init__(self,arr,shms):
+        np=sys.modules["numpy"]; shm=shared_memory.SharedMemory(create=True,size=max(arr.nbytes,1)); shms.append(shm)
+        np.ndarray(arr.shape,arr.dtype,buffer=shm.buf)[...]=arr; self.name,self.shape,self.dtype=shm.name,arr.shape,arr.dtype.str
+    def attach(self): import numpy as np; shm=shared_memory.SharedMemory(name=self.name); return shm,np.ndarray(self.shape,self.dtype,buffer=shm.buf)
+
+def _init_worker(node): global _worker_node; _worker_node=node
+def _process_item(item):
+    # Fallbacks in the worker are sent back with the result, since the parent's context doesn't reach it
+    tok=_fallbacks.set(fb:=[])
+    try: r,t=_process_shared(item)
+    finally: _fallbacks.reset(tok)
+    return r,t,bool(fb)
+def _process_shared(item):
+    if not isinstance(item,_SharedArray): return _timed_exec(_worker_node,item)
+    shm,arr=item.attach()
+    try:
+        r,t=_timed_exec(_worker_node,arr); np=sys.modules["numpy"]
+        return (r.copy() if isinstance(r,np.ndarray) and np.shares_memory(r,arr) else r),t
+    finally:
+        del arr
+        try: shm.close()
+        except BufferError: pass
+
+class ProcessBatchNode(BatchNode):
+    def __init__(self,*args,max_workers=None,chunksize=None,shm_threshold=1<<20,**kwargs):
+        super().__init__(*args,**kwargs); self.max_workers,self.chunksize,self.shm_threshold=max_workers,chunksize,shm_threshold
+    def _share(self,item,shms):
+        np=sys.modules.get("numpy")
+        return _SharedArray(item,shms) if np and isinstance(item,np.ndarray) and item.nbytes>=self.shm_threshold else item
+    def _exec(self,items):
+        items,node=list(items or []),copy.copy(self); node.successors={}
+        if not items: self.latencies=[]; return []
+        try: pickle.dumps(node)
+        except Exception as e: raise TypeError(f"{type(self).__name__} must be picklable to run in a process pool: {e}") from e
+        workers=self.max_workers or os.cpu_count() or 1; shms=[]
+        try:
+            args=[self._share(i,shms) for i in items]
+            with futures.ProcessPoolExecutor(workers,initializer=_init_worker,initargs=(node,)) as ex:
+                rs=list(ex.map(_process_item,args,chunksize=self.chunksize or max(1,len(items)//(workers*4))))
+        finally:
+            for shm in shms: shm.close(); shm.unlink()
+        if any(f for *_,f in rs) and (fb:=_fallbacks.get()) is not None: fb.append(None)
+        self.latencies=[t for _,t,_ in rs]; return [r for r,_,_ in rs]
+
+_END=object()
+class Stream:
+    def __init__(self,source,maxsize=16): self.queue,self.chunks,self.error,self.done=asyncio.Queue(maxsize),0,None,False; self.task=asyncio.ensure_future(self._pump(source))
+    async def _pump(self,source):
+        try:
+            if hasattr(source,"__aiter__"):
+                async for c in source: await self.queue.put(c)
+            else:
+                it,loop=iter(source),asyncio.get_running_loop()
+                while (c:=await loop.run_in_executor(None,next,it,_END)) is not _END: await self.queue.put(c)
+        except Exception as e: self.error=e
+        await self.queue.put(_END)
+    def __aiter__(self): return self
+    async def __anext__(self):
+        if self.done or (c:=await self.queue.get()) is _END:
+            self.done,e,self.error=True,self.error,None
+            if e: raise e
+            raise StopAsyncIteration
+        self.chunks+=1; return c
+    async def collect(self): return [c async for c in self]
+    async def aclose(self): self.task.cancel(); await asyncio.gather(self.task,return_exceptions=True)
+
+class AsyncStreamNode(AsyncNode):
+    def __init__(self,*args,maxsize=16,**kwargs): super().__init__(*args,**kwargs); self.maxsize=maxsize
+    async def exec_async(self,prep_res): return self.exec(prep_res)
+    async def _exec(self,prep_res): return Stream(self.exec_async(prep_res) if inspect.isasyncgenfunction(self.exec_async) else await super()._exec(prep_res),self.maxsize)
+
+class AsyncQuorumBatchNode(AsyncParallelBatchNode):
+    def __init__(self,*args,quorum=None,**kwargs): super().__init__(*args,**kwargs); self.quorum=quorum
+    def vote(self,exec_res): return exec_res
+    def decided(self,votes,remaining):
+        (_,a),(_,b)=(votes.most_common(2)+[(None,0)]*2)[:2]
+        return a>0 and (a-b>remaining or (self.quorum is not None and a>=self.quorum))
+    async def _exec(self,items):
+        sem=asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        ts=[asyncio.ensure_future(self._exec_item(sem,i)) for i in items]; self.votes,self.results,first=collections.Counter(),[],{}
+        try:
+            for n,f in enumerate(asyncio.as_completed(ts),1):
+                r,_=await f; self.results.append(r)
+                if (k:=self.vote(r)) is not None: self.votes[k]+=1; first.setdefault(k,r)
+                if self.decided(self.votes,len(ts)-n): break
+        finally:
+            for t in ts: t.cancel()
+            await asyncio.gather(*ts,return_exceptions=True)
+        self.cancelled=len(ts)-len(self.results); return first[self.votes.most_common(1)[0][0]] if self.votes else None
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any, AsyncIterable, Counter, Iterable, List, Optional, Union
+
+from pocketflow import AsyncNode, AsyncParallelBatchNode, BatchNode, Node, SharedData, _ExecResult, _PostResult, _PrepResult
+from pocketflow.policies import Hedge, RateLimiter, RetryPolicy
+
+class CachedNode(Node[_PrepResult, _ExecResult, _PostResult]):
+    cache: Any
+    
+    def __init__(
+        self, max_retries: int = 1, wait: Union[int, float] = 0, retry: Optional[RetryPolicy] = None, *, cache: Any = None
+    ) -> None: ...
+    def cache_key(self, prep_res: _PrepResult) -> str: ...
+    def _exec(self, prep_res: _PrepResult) -> _ExecResult: ...
+    async def _exec_cached_async(self, prep_res: _PrepResult) -> _ExecResult: ...
+
+class StreamBatchNode(BatchNode[_PrepResult, _ExecResult, _PostResult]):
+    window: int
+    max_workers: Optional[int]
+    
+    def __init__(
+        self,
+        max_retries: int = 1,
+        wait: Union[int, float] = 0,
+        *,
+        window: int = 100,
+        max_workers: Optional[int] = None,
+    ) -> None: ...
+    def post_item(self, shared: SharedData, item: _PrepResult, exec_res: _ExecResult) -> None: ...
+    def post_batch(self, shared: SharedData, items: List[_PrepResult], exec_res_list: List[_ExecResult]) -> None: ...
+    def _stream(self, shared: SharedData, items: Optional[Iterable[_PrepResult]]) -> int: ...
+    def _run(self, shared: SharedData) -> _PostResult: ...
+
+class ProcessBatchNode(BatchNode[_PrepResult, _ExecResult, _PostResult]):
+    max_workers: Optional[int]
+    chunksize: Optional[int]
+    shm_threshold: int
+    latencies: List[float]
+    
+    def __init__(
+        self,
+        max_retries: int = 1,
+        wait: Union[int, float] = 0,
+        *,
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        shm_threshold: int = ...,
+    ) -> None: ...
+    def _share(self, item: _PrepResult, shms: List[Any]) -> Any: ...
+    def _exec(self, items: Optional[List[_PrepResult]]) -> List[_ExecResult]: ...
+
+class Stream:
+    queue: asyncio.Queue[Any]
+    task: asyncio.Future[None]
+    chunks: int
+    error: Optional[Exception]
+    done: bool
+    
+    def __init__(self, source: Union[Iterable[Any], AsyncIterable[Any]], maxsize: int = 16) -> None: ...
+    async def _pump(self, source: Union[Iterable[Any], AsyncIterable[Any]]) -> None: ...
+    def __aiter__(self) -> "Stream": ...
+    async def __anext__(self) -> Any: ...
+    async def collect(self) -> List[Any]: ...
+    async def aclose(self) -> None: ...
+
+class AsyncStreamNode(AsyncNode[_PrepResult, Stream, _PostResult]):
+    maxsize: int
+    
+    def __init__(
+        self, max_retries: int = 1, wait: Union[int, float] = 0, retry: Optional[RetryPolicy] = None,
+        timeout: Optional[float] = None, hedge: Optional[Hedge] = None, maxsize: int = 16
+    ) -> None: ...
+    async def exec_async(self, prep_res: _PrepResult) -> Any: ...  # type: ignore[override]
+    async def _exec(self, prep_res: _PrepResult) -> Stream: ...
+
+class AsyncQuorumBatchNode(AsyncParallelBatchNode[_PrepResult, _ExecResult, _PostResult]):
+    quorum: Optional[int]
+    votes: Counter[Any]
+    results: List[_ExecResult]
+    cancelled: int
+    
+    def __init__(
+        self,
+        max_retries: int = 1,
+        wait: Union[int, float] = 0,
+        retry: Optional[RetryPolicy] = None,
+        *,
+        timeout: Optional[float] = None,
+        hedge: Optional[Hedge] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        quorum: Optional[int] = None,
+    ) -> None: ...
+    def vote(self, exec_res: _ExecResult) -> Any: ...
+    def decided(self, votes: Counter[Any], remaining: int) -> bool: ...
+    async def _exec(self, items: Optional[List[_PrepResult]]) -> Optional[_ExecResult]: ...  # type: ignore[override]
@@ -0,0 +1,52 @@
+import time, random, threading, collections
+from pocketflow import _LazyModule
+
+asyncio=_LazyModule("asyncio","asyncio",globals())
+
+class RetryBudget:
+    def __init__(self,retries=10,per=60.0): self.retries,self.per,self.level,self.last,self.lock=retries,per,float(retries),time.monotonic(),threading.Lock(); self.spent=self.rejected=0
+    def spend(self):
+        with self.lock:
+            now=time.monotonic(); self.level=min(self.retries,self.level+(now-self.last)*self.retries/self.per); self.last=now
+            if self.level<1: self.rejected+=1; return False
+            self.level-=1; self.spent+=1; return True
+
+class RetryPolicy:
+    def __init__(self,backoff=2.0,max_wait=None,jitter=False,retry_on=Exception,budget=None):
+        self.backoff,self.max_wait,self.jitter,self.retry_on,self.budget=backoff,max_wait,jitter,retry_on,budget; self.retries=self.giveups=0
+    def should_retry(self,exc): return isinstance(exc,self.retry_on) if isinstance(self.retry_on,(type,tuple)) else self.retry_on(exc)
+    def delay(self,wait,attempt,exc,last=False):
+        if last or not self.should_retry(exc) or (self.budget and not self.budget.spend()): self.giveups+=1; return None
+        d=wait*self.backoff**attempt; d=d if self.max_wait is None else min(d,self.max_wait); self.retries+=1
+        return random.uniform(0,d) if self.jitter else d
+
+class Hedge:
+    def __init__(self,delay=None,percentile=None,min_samples=20,max_ratio=0.1,window=1000):
+        self.delay,self.percentile,self.min_samples,self.max_ratio=delay,percentile,min_samples,max_ratio
+        self.latencies,self.calls,self.hedged,self.wins=collections.deque(maxlen=window),0,0,0
+    def after(self):
+        self.calls+=1
+        if self.max_ratio is not None and self.hedged>=self.max_ratio*self.calls: return None
+        if self.percentile is None or len(self.latencies)<self.min_samples: return self.delay
+        ls=sorted(self.latencies); return ls[min(len(ls)-1,int(len(ls)*self.percentile/100))]
+    def record(self,latency): self.latencies.append(latency)
+
+class RateLimiter:
+    def __init__(self,rps=None,tps=None,burst=1.0):
+        self.rates,self.burst,self.last=(rps,tps),burst,time.monotonic(); self.levels=[(r or 0)*burst for r in self.rates]
+        self.acquired=self.waiting=self.max_waiting=0; self.wait_time,self.lock=0.0,threading.Lock()
+    def _refill(self):
+        now=time.monotonic(); self.levels=[min(r*self.burst,l+(now-self.last)*r) if r else l for r,l in zip(self.rates,self.levels)]; self.last=now
+    def _reserve(self,need,sign=1):
+        with self.lock:
+            self._refill(); d=max([(min(n,r*self.burst)-l)/r for r,l,n in zip(self.rates,self.levels,need) if r and n],default=0) if sign>0 else 0
+            self.levels=[l-sign*n if r else l for r,l,n in zip(self.rates,self.levels,need)]; return d
+    async def acquire(self,tokens=0):
+        need,t=(1,tokens),time.monotonic(); self.waiting+=1; self.max_waiting=max(self.max_waiting,self.waiting)
+        try:
+            d=self._reserve(need)
+            try:
+                if d>0: await asyncio.sleep(d)
+            except BaseException: self._reserve(need,-1); raise
+            self.acquired+=1
+        finally: self.waiting-=1; self.wait_time+=time.monotonic()-t
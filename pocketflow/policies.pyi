@@ -0,0 +1,61 @@
+from typing import Callable, Deque, List, Optional, Tuple, Type, Union
+
+class RetryBudget:
+    retries: int
+    per: float
+    level: float
+    last: float
+    spent: int
+    rejected: int
+    
+    def __init__(self, retries: int = 10, per: float = 60.0) -> None: ...
+    def spend(self) -> bool: ...
+
+class RetryPolicy:
+    backoff: float
+    max_wait: Optional[float]
+    jitter: bool
+    retry_on: Union[Type[BaseException], Tuple[Type[BaseException], ...], Callable[[Exception], bool]]
+    budget: Optional[RetryBudget]
+    retries: int
+    giveups: int
+    
+    def __init__(
+        self,
+        backoff: float = 2.0,
+        max_wait: Optional[float] = None,
+        jitter: bool = False,
+        retry_on: Union[Type[BaseException], Tuple[Type[BaseException], ...], Callable[[Exception], bool]] = Exception,
+        budget: Optional[RetryBudget] = None,
+    ) -> None: ...
+    def should_retry(self, exc: Exception) -> bool: ...
+    def delay(self, wait: float, attempt: int, exc: Exception, last: bool = False) -> Optional[float]: ...
+
+class Hedge:
+    delay: Optional[float]
+    percentile: Optional[float]
+    min_samples: int
+    max_ratio: Optional[float]
+    latencies: Deque[float]
+    calls: int
+    hedged: int
+    wins: int
+    
+    def __init__(
+        self, delay: Optional[float] = None, percentile: Optional[float] = None, min_samples: int = 20,
+        max_ratio: Optional[float] = 0.1, window: int = 1000
+    ) -> None: ...
+    def after(self) -> Optional[float]: ...
+    def record(self, latency: float) -> None: ...
+
+class RateLimiter:
+    rates: tuple[Optional[float], Optional[float]]
+    burst: float
+    levels: List[float]
+    acquired: int
+    waiting: int
+    max_waiting: int
+    wait_time: float
+    
+    def __init__(self, rps: Optional[float] = None, tps: Optional[float] = None, burst: float = 1.0) -> None: ...
+    async def acquire(self, tokens: float = 0) -> None: ...
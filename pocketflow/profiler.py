@@ -0,0 +1,27 @@
+import time, threading
+from pocketflow import Hook, AsyncNode, add_hook, remove_hook, _LazyModule
+
+json=_LazyModule("json","json",globals())
+
+class Profiler(Hook):
+    def __init__(self): self.stats,self.edges,self.lock={},{},threading.Lock()
+    def __enter__(self): return add_hook(self)
+    def __exit__(self,*exc): remove_hook(self)
+    # Thread CPU time around an awaited phase would include every other coroutine that ran meanwhile, so async nodes report none
+    def before(self,node,phase): return time.perf_counter(),None if isinstance(node,AsyncNode) else time.thread_time()
+    def after(self,node,phase,token,result,exc=None):
+        w,c,name=time.perf_counter()-token[0],None if token[1] is None else time.thread_time()-token[1],type(node).__name__
+        with self.lock:
+            s=self.stats.setdefault((name,phase),[0,0.0,None if c is None else 0.0,0]); s[0]+=1; s[1]+=w; s[3]+=exc is not None
+            if c is not None: s[2]+=c
+            if phase=="post" and exc is None: e=(name,result or "default"); self.edges[e]=self.edges.get(e,0)+1
+    def on_retry(self,node,exc,attempt,delay):
+        with self.lock: self.stats.setdefault((type(node).__name__,"retry"),[0,0.0,None,0])[0]+=1
+    def to_dict(self):
+        return {"phases":[{"node":n,"phase":p,"calls":c,"wall":w,"cpu":u,"errors":x} for (n,p),(c,w,u,x) in sorted(self.stats.items(),key=lambda i:-i[1][1])],
+                "edges":[{"node":n,"action":a,"count":c} for (n,a),c in self.edges.items()]}
+    def to_json(self,**kwargs): return json.dumps(self.to_dict(),**kwargs)
+    def table(self):
+        cpu=lambda u:f"{'-':>12}" if u is None else f"{u:>12.4f}"
+        rows=[f"{'node':<24}{'phase':<10}{'calls':>8}{'errors':>8}{'wall (s)':>12}{'cpu (s)':>12}"]+[f"{r['node']:<24}{r['phase']:<10}{r['calls']:>8}{r['errors']:>8}{r['wall']:>12.4f}{cpu(r['cpu'])}" for r in self.to_dict()["phases"]]
+        return "\n".join(rows+[f"{n} -[{a}]-> x{c}" for (n,a),c in self.edges.items()])
@@ -0,0 +1,14 @@
+from typing import Any, Dict, List
+
+from pocketflow import Hook
+
+class Profiler(Hook):
+    stats: Dict[tuple[str, str], List[Any]]
+    edges: Dict[tuple[str, str], int]
+    
+    def __init__(self) -> None: ...
+    def __enter__(self) -> Profiler: ...
+    def __exit__(self, *exc: Any) -> None: ...
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]: ...
+    def to_json(self, **kwargs: Any) -> str: ...
+    def table(self) -> str: ...
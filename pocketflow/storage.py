@@ -0,0 +1,108 @@
+import time, os, itertools, threading, copy, collections
+from collections.abc import MutableMapping
+from pocketflow import DELETED, _LazyModule
+
+pickle,sqlite3=(_LazyModule(m,m,globals()) for m in ("pickle","sqlite3"))
+
+_MISS=object()
+
+class _CacheStats:
+    hits=misses=0
+    @property
+    def hit_ratio(self): return self.hits/(self.hits+self.misses) if self.hits+self.misses else 0.0
+
+class LRUCache(_CacheStats):
+    def __init__(self,maxsize=128,ttl=None): self.data,self.maxsize,self.ttl,self.lock=collections.OrderedDict(),maxsize,ttl,threading.Lock()
+    def __len__(self): return len(self.data)
+    def get(self,key,default=None):
+        with self.lock:
+            v=self.data.get(key,_MISS)
+            if v is not _MISS and (self.ttl is None or time.monotonic()-v[0]<self.ttl): self.data.move_to_end(key); self.hits+=1; return v[1]
+            if v is not _MISS: del self.data[key]
+            self.misses+=1; return default
+    def __setitem__(self,key,value):
+        with self.lock:
+            self.data[key]=(time.monotonic(),value); self.data.move_to_end(key)
+            while self.maxsize and len(self.data)>self.maxsize: self.data.popitem(last=False)
+
+class SQLiteCache(_CacheStats):
+    def __init__(self,path,maxsize=None,ttl=None):
+        self.db,self.maxsize,self.ttl,self.lock=sqlite3.connect(path,check_same_thread=False),maxsize,ttl,threading.Lock()
+        with self.lock,self.db: self.db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, created REAL, used REAL)")
+    def __len__(self):
+        with self.lock: return self.db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    def get(self,key,default=None):
+        with self.lock,self.db:
+            row,now=self.db.execute("SELECT value, created FROM cache WHERE key=?",(key,)).fetchone(),time.time()
+            if row and (self.ttl is None or now-row[1]<self.ttl): self.db.execute("UPDATE cache SET used=? WHERE key=?",(now,key)); self.hits+=1; return pickle.loads(row[0])
+            if row: self.db.execute("DELETE FROM cache WHERE key=?",(key,))
+            self.misses+=1; return default
+    def __setitem__(self,key,value):
+        with self.lock,self.db:
+            now=time.time(); self.db.execute("INSERT OR REPLACE INTO cache VALUES (?,?,?,?)",(key,pickle.dumps(value),now,now))
+            if self.maxsize: self.db.execute("DELETE FROM cache WHERE key NOT IN (SELECT key FROM cache ORDER BY used DESC, rowid DESC LIMIT ?)",(self.maxsize,))
+    def close(self): self.db.close()
+
+class FileCheckpoint:
+    def __init__(self,path): self.path=path
+    def save(self,state):
+        with open(f"{self.path}.tmp","wb") as f: pickle.dump(state,f)
+        os.replace(f"{self.path}.tmp",self.path)
+    def load(self):
+        try:
+            with open(self.path,"rb") as f: return pickle.load(f)
+        except FileNotFoundError: return None
+    def clear(self):
+        try: os.remove(self.path)
+        except FileNotFoundError: pass
+
+class SQLiteCheckpoint:
+    def __init__(self,path,key="default"):
+        self.db,self.key=sqlite3.connect(path),key
+        with self.db: self.db.execute("CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, state BLOB)")
+    def save(self,state):
+        with self.db: self.db.execute("INSERT OR REPLACE INTO checkpoints VALUES (?,?)",(self.key,pickle.dumps(state)))
+    def load(self): row=self.db.execute("SELECT state FROM checkpoints WHERE key=?",(self.key,)).fetchone(); return pickle.loads(row[0]) if row else None
+    def clear(self):
+        with self.db: self.db.execute("DELETE FROM checkpoints WHERE key=?",(self.key,))
+    def close(self): self.db.close()
+
+class SharedStore(MutableMapping):
+    __slots__=("_extra","_versions","_dirty"); _fields={}
+    def __init_subclass__(cls,**kwargs): super().__init_subclass__(**kwargs); cls._fields=dict.fromkeys(n for c in reversed(cls.__mro__) for n in c.__dict__.get("__slots__",()) if not n.startswith("_"))
+    def __init__(self,*args,**kwargs): self._extra,self._versions,self._dirty={},{},set(); self.update(*args,**kwargs)
+    def __setattr__(self,k,v):
+        object.__setattr__(self,k,v)
+        if k in self._fields: self._touch(k)
+    def __delattr__(self,k):
+        object.__delattr__(self,k)
+        if k in self._fields: self._touch(k)
+    def _touch(self,k): self._versions[k]=self._versions.get(k,0)+1; self._dirty.add(k)
+    def __getitem__(self,k):
+        if k not in self._fields: return self._extra[k]
+        try: return object.__getattribute__(self,k)
+        except AttributeError: raise KeyError(k) from None
+    def __setitem__(self,k,v):
+        if k in self._fields: object.__setattr__(self,k,v)
+        else: self._extra[k]=v
+        self._touch(k)
+    def __delitem__(self,k):
+        if k not in self._fields: del self._extra[k]
+        else:
+            try: object.__delattr__(self,k)
+            except AttributeError: raise KeyError(k) from None
+        self._touch(k)
+    def __contains__(self,k): return hasattr(self,k) if k in self._fields else k in self._extra
+    def __iter__(self): return itertools.chain([k for k in self._fields if hasattr(self,k)],self._extra)
+    def __len__(self): return sum(hasattr(self,k) for k in self._fields)+len(self._extra)
+    def __repr__(self): return f"{type(self).__name__}({dict(self)!r})"
+    def __getstate__(self): return {k:getattr(self,k) for k in self._fields if hasattr(self,k)},dict(self._extra),dict(self._versions)
+    def __setstate__(self,st):
+        fs,extra,versions=st; object.__setattr__(self,"_extra",extra); object.__setattr__(self,"_versions",versions); object.__setattr__(self,"_dirty",set())
+        for k,v in fs.items(): object.__setattr__(self,k,v)
+    def version(self,k): return self._versions.get(k,0)
+    def snapshot(self): return copy.copy(self)
+    def changes(self,since=None):
+        ks=self._dirty if since is None else [k for k,v in self._versions.items() if since._versions.get(k)!=v]
+        return {k:self[k] if k in self else DELETED for k in ks}
+    def mark_clean(self): self._dirty.clear()
@@ -0,0 +1,60 @@
+from typing import Any, Dict, Iterator, MutableMapping, Optional, TypeVar
+
+_StoreT = TypeVar('_StoreT', bound='SharedStore')
+
+class _CacheStats:
+    hits: int
+    misses: int
+    @property
+    def hit_ratio(self) -> float: ...
+
+class LRUCache(_CacheStats):
+    maxsize: Optional[int]
+    ttl: Optional[float]
+    
+    def __init__(self, maxsize: Optional[int] = 128, ttl: Optional[float] = None) -> None: ...
+    def __len__(self) -> int: ...
+    def get(self, key: str, default: Any = None) -> Any: ...
+    def __setitem__(self, key: str, value: Any) -> None: ...
+
+class SQLiteCache(_CacheStats):
+    maxsize: Optional[int]
+    ttl: Optional[float]
+    
+    def __init__(self, path: str, maxsize: Optional[int] = None, ttl: Optional[float] = None) -> None: ...
+    def __len__(self) -> int: ...
+    def get(self, key: str, default: Any = None) -> Any: ...
+    def __setitem__(self, key: str, value: Any) -> None: ...
+    def close(self) -> None: ...
+
+class FileCheckpoint:
+    path: str
+    
+    def __init__(self, path: str) -> None: ...
+    def save(self, state: Dict[str, Any]) -> None: ...
+    def load(self) -> Optional[Dict[str, Any]]: ...
+    def clear(self) -> None: ...
+
+class SQLiteCheckpoint:
+    key: str
+    
+    def __init__(self, path: str, key: str = "default") -> None: ...
+    def save(self, state: Dict[str, Any]) -> None: ...
+    def load(self) -> Optional[Dict[str, Any]]: ...
+    def clear(self) -> None: ...
+    def close(self) -> None: ...
+
+class SharedStore(MutableMapping[str, Any]):
+    _fields: Dict[str, None]
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None: ...
+    def _touch(self, k: str) -> None: ...
+    def __getitem__(self, k: str) -> Any: ...
+    def __setitem__(self, k: str, v: Any) -> None: ...
+    def __delitem__(self, k: str) -> None: ...
+    def __iter__(self) -> Iterator[str]: ...
+    def __len__(self) -> int: ...
+    def version(self, k: str) -> int: ...
+    def snapshot(self: _StoreT) -> _StoreT: ...
+    def changes(self, since: Optional["SharedStore"] = None) -> Dict[str, Any]: ...
+    def mark_clean(self) -> None: ...
@@ -2,10 +2,13 @@
 PocketFlow Tools - A module for creating tool-enabled nodes in PocketFlow
 """
 
-from .decorators import tool, ToolRegistry
-from .utils import ActionSpaceGenerator
+from .decorators import tool, tool_registry, ToolRegistry
 
-__all__ = ['tool', 'ToolRegistry', 'ActionSpaceGenerator']
+__all__ = ['tool', 'tool_registry', 'ToolRegistry', 'ActionSpaceGenerator']
 
-# Global registry instance
-tool_registry = ToolRegistry() 
\ No newline at end of file
+def __getattr__(name):
+    # Loaded on first use to keep `import pocketflow_tools` cheap
+    if name == 'ActionSpaceGenerator':
+        from .utils import ActionSpaceGenerator
+        return ActionSpaceGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -2,19 +2,21 @@
 Decorators for marking PocketFlow nodes as tools
 """
 
-from typing import Dict, List, Any, Optional, Union
-import inspect
-import re
-from pocketflow import Node
+from __future__ import annotations
+
+# typing, inspect and re are only needed once tools are inspected; keep them off the import path
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
 
 
 class ToolRegistry:
     """Registry for managing tool nodes"""
     
     def __init__(self):
-        self.tools: Dict[str, Dict] = {}
+        self.tools: dict[str, dict] = {}
     
-    def tool(self, name: str = None, description: str = None, parameters: Dict = None):
+    def tool(self, name: str = None, description: str = None, parameters: dict = None):
         """Decorator to mark a Node class as a tool"""
         def decorator(cls):
             tool_name = name or cls.__name__.lower()
@@ -58,6 +60,7 @@ class ToolRegistry:
             
             def _extract_parameters_from_signature(self):
                 """Extract parameters from prep method signature"""
+                import inspect
                 try:
                     sig = inspect.signature(self.prep)
                     parameters = {}
@@ -86,6 +89,7 @@ class ToolRegistry:
             
             def _extract_parameters_from_docstring(self):
                 """Extract parameters from docstring using intelligent parsing"""
+                import re
                 parameters = {}
                 
                 # Get docstrings from class and prep method
@@ -190,7 +194,7 @@ class ToolRegistry:
             return cls
         return decorator
     
-    def get_tool_spec(self, node_instance) -> Dict[str, Any]:
+    def get_tool_spec(self, node_instance) -> dict[str, Any]:
         """Get tool specification for a node instance"""
         if not hasattr(node_instance, '_is_tool') or not node_instance._is_tool:
             raise ValueError(f"Node {node_instance.__class__.__name__} is not registered as a tool")
@@ -202,7 +206,7 @@ class ToolRegistry:
             'node_type': node_instance._get_node_type()
         }
     
-    def get_all_tool_specs(self) -> List[Dict[str, Any]]:
+    def get_all_tool_specs(self) -> list[dict[str, Any]]:
         """Get specifications for all registered tools"""
         specs = []
         for tool_info in self.tools.values():
@@ -215,6 +219,6 @@ class ToolRegistry:
 # Global registry instance
 tool_registry = ToolRegistry()
 
-def tool(name: str = None, description: str = None, parameters: Dict = None):
+def tool(name: str = None, description: str = None, parameters: dict = None):
     """Convenience decorator to mark a Node class as a tool"""
     return tool_registry.tool(name, description, parameters) 
\ No newline at end of file
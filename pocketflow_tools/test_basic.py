@@ -37,6 +37,10 @@ def test_tool_registration():
     assert test_tool._is_tool == True
     assert test_tool._tool_name == "test_tool"
     
+    # The exported registry is the one @tool registers into
+    assert "test_tool" in tool_registry.tools
+    assert [spec["name"] for spec in tool_registry.get_all_tool_specs()] == ["test_tool"]
+    
     print("✅ Tool registration works correctly")
 
 
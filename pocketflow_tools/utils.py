@@ -2,14 +2,18 @@
 Utility functions for PocketFlow tools
 """
 
-from typing import List, Dict, Any
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
 
 
 class ActionSpaceGenerator:
     """Generate action space descriptions from tool specifications"""
     
     @staticmethod
-    def generate_action_space(tools: List[Any]) -> str:
+    def generate_action_space(tools: list[Any]) -> str:
         """Generate action space description from available tools"""
         action_space = []
         
@@ -41,7 +45,7 @@ class ActionSpaceGenerator:
         return "\n".join(action_space)
     
     @staticmethod
-    def generate_action_space_dict(tools: List[Any]) -> Dict[str, Any]:
+    def generate_action_space_dict(tools: list[Any]) -> dict[str, Any]:
         """Generate action space as a structured dictionary"""
         action_space = {
             "tools": [],
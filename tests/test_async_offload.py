@@ -0,0 +1,92 @@
+import unittest
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, AsyncNode, AsyncFlow
+
+class BlockingNode(Node):
+    def exec(self, prep_result):
+        time.sleep(0.2)  # e.g. a blocking call_llm
+        return threading.current_thread().name
+    
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['thread'] = exec_result
+        return "next"
+
+class InlineNode(BlockingNode):
+    offload = False
+
+class OffloadedNode(BlockingNode):
+    offload = True
+
+class AsyncDoneNode(AsyncNode):
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['done'] = True
+
+async def run_with_heartbeat(flow, shared_storage):
+    """Run the flow while counting how often another coroutine gets to run."""
+    ticks = 0
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+    task = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    await flow.run_async(shared_storage)
+    task.cancel()
+    return ticks
+
+def build_flow(node, **kwargs):
+    node - "next" >> AsyncDoneNode()
+    return AsyncFlow(start=node, **kwargs)
+
+class TestAsyncOffload(unittest.TestCase):
+    def test_blocking_by_default(self):
+        shared_storage = {}
+        ticks = asyncio.run(run_with_heartbeat(build_flow(BlockingNode()), shared_storage))
+        self.assertLessEqual(ticks, 2)
+        self.assertEqual(shared_storage['thread'], threading.current_thread().name)
+        self.assertTrue(shared_storage['done'])
+    
+    def test_offload_keeps_loop_responsive(self):
+        shared_storage = {}
+        ticks = asyncio.run(run_with_heartbeat(build_flow(BlockingNode(), offload=True), shared_storage))
+        self.assertGreaterEqual(ticks, 10)
+        self.assertNotEqual(shared_storage['thread'], threading.current_thread().name)
+        self.assertTrue(shared_storage['done'])
+    
+    def test_node_opt_out(self):
+        shared_storage = {}
+        ticks = asyncio.run(run_with_heartbeat(build_flow(InlineNode(), offload=True), shared_storage))
+        self.assertLessEqual(ticks, 2)
+    
+    def test_node_opt_in(self):
+        shared_storage = {}
+        ticks = asyncio.run(run_with_heartbeat(build_flow(OffloadedNode()), shared_storage))
+        self.assertGreaterEqual(ticks, 10)
+    
+    def test_dedicated_executor(self):
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm") as pool:
+            shared_storage = {}
+            asyncio.run(build_flow(OffloadedNode(), offload=pool).run_async(shared_storage))
+        self.assertTrue(shared_storage['thread'].startswith("llm"))
+    
+    def test_concurrent_flows(self):
+        """
+        Test that offloaded flows overlap instead of running back to back
+        """
+        async def main():
+            flows = [build_flow(BlockingNode(), offload=True) for _ in range(4)]
+            await asyncio.gather(*(f.run_async({}) for f in flows))
+        start = time.perf_counter()
+        asyncio.run(main())
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import AsyncNode, AsyncFlow, AsyncParallelBatchNode, AsyncParallelBatchFlow, time_left
+
+class SlowNode(AsyncNode):
+    """Sleeps for `delays[attempt]` seconds, then returns the attempt number."""
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays
+        self.attempts = 0
+
+    async def exec_async(self, prep_result):
+        attempt = self.attempts
+        self.attempts += 1
+        await asyncio.sleep(self.delays[min(attempt, len(self.delays) - 1)])
+        return attempt
+
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['result'] = exec_result
+
+class TimeoutFallbackNode(SlowNode):
+    async def exec_fallback_async(self, prep_result, exc):
+        return type(exc).__name__
+
+class RecordTimeLeftNode(AsyncNode):
+    async def exec_async(self, prep_result):
+        return time_left()
+
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage.setdefault('time_left', []).append(exec_result)
+
+class TestNodeTimeout(unittest.TestCase):
+    def test_no_timeout_by_default(self):
+        shared_storage = {}
+        asyncio.run(SlowNode([0.05]).run_async(shared_storage))
+        self.assertEqual(shared_storage['result'], 0)
+
+    def test_timeout_is_retried(self):
+        node = SlowNode([1.0, 0.0], max_retries=2, timeout=0.05)
+        shared_storage = {}
+        start = time.perf_counter()
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['result'], 1)
+        self.assertEqual(node.attempts, 2)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_timeout_goes_to_fallback(self):
+        shared_storage = {}
+        asyncio.run(TimeoutFallbackNode([1.0], max_retries=2, timeout=0.05).run_async(shared_storage))
+        self.assertEqual(shared_storage['result'], 'TimeoutError')
+
+    def test_timeout_raises_without_fallback(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(SlowNode([1.0], timeout=0.05).run_async({}))
+
+class TestFlowDeadline(unittest.TestCase):
+    def test_flow_deadline_cancels_running_node(self):
+        node = SlowNode([5.0], max_retries=3)
+        flow = AsyncFlow(start=node, timeout=0.1)
+        start = time.perf_counter()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(flow.run_async({}))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_deadline_bounds_retries(self):
+        # Each attempt fits its own timeout, but together they overrun the flow deadline
+        node = TimeoutFallbackNode([0.08], max_retries=10, timeout=0.1)
+        flow = AsyncFlow(start=node, timeout=0.2)
+        shared_storage = {}
+        start = time.perf_counter()
+        try:
+            asyncio.run(flow.run_async(shared_storage))
+        except asyncio.TimeoutError:
+            pass
+        self.assertLess(node.attempts, 10)
+        self.assertLess(time.perf_counter() - start, 0.6)
+
+    def test_deadline_propagates_to_nested_flow(self):
+        inner = AsyncFlow(start=RecordTimeLeftNode(), timeout=10)
+        outer = AsyncFlow(start=inner, timeout=0.5)
+        shared_storage = {}
+        asyncio.run(outer.run_async(shared_storage))
+        self.assertLessEqual(shared_storage['time_left'][0], 0.5)
+
+    def test_time_left_outside_deadline(self):
+        shared_storage = {}
+        asyncio.run(AsyncFlow(start=RecordTimeLeftNode()).run_async(shared_storage))
+        self.assertEqual(shared_storage['time_left'], [None])
+        self.assertIsNone(time_left())
+
+    def test_deadline_caps_node_timeout(self):
+        node_timeout = []
+        class CheckTimeout(AsyncNode):
+            async def exec_async(self, prep_result):
+                node_timeout.append(self._attempt_timeout())
+        flow = AsyncFlow(start=CheckTimeout(timeout=60), timeout=0.5)
+        asyncio.run(flow.run_async({}))
+        self.assertLessEqual(node_timeout[0], 0.5)
+
+class FailFastParallelNode(AsyncParallelBatchNode):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.finished = []
+        self.cancelled = []
+
+    async def prep_async(self, shared_storage):
+        return [0, 1, 2, 3]
+
+    async def exec_async(self, item):
+        if item == 0:
+            await asyncio.sleep(0.01)
+            raise ValueError("item 0 failed")
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            self.cancelled.append(item)
+            raise
+        self.finished.append(item)
+
+class TestSiblingCancellation(unittest.TestCase):
+    def test_failure_cancels_siblings(self):
+        node = FailFastParallelNode()
+        start = time.perf_counter()
+        with self.assertRaises(ValueError):
+            asyncio.run(node.run_async({}))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(sorted(node.cancelled), [1, 2, 3])
+        self.assertEqual(node.finished, [])
+
+    def test_deadline_cancels_parallel_items(self):
+        node = FailFastParallelNode()
+        async def prep_async(shared_storage):
+            return [1, 2, 3]
+        node.prep_async = prep_async
+        flow = AsyncFlow(start=node, timeout=0.1)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(flow.run_async({}))
+        self.assertEqual(sorted(node.cancelled), [1, 2, 3])
+
+    def test_parallel_flow_cancels_branches(self):
+        class Branch(AsyncNode):
+            async def exec_async(self, prep_result):
+                if self.params['i'] == 0:
+                    raise ValueError("branch 0 failed")
+                await asyncio.sleep(1.0)
+
+        class Fanout(AsyncParallelBatchFlow):
+            async def prep_async(self, shared_storage):
+                return [{'i': i} for i in range(4)]
+
+        start = time.perf_counter()
+        with self.assertRaises(ValueError):
+            asyncio.run(Fanout(start=Branch()).run_async({}))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import AsyncNode, BatchNode, ParallelBatchNode, ProcessBatchNode, Flow, CachedNode, LRUCache, SQLiteCache
+
+class SquareNode(CachedNode):
+    calls = 0
+    
+    def prep(self, shared_storage):
+        return shared_storage['number']
+    
+    def exec(self, number):
+        SquareNode.calls += 1
+        if number < 0:
+            raise ValueError("negative")
+        return number * number
+    
+    def exec_fallback(self, prep_result, exc):
+        return None
+    
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['result'] = exec_result
+
+class AsyncSquareNode(CachedNode, AsyncNode):
+    calls = 0
+    
+    async def prep_async(self, shared_storage):
+        return shared_storage['number']
+    
+    async def exec_async(self, number):
+        AsyncSquareNode.calls += 1
+        await asyncio.sleep(0)
+        return number * number
+    
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['result'] = exec_result
+
+class SquareBatchNode(CachedNode, BatchNode):
+    calls = 0
+    
+    def prep(self, shared_storage):
+        return shared_storage['numbers']
+    
+    def exec(self, number):
+        SquareBatchNode.calls += 1
+        return number * number
+    
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['results'] = exec_result
+
+class FlakyBatchNode(CachedNode, ParallelBatchNode):
+    def prep(self, shared_storage):
+        return shared_storage['numbers']
+    
+    def exec(self, number):
+        if number < 0:
+            raise ValueError("negative")
+        return number * number
+    
+    def exec_fallback(self, prep_result, exc):
+        return 'fb'
+    
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['results'] = exec_result
+
+class FlakyProcessBatchNode(FlakyBatchNode, ProcessBatchNode):
+    pass
+
+class TestCachedNode(unittest.TestCase):
+    def setUp(self):
+        SquareNode.calls = AsyncSquareNode.calls = SquareBatchNode.calls = 0
+    
+    def run_square(self, node, number):
+        shared_storage = {'number': number}
+        node.run(shared_storage)
+        return shared_storage['result']
+    
+    def test_repeated_prep_skips_exec(self):
+        node = SquareNode()
+        self.assertEqual([self.run_square(node, n) for n in (3, 3, 4, 3)], [9, 9, 16, 9])
+        self.assertEqual(SquareNode.calls, 2)
+        self.assertEqual((node.cache.hits, node.cache.misses), (2, 2))
+        self.assertEqual(node.cache.hit_ratio, 0.5)
+    
+    def test_cache_shared_across_flow_copies(self):
+        """
+        Test that flow steps, which run on node copies, still share one cache
+        """
+        node = SquareNode()
+        flow = Flow(start=node)
+        for _ in range(3):
+            flow.run({'number': 5})
+        self.assertEqual(SquareNode.calls, 1)
+    
+    def test_fallback_not_cached(self):
+        node = SquareNode()
+        self.assertIsNone(self.run_square(node, -1))
+        self.assertIsNone(self.run_square(node, -1))
+        self.assertEqual(SquareNode.calls, 2)
+        self.assertEqual(len(node.cache), 0)
+    
+    def test_fallback_in_thread_pool_not_cached(self):
+        """
+        Test that a fallback on an item's copy in a worker thread still keeps the batch out of the cache
+        """
+        node = FlakyBatchNode(max_workers=2)
+        shared_storage = {'numbers': [-1, -2]}
+        node.run(shared_storage)
+        self.assertEqual(shared_storage['results'], ['fb', 'fb'])
+        self.assertEqual(len(node.cache), 0)
+        node.run({'numbers': [-1, 2]})
+        self.assertEqual(len(node.cache), 0)
+        node.run({'numbers': [1, 2]})
+        self.assertEqual(len(node.cache), 1)
+    
+    def test_fallback_in_process_pool_not_cached(self):
+        node = FlakyProcessBatchNode(max_workers=2)
+        shared_storage = {'numbers': [3, -1]}
+        node.run(shared_storage)
+        self.assertEqual(shared_storage['results'], [9, 'fb'])
+        self.assertEqual(len(node.cache), 0)
+        node.run({'numbers': [3]})
+        self.assertEqual(len(node.cache), 1)
+    
+    def test_batch_node(self):
+        node = SquareBatchNode()
+        for _ in range(2):
+            shared_storage = {'numbers': [1, 2, 3]}
+            node.run(shared_storage)
+        self.assertEqual(shared_storage['results'], [1, 4, 9])
+        self.assertEqual(SquareBatchNode.calls, 3)
+    
+    def test_async_node(self):
+        node = AsyncSquareNode()
+        for _ in range(3):
+            shared_storage = {'number': 7}
+            asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['result'], 49)
+        self.assertEqual(AsyncSquareNode.calls, 1)
+    
+    def test_plain_dict_cache(self):
+        cache = {}
+        node = SquareNode(cache=cache)
+        self.run_square(node, 2)
+        self.run_square(node, 2)
+        self.assertEqual(list(cache.values()), [4])
+        self.assertEqual(SquareNode.calls, 1)
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'], cache['b'] = 1, 2
+        cache.get('a')  # 'a' becomes most recently used
+        cache['c'] = 3
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(len(cache), 2)
+    
+    def test_ttl(self):
+        cache = LRUCache(ttl=10)
+        cache['a'] = 1
+        now = time.monotonic()
+        with patch('pocketflow.time.monotonic', return_value=now + 11):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        SquareNode.calls = 0
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def test_persists_across_instances(self):
+        cache = SQLiteCache(self.path)
+        self.run_node(cache, 6)
+        cache.close()
+        
+        cache = SQLiteCache(self.path)
+        self.assertEqual(self.run_node(cache, 6), 36)
+        self.assertEqual(SquareNode.calls, 1)
+        self.assertEqual(cache.hit_ratio, 1.0)
+        cache.close()
+    
+    def run_node(self, cache, number):
+        shared_storage = {'number': number}
+        SquareNode(cache=cache).run(shared_storage)
+        return shared_storage['result']
+    
+    def test_maxsize_and_ttl(self):
+        cache = SQLiteCache(self.path, maxsize=2, ttl=10)
+        cache['a'], cache['b'], cache['c'] = {'v': 1}, 2, 3
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('a'))
+        now = time.time()
+        with patch('pocketflow.time.time', return_value=now + 11):
+            self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
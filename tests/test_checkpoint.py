@@ -0,0 +1,197 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import (
+    Node, AsyncNode, Flow, BatchFlow, AsyncFlow, AsyncBatchFlow, ParallelBatchFlow,
+    FileCheckpoint, SQLiteCheckpoint
+)
+
+class Crash(Exception):
+    pass
+
+class StepNode(Node):
+    crash_on = None
+    
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+    
+    def prep(self, shared_storage):
+        key = (self.name, self.params.get('item'))
+        if key == StepNode.crash_on:
+            raise Crash(f"crash at {key}")
+        shared_storage.setdefault('log', []).append(key)
+
+class AsyncStepNode(AsyncNode):
+    crash_on = None
+    
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+    
+    async def prep_async(self, shared_storage):
+        await asyncio.sleep(0)
+        if self.name == AsyncStepNode.crash_on:
+            raise Crash(self.name)
+        shared_storage.setdefault('log', []).append(self.name)
+
+class ItemBatchFlow(BatchFlow):
+    def prep(self, shared_storage):
+        return [{'item': i} for i in shared_storage['items']]
+
+class AsyncItemBatchFlow(AsyncBatchFlow):
+    async def prep_async(self, shared_storage):
+        return [{'item': i} for i in shared_storage['items']]
+
+def chain(cls, names):
+    nodes = [cls(n) for n in names]
+    for a, b in zip(nodes, nodes[1:]):
+        a >> b
+    return nodes[0]
+
+class CheckpointTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'flow.ckpt')
+        StepNode.crash_on = AsyncStepNode.crash_on = None
+    
+    def tearDown(self):
+        self.dir.cleanup()
+
+class TestFlowCheckpoint(CheckpointTestCase):
+    def test_resume_skips_completed_steps(self):
+        flow = Flow(start=chain(StepNode, 'abcd'))
+        checkpoint = FileCheckpoint(self.path)
+        
+        StepNode.crash_on = ('c', None)
+        with self.assertRaises(Crash):
+            flow.run({}, checkpoint=checkpoint)
+        state = checkpoint.load()
+        self.assertEqual(state['node'], 1)
+        self.assertEqual(state['shared']['log'], [('a', None), ('b', None)])
+        
+        StepNode.crash_on = None
+        shared_storage = {'stale': True}
+        flow.resume(shared_storage, checkpoint)
+        self.assertEqual([n for n, _ in shared_storage['log']], list('abcd'))
+        self.assertNotIn('stale', shared_storage)
+        self.assertIsNone(checkpoint.load())  # Cleared after success
+    
+    def test_resume_without_checkpoint_starts_fresh(self):
+        shared_storage = {}
+        Flow(start=chain(StepNode, 'ab')).resume(shared_storage, FileCheckpoint(self.path))
+        self.assertEqual([n for n, _ in shared_storage['log']], ['a', 'b'])
+    
+    def test_run_ignores_old_checkpoint(self):
+        flow = Flow(start=chain(StepNode, 'ab'))
+        checkpoint = FileCheckpoint(self.path)
+        StepNode.crash_on = ('b', None)
+        with self.assertRaises(Crash):
+            flow.run({}, checkpoint=checkpoint)
+        StepNode.crash_on = None
+        shared_storage = {}
+        flow.run(shared_storage, checkpoint=checkpoint)
+        self.assertEqual([n for n, _ in shared_storage['log']], ['a', 'b'])
+    
+    def test_batch_flow_skips_completed_param_sets(self):
+        flow = ItemBatchFlow(start=Flow(start=chain(StepNode, 'xy')))
+        checkpoint = SQLiteCheckpoint(os.path.join(self.dir.name, 'ckpt.db'))
+        
+        StepNode.crash_on = ('y', 2)
+        with self.assertRaises(Crash):
+            flow.run({'items': [0, 1, 2, 3]}, checkpoint=checkpoint)
+        state = checkpoint.load()
+        self.assertEqual((state['done'], state['batch'], state['node']), ([0], 1, 0))
+        
+        StepNode.crash_on = None
+        shared_storage = {}
+        flow.resume(shared_storage, checkpoint)
+        self.assertEqual(shared_storage['log'], [
+            ('x', 0), ('y', 0), ('x', 1), ('y', 1), ('x', 2), ('y', 2), ('x', 3), ('y', 3)
+        ])
+        checkpoint.close()
+    
+    def test_resume_inside_batch(self):
+        """
+        Test that a batch interrupted mid-way resumes at the node after the last saved one
+        """
+        flow = ItemBatchFlow(start=chain(StepNode, 'xyz'))
+        checkpoint = FileCheckpoint(self.path)
+        StepNode.crash_on = ('z', 1)
+        with self.assertRaises(Crash):
+            flow.run({'items': [0, 1]}, checkpoint=checkpoint)
+        
+        StepNode.crash_on = None
+        shared_storage = {}
+        flow.resume(shared_storage, checkpoint)
+        self.assertEqual(shared_storage['log'][-3:], [('x', 1), ('y', 1), ('z', 1)])
+        self.assertEqual(len(shared_storage['log']), 6)
+    
+    def test_parallel_batch_flow_rejected(self):
+        class Parallel(ParallelBatchFlow):
+            def prep(self, shared_storage):
+                return []
+        with self.assertRaises(TypeError):
+            Parallel(start=StepNode('a')).run({}, checkpoint=FileCheckpoint(self.path))
+    
+    def test_run_without_checkpoint_unchanged(self):
+        flow = Flow(start=chain(StepNode, 'ab'))
+        shared_storage = {}
+        flow.run(shared_storage)
+        self.assertIsNone(flow.plan)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_checkpointed_run_leaves_flow_uncompiled(self):
+        class Repeat(Node):
+            def exec(self, prep_result):
+                self.count = getattr(self, 'count', 0) + 1
+                return self.count
+            def post(self, shared_storage, prep_result, exec_result):
+                shared_storage.setdefault('counts', []).append(exec_result)
+                return 'again' if len(shared_storage['counts']) < 3 else 'done'
+        repeat = Repeat()
+        repeat - 'again' >> repeat
+        repeat - 'done' >> StepNode('after')
+        flow = Flow(start=repeat)
+        flow.run({}, checkpoint=FileCheckpoint(self.path))
+        self.assertIsNone(flow.plan)
+        
+        shared_storage = {}
+        flow.run(shared_storage)
+        self.assertEqual(shared_storage['counts'], [1, 1, 1])
+        self.assertEqual(shared_storage['log'], [('after', None)])
+
+class TestAsyncFlowCheckpoint(CheckpointTestCase):
+    def test_async_resume(self):
+        flow = AsyncFlow(start=chain(AsyncStepNode, 'abc'))
+        checkpoint = FileCheckpoint(self.path)
+        
+        AsyncStepNode.crash_on = 'c'
+        with self.assertRaises(Crash):
+            asyncio.run(flow.run_async({}, checkpoint=checkpoint))
+        
+        AsyncStepNode.crash_on = None
+        shared_storage = {}
+        asyncio.run(flow.resume_async(shared_storage, checkpoint))
+        self.assertEqual(shared_storage['log'], ['a', 'b', 'c'])
+        self.assertIsNone(checkpoint.load())
+    
+    def test_async_batch_resume(self):
+        flow = AsyncItemBatchFlow(start=chain(StepNode, 'x'))
+        checkpoint = FileCheckpoint(self.path)
+        StepNode.crash_on = ('x', 'b')
+        with self.assertRaises(Crash):
+            asyncio.run(flow.run_async({'items': ['a', 'b']}, checkpoint=checkpoint))
+        
+        StepNode.crash_on = None
+        shared_storage = {}
+        asyncio.run(flow.resume_async(shared_storage, checkpoint))
+        self.assertEqual(shared_storage['log'], [('x', 'a'), ('x', 'b')])
+
+if __name__ == '__main__':
+    unittest.main()
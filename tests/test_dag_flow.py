@@ -0,0 +1,218 @@
+import unittest
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, AsyncNode, Flow, DAGFlow, AsyncDAGFlow, FileCheckpoint
+
+class StepNode(Node):
+    """Sleeps `delay` seconds, logs its name and returns `action`."""
+    def __init__(self, name, delay=0.0, action=None):
+        super().__init__()
+        self.name, self.delay, self.action = name, delay, action
+
+    def exec(self, prep_result):
+        time.sleep(self.delay)
+
+    def post(self, shared_storage, prep_result, exec_result):
+        with shared_storage['lock']:
+            shared_storage['log'].append(self.name)
+        return self.action
+
+class AsyncStepNode(AsyncNode):
+    def __init__(self, name, delay=0.0, action=None):
+        super().__init__()
+        self.name, self.delay, self.action = name, delay, action
+
+    async def exec_async(self, prep_result):
+        await asyncio.sleep(self.delay)
+
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['log'].append(self.name)
+        return self.action
+
+def new_shared():
+    return {'log': [], 'lock': threading.Lock()}
+
+class TestDAGFlow(unittest.TestCase):
+    def test_independent_branches_run_concurrently(self):
+        dag = DAGFlow()
+        schema = dag.add(StepNode("schema", 0.2))
+        embed = dag.add(StepNode("embed", 0.2))
+        dag.add(StepNode("answer"), after=[schema, embed])
+        shared_storage = new_shared()
+        start = time.perf_counter()
+        dag.run(shared_storage)
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(sorted(shared_storage['log'][:2]), ["embed", "schema"])
+        self.assertEqual(shared_storage['log'][2], "answer")  # The join waits on both inputs
+
+    def test_dependency_order(self):
+        dag = DAGFlow()
+        a = dag.add(StepNode("a"))
+        b = dag.add(StepNode("b", 0.05), after=a)
+        c = dag.add(StepNode("c"), after=a)
+        dag.add(StepNode("d"), after=[b, c])
+        shared_storage = new_shared()
+        dag.run(shared_storage)
+        log = shared_storage['log']
+        self.assertEqual(log[0], "a")
+        self.assertEqual(log[-1], "d")
+        self.assertEqual(sorted(log[1:3]), ["b", "c"])
+
+    def test_action_fan_out(self):
+        dag = DAGFlow()
+        route = dag.add(StepNode("route", action="search"))
+        search = dag.add(StepNode("search"), after=(route, "search"))
+        answer = dag.add(StepNode("answer"), after=(route, "answer"))
+        dag.add(StepNode("after_answer"), after=answer)  # Skipped along with its dependency
+        dag.add(StepNode("finish", action="done"), after=search)
+        shared_storage = new_shared()
+        result = dag.run(shared_storage)
+        self.assertEqual(shared_storage['log'], ["route", "search", "finish"])
+        self.assertEqual(result, "done")  # Action of the last node added
+
+    def test_default_action_matches(self):
+        dag = DAGFlow()
+        a = dag.add(StepNode("a"))
+        dag.add(StepNode("b"), after=(a, "default"))
+        shared_storage = new_shared()
+        dag.run(shared_storage)
+        self.assertEqual(shared_storage['log'], ["a", "b"])
+
+    def test_critical_path(self):
+        dag = DAGFlow()
+        fast = dag.add(StepNode("fast", 0.01))
+        slow = dag.add(StepNode("slow", 0.1))
+        join = dag.add(StepNode("join", 0.01), after=[fast, slow])
+        dag.run(new_shared())
+        path = dag.critical_path()
+        self.assertEqual([n for n, _, _ in path], [slow, join])
+        self.assertGreaterEqual(path[-1][2] - path[0][1], 0.11)
+        self.assertEqual(set(dag.timings), {fast, slow, join})
+
+    def test_max_workers(self):
+        dag = DAGFlow(max_workers=1)
+        for i in range(3):
+            dag.add(StepNode(str(i), 0.05))
+        start = time.perf_counter()
+        dag.run(new_shared())
+        self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+
+    def test_params_reach_nodes(self):
+        class ParamNode(Node):
+            def post(self, shared_storage, prep_result, exec_result):
+                shared_storage['seen'] = self.params['doc']
+        dag = DAGFlow()
+        dag.add(ParamNode())
+        dag.set_params({'doc': 'a.txt'})
+        shared_storage = {}
+        dag.run(shared_storage)
+        self.assertEqual(shared_storage['seen'], 'a.txt')
+
+    def test_error_propagates(self):
+        class Failing(Node):
+            def exec(self, prep_result):
+                raise ValueError("boom")
+        dag = DAGFlow()
+        failing = dag.add(Failing())
+        dag.add(StepNode("after"), after=failing)
+        shared_storage = new_shared()
+        with self.assertRaises(ValueError):
+            dag.run(shared_storage)
+        self.assertEqual(shared_storage['log'], [])
+
+    def test_invalid_graphs(self):
+        dag = DAGFlow()
+        dag.add(StepNode("a"), after=StepNode("missing"))
+        with self.assertRaises(ValueError):
+            dag.run(new_shared())
+
+        dag = DAGFlow()
+        a, b = StepNode("a"), StepNode("b")
+        dag.add(a, after=b)
+        dag.add(b, after=a)
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            dag.run(new_shared())
+
+    def test_nested_in_flow(self):
+        dag = DAGFlow()
+        dag.add(StepNode("x"))
+        dag.add(StepNode("y"))
+        start = StepNode("start")
+        start >> dag >> StepNode("end")
+        shared_storage = new_shared()
+        Flow(start=start).compile().run(shared_storage)
+        self.assertEqual(shared_storage['log'][0], "start")
+        self.assertEqual(sorted(shared_storage['log'][1:3]), ["x", "y"])
+        self.assertEqual(shared_storage['log'][3], "end")
+
+class TestAsyncDAGFlow(unittest.TestCase):
+    def test_async_branches_run_concurrently(self):
+        dag = AsyncDAGFlow()
+        a = dag.add(AsyncStepNode("a", 0.2))
+        b = dag.add(AsyncStepNode("b", 0.2))
+        dag.add(AsyncStepNode("join"), after=[a, b])
+        shared_storage = new_shared()
+        start = time.perf_counter()
+        asyncio.run(dag.run_async(shared_storage))
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(shared_storage['log'][-1], "join")
+        self.assertEqual([n.name for n, _, _ in dag.critical_path()][-1], "join")
+
+    def test_max_concurrency(self):
+        dag = AsyncDAGFlow(max_concurrency=1)
+        for i in range(3):
+            dag.add(AsyncStepNode(str(i), 0.05))
+        start = time.perf_counter()
+        asyncio.run(dag.run_async(new_shared()))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+
+    def test_constructor_keywords(self):
+        dag = AsyncDAGFlow(max_concurrency=2, max_workers=2, offload=True, timeout=1.0)
+        self.assertEqual((dag.max_concurrency, dag.max_workers, dag.offload, dag.timeout), (2, 2, True, 1.0))
+        dag.add(AsyncStepNode("only"))
+        shared_storage = new_shared()
+        asyncio.run(dag.run_async(shared_storage))
+        self.assertEqual(shared_storage['log'], ["only"])
+
+    def test_mixed_sync_nodes_offloaded(self):
+        dag = AsyncDAGFlow(offload=True)
+        a = dag.add(StepNode("sync", 0.2))
+        b = dag.add(AsyncStepNode("async", 0.2))
+        dag.add(AsyncStepNode("join"), after=[a, b])
+        shared_storage = new_shared()
+        start = time.perf_counter()
+        asyncio.run(dag.run_async(shared_storage))
+        self.assertLess(time.perf_counter() - start, 0.35)
+
+    def test_failure_cancels_running_branches(self):
+        class Failing(AsyncNode):
+            async def exec_async(self, prep_result):
+                await asyncio.sleep(0.01)
+                raise ValueError("boom")
+        dag = AsyncDAGFlow()
+        dag.add(Failing())
+        dag.add(AsyncStepNode("slow", 1.0))
+        start = time.perf_counter()
+        with self.assertRaises(ValueError):
+            asyncio.run(dag.run_async(new_shared()))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_timeout(self):
+        dag = AsyncDAGFlow(timeout=0.05)
+        dag.add(AsyncStepNode("slow", 1.0))
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(dag.run_async(new_shared()))
+
+    def test_checkpoint_not_supported(self):
+        dag = DAGFlow()
+        dag.add(StepNode("a"))
+        with self.assertRaises(TypeError):
+            dag.run(new_shared(), checkpoint=FileCheckpoint("unused.pkl"))
+
+if __name__ == '__main__':
+    unittest.main()
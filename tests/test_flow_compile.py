@@ -0,0 +1,180 @@
+import unittest
+import asyncio
+import sys
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, Flow, BatchFlow, AsyncNode, AsyncFlow
+
+class CountdownNode(Node):
+    def prep(self, shared_storage):
+        shared_storage['current'] -= 1
+        shared_storage['visits'].append(('countdown', self.params.get('tag')))
+    def post(self, shared_storage, prep_result, exec_result):
+        return 'again' if shared_storage['current'] > 0 else 'done'
+
+class RecordNode(Node):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+    def prep(self, shared_storage):
+        shared_storage['visits'].append((self.name, self.params.get('tag')))
+
+class AsyncCountdownNode(AsyncNode):
+    async def prep_async(self, shared_storage):
+        await asyncio.sleep(0)
+        shared_storage['current'] -= 1
+        shared_storage['visits'].append(('countdown', self.params.get('tag')))
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        return 'again' if shared_storage['current'] > 0 else 'done'
+
+class TagBatchFlow(BatchFlow):
+    def prep(self, shared_storage):
+        return [{'tag': t} for t in shared_storage['tags']]
+
+def build_loop(countdown_cls=CountdownNode):
+    countdown, finish = countdown_cls(), RecordNode('finish')
+    countdown - 'again' >> countdown
+    countdown - 'done' >> finish
+    return countdown
+
+class TestFlowCompile(unittest.TestCase):
+    def run_both(self, make_flow, shared_factory):
+        """Run the same flow compiled and uncompiled and return both shared stores."""
+        plain, compiled = shared_factory(), shared_factory()
+        plain_action = make_flow().run(plain)
+        compiled_action = make_flow().compile().run(compiled)
+        self.assertEqual(plain_action, compiled_action)
+        return plain, compiled
+
+    def test_transition_table(self):
+        """compile() indexes nodes reachable from start, start first."""
+        flow = Flow(start=build_loop()).compile()
+        nodes, table = flow.plan
+        self.assertIsInstance(nodes[0], CountdownNode)
+        self.assertEqual(table, [{'again': 0, 'done': 1}, {}])
+
+    def test_loop_matches_uncompiled(self):
+        plain, compiled = self.run_both(
+            lambda: Flow(start=build_loop()),
+            lambda: {'current': 5, 'visits': []}
+        )
+        self.assertEqual(plain, compiled)
+        self.assertEqual(compiled['visits'][-1], ('finish', None))
+
+    def test_no_copy_per_step(self):
+        """A compiled run copies each node at most once, however many steps it takes."""
+        copies = []
+        class CopyCountingNode(CountdownNode):
+            def __copy__(self):
+                copies.append(self)
+                clone = CountdownNode.__new__(CopyCountingNode)
+                clone.__dict__.update(self.__dict__)
+                return clone
+        node = CopyCountingNode()
+        node - 'again' >> node
+        node - 'done' >> RecordNode('finish')
+        flow = Flow(start=node).compile()
+        flow.run({'current': 100, 'visits': []})
+        self.assertEqual(len(copies), 1)
+
+    def test_node_state_reset_per_visit(self):
+        """A node that keeps state on self sees a fresh copy on each visit, as when uncompiled."""
+        class CountingNode(CountdownNode):
+            def exec(self, prep_result):
+                self.count = getattr(self, 'count', 0) + 1
+                return self.count
+            def post(self, shared_storage, prep_result, exec_result):
+                shared_storage['counts'].append(exec_result)
+                return super().post(shared_storage, prep_result, exec_result)
+        def make_flow():
+            node = CountingNode()
+            node - 'again' >> node
+            node - 'done' >> RecordNode('finish')
+            return Flow(start=node)
+        plain, compiled = self.run_both(make_flow, lambda: {'current': 3, 'visits': [], 'counts': []})
+        self.assertEqual(compiled['counts'], [1, 1, 1])
+        self.assertEqual(plain, compiled)
+
+    def test_edges_added_after_compile(self):
+        """Edges added after compile() are picked up by the next run."""
+        a, b, c = RecordNode('a'), RecordNode('b'), RecordNode('c')
+        a >> b
+        flow = Flow(start=a).compile()
+        b >> c
+        shared_storage = {'visits': []}
+        flow.run(shared_storage)
+        self.assertEqual([v for v, _ in shared_storage['visits']], ['a', 'b', 'c'])
+        self.assertEqual(flow.plan[1], [{'default': 1}, {'default': 2}, {}])
+
+    def test_unrelated_edges_keep_plan(self):
+        """Wiring nodes outside the flow doesn't rebuild its plan; editing successors directly does."""
+        a, b = RecordNode('a'), RecordNode('b')
+        a >> b
+        flow = Flow(start=a).compile()
+        plan = flow.plan
+        RecordNode('x') >> RecordNode('y')
+        flow.run({'visits': []})
+        self.assertIs(flow.plan, plan)
+        b.successors['default'] = RecordNode('c')
+        shared_storage = {'visits': []}
+        flow.run(shared_storage)
+        self.assertEqual([v for v, _ in shared_storage['visits']], ['a', 'b', 'c'])
+
+    def test_original_nodes_untouched(self):
+        start = build_loop()
+        flow = Flow(start=start).compile()
+        flow.set_params({'tag': 'x'})
+        flow.run({'current': 2, 'visits': []})
+        self.assertEqual(start.params, {})
+
+    def test_nested_and_batch_flows(self):
+        def make_flow():
+            inner = Flow(start=build_loop())
+            outer = TagBatchFlow(start=inner)
+            return Flow(start=outer)
+        plain, compiled = self.run_both(
+            make_flow,
+            lambda: {'current': 3, 'visits': [], 'tags': ['a', 'b']}
+        )
+        self.assertEqual(plain, compiled)
+        self.assertIn(('finish', 'b'), compiled['visits'])
+
+    def test_nested_flows_compiled(self):
+        inner = Flow(start=build_loop())
+        outer = Flow(start=inner).compile()
+        self.assertIsNotNone(inner.plan)
+
+    def test_missing_action_warns(self):
+        node = RecordNode('only')
+        node - 'yes' >> RecordNode('never')
+        flow = Flow(start=node).compile()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            flow.run({'visits': []})
+        self.assertTrue(any("Flow ends" in str(x.message) for x in w))
+
+    def test_start_resets_plan(self):
+        flow = Flow(start=build_loop()).compile()
+        flow.start(RecordNode('other'))
+        self.assertIsNone(flow.plan)
+        shared_storage = {'visits': []}
+        flow.run(shared_storage)
+        self.assertEqual(shared_storage['visits'], [('other', None)])
+
+    def test_empty_flow(self):
+        self.assertIsNone(Flow().compile().run({}))
+
+    def test_async_flow(self):
+        def run(compiled):
+            flow = AsyncFlow(start=build_loop(AsyncCountdownNode))
+            if compiled:
+                flow.compile()
+            shared_storage = {'current': 4, 'visits': []}
+            asyncio.run(flow.run_async(shared_storage))
+            return shared_storage
+        self.assertEqual(run(False), run(True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import AsyncNode, AsyncFlow, AsyncParallelBatchNode, Hedge
+
+class TailLatencyNode(AsyncNode):
+    """Each call takes the next delay from `delays`; records started and cancelled calls."""
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = list(delays)
+        self.started = []
+        self.cancelled = []
+
+    async def exec_async(self, prep_result):
+        call = len(self.started)
+        self.started.append(call)
+        try:
+            await asyncio.sleep(self.delays[min(call, len(self.delays) - 1)])
+        except asyncio.CancelledError:
+            self.cancelled.append(call)
+            raise
+        return call
+
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['winner'] = exec_result
+
+class TestHedgePolicy(unittest.TestCase):
+    def test_fixed_delay(self):
+        self.assertEqual(Hedge(delay=0.5, max_ratio=None).after(), 0.5)
+        self.assertIsNone(Hedge(max_ratio=None).after())
+
+    def test_percentile_from_history(self):
+        hedge = Hedge(delay=5.0, percentile=90, min_samples=10, max_ratio=None)
+        for latency in range(9):
+            hedge.record(latency / 100)
+        self.assertEqual(hedge.after(), 5.0)  # Not enough samples yet
+        for latency in range(9, 100):
+            hedge.record(latency / 100)
+        self.assertAlmostEqual(hedge.after(), 0.9)
+
+    def test_max_ratio_caps_extra_load(self):
+        hedge = Hedge(delay=0.1, max_ratio=0.25)
+        allowed = 0
+        for _ in range(100):
+            if hedge.after() is not None:
+                allowed += 1
+                hedge.hedged += 1
+        self.assertLessEqual(allowed, 25)
+        self.assertGreaterEqual(allowed, 24)
+
+class TestHedgedNode(unittest.TestCase):
+    def test_hedge_wins_and_cancels_primary(self):
+        hedge = Hedge(delay=0.05, max_ratio=None)
+        node = TailLatencyNode([1.0, 0.01], hedge=hedge)
+        shared_storage = {}
+        start = time.perf_counter()
+        asyncio.run(node.run_async(shared_storage))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(shared_storage['winner'], 1)
+        self.assertEqual(node.cancelled, [0])
+        self.assertEqual((hedge.calls, hedge.hedged, hedge.wins), (1, 1, 1))
+
+    def test_fast_primary_is_not_hedged(self):
+        hedge = Hedge(delay=0.2, max_ratio=None)
+        node = TailLatencyNode([0.01], hedge=hedge)
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['winner'], 0)
+        self.assertEqual(node.started, [0])
+        self.assertEqual((hedge.hedged, hedge.wins), (0, 0))
+        self.assertEqual(len(hedge.latencies), 1)
+
+    def test_primary_wins_race_and_cancels_hedge(self):
+        hedge = Hedge(delay=0.05, max_ratio=None)
+        node = TailLatencyNode([0.1, 1.0], hedge=hedge)
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['winner'], 0)
+        self.assertEqual(node.cancelled, [1])
+        self.assertEqual((hedge.hedged, hedge.wins), (1, 0))
+        self.assertGreaterEqual(hedge.latencies[0], 0.1)  # The primary's latency, not the hedge delay
+
+    def test_cancelled_primary_recorded_as_lower_bound(self):
+        hedge = Hedge(delay=0.05, max_ratio=None)
+        asyncio.run(TailLatencyNode([1.0, 0.01], hedge=hedge).run_async({}))
+        self.assertEqual(len(hedge.latencies), 1)
+        self.assertGreaterEqual(hedge.latencies[0], 0.05)  # Cut short after the duplicate won, not the duplicate's 0.01s
+        self.assertLess(hedge.latencies[0], 1.0)
+
+    def test_learned_delay_holds_under_steady_tail(self):
+        class SteadyTailNode(AsyncNode):
+            """Two in three calls have a slow first request; duplicates are always fast."""
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.seen = set()
+
+            async def exec_async(self, call):
+                primary = call not in self.seen
+                self.seen.add(call)
+                await asyncio.sleep(0.2 if primary and call % 3 else 0.01)
+
+        hedge = Hedge(delay=0.03, percentile=50, min_samples=4, max_ratio=None)
+        node = SteadyTailNode(hedge=hedge)
+        async def main():
+            for call in range(12):
+                await node._exec(call)
+        asyncio.run(main())
+        self.assertEqual(len(hedge.latencies), 12)
+        self.assertGreaterEqual(hedge.after(), 0.03)  # Recording only finished primaries would learn 0.01
+
+    def test_loser_cleaned_up_before_return(self):
+        node = TailLatencyNode([1.0, 0.01], hedge=Hedge(delay=0.05, max_ratio=None))
+        async def main():
+            result = await node._exec(None)
+            return result, list(node.cancelled)
+        self.assertEqual(asyncio.run(main()), (1, [0]))
+
+    def test_failed_call_waits_for_the_other(self):
+        class FlakyNode(AsyncNode):
+            calls = 0
+            async def exec_async(self, prep_result):
+                FlakyNode.calls += 1
+                if FlakyNode.calls == 1:
+                    await asyncio.sleep(0.1)
+                    raise ValueError("primary failed")
+                await asyncio.sleep(0.2)
+                return "hedge"
+        result = asyncio.run(FlakyNode(hedge=Hedge(delay=0.01, max_ratio=None))._exec(None))
+        self.assertEqual(result, "hedge")
+
+    def test_all_calls_fail_then_retry(self):
+        class AlwaysFails(AsyncNode):
+            async def exec_async(self, prep_result):
+                await asyncio.sleep(0.02)
+                raise ValueError("boom")
+            async def exec_fallback_async(self, prep_result, exc):
+                return str(exc)
+        node = AlwaysFails(max_retries=2, hedge=Hedge(delay=0.0, max_ratio=None))
+        self.assertEqual(asyncio.run(node._exec(None)), "boom")
+
+    def test_timeout_covers_hedged_attempt(self):
+        node = TailLatencyNode([1.0], timeout=0.1, hedge=Hedge(delay=0.02, max_ratio=None))
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(node.run_async({}))
+        self.assertEqual(sorted(node.cancelled), [0, 1])
+
+    def test_shared_policy_learns_across_parallel_items(self):
+        class Translate(AsyncParallelBatchNode):
+            async def prep_async(self, shared_storage):
+                return list(range(40))
+            async def exec_async(self, item):
+                await asyncio.sleep(0.5 if item == 39 else 0.01)
+                return item
+            async def post_async(self, shared_storage, prep_result, exec_result):
+                shared_storage['results'] = exec_result
+
+        hedge = Hedge(delay=None, percentile=90, min_samples=20, max_ratio=0.1)
+        node = Translate(max_concurrency=1, hedge=hedge)
+        shared_storage = {}
+        asyncio.run(AsyncFlow(start=node).run_async(shared_storage))
+        self.assertEqual(shared_storage['results'], list(range(40)))
+        self.assertEqual(hedge.calls, 40)
+        self.assertEqual(hedge.hedged, 1)  # Only the straggler got a duplicate
+
+if __name__ == '__main__':
+    unittest.main()
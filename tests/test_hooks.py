@@ -0,0 +1,169 @@
+import unittest
+import asyncio
+import json
+import time
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, AsyncNode, Flow, AsyncFlow, Hook, Profiler, add_hook, remove_hook
+
+class DecideNode(Node):
+    def prep(self, shared_storage):
+        shared_storage['steps'] -= 1
+    def exec(self, prep_result):
+        time.sleep(0.01)
+    def post(self, shared_storage, prep_result, exec_result):
+        return 'search' if shared_storage['steps'] > 0 else 'answer'
+
+class SearchNode(Node):
+    def post(self, shared_storage, prep_result, exec_result):
+        return 'decide'
+
+class FailingNode(Node):
+    def exec(self, prep_result):
+        raise ValueError("boom")
+    def exec_fallback(self, prep_result, exc):
+        return "fallback"
+
+class AsyncWorkNode(AsyncNode):
+    async def exec_async(self, prep_result):
+        await asyncio.sleep(0.01)
+        return "done"
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        return exec_result
+
+class RecordingHook(Hook):
+    def __init__(self):
+        self.events = []
+    def before(self, node, phase):
+        self.events.append(('before', type(node).__name__, phase))
+        return len(self.events)
+    def after(self, node, phase, token, result, exc=None):
+        self.events.append(('after', type(node).__name__, phase, token) + ((type(exc).__name__,) if exc else ()))
+    def on_retry(self, node, exc, attempt, delay):
+        self.events.append(('retry', type(node).__name__, attempt))
+
+def build_agent_flow():
+    decide, search = DecideNode(), SearchNode()
+    decide - 'search' >> search
+    search - 'decide' >> decide
+    decide - 'answer' >> Node()
+    return Flow(start=decide)
+
+class TestHooks(unittest.TestCase):
+    def test_lifecycle_order(self):
+        hook = add_hook(RecordingHook())
+        try:
+            FailingNode(max_retries=2).run({})
+        finally:
+            remove_hook(hook)
+        self.assertEqual(hook.events, [
+            ('before', 'FailingNode', 'prep'),
+            ('after', 'FailingNode', 'prep', 1),
+            ('before', 'FailingNode', 'exec'),
+            ('retry', 'FailingNode', 0),
+            ('before', 'FailingNode', 'fallback'),
+            ('after', 'FailingNode', 'fallback', 5),
+            ('after', 'FailingNode', 'exec', 3),
+            ('before', 'FailingNode', 'post'),
+            ('after', 'FailingNode', 'post', 8),
+        ])
+    
+    def test_after_called_when_phase_raises(self):
+        class RaisingNode(Node):
+            def exec(self, prep_result):
+                raise ValueError("boom")
+
+        class AsyncRaisingNode(AsyncNode):
+            async def post_async(self, shared_storage, prep_result, exec_result):
+                raise KeyError("missing")
+
+        hook = add_hook(RecordingHook())
+        try:
+            with self.assertRaises(ValueError):
+                RaisingNode().run({})
+            with self.assertRaises(KeyError):
+                asyncio.run(AsyncRaisingNode().run_async({}))
+        finally:
+            remove_hook(hook)
+        self.assertEqual(hook.events[:6], [
+            ('before', 'RaisingNode', 'prep'),
+            ('after', 'RaisingNode', 'prep', 1),
+            ('before', 'RaisingNode', 'exec'),
+            ('before', 'RaisingNode', 'fallback'),
+            ('after', 'RaisingNode', 'fallback', 4, 'ValueError'),
+            ('after', 'RaisingNode', 'exec', 3, 'ValueError'),
+        ])
+        self.assertEqual(hook.events[-1], ('after', 'AsyncRaisingNode', 'post', 11, 'KeyError'))
+
+    def test_removed_hook_not_called(self):
+        hook = add_hook(RecordingHook())
+        remove_hook(hook)
+        DecideNode().run({'steps': 1})
+        self.assertEqual(hook.events, [])
+
+class TestProfiler(unittest.TestCase):
+    def test_profile_agent_loop(self):
+        with Profiler() as prof:
+            build_agent_flow().run({'steps': 3})
+        
+        stats = {(r['node'], r['phase']): r for r in prof.to_dict()['phases']}
+        self.assertEqual(stats[('DecideNode', 'exec')]['calls'], 3)
+        self.assertGreaterEqual(stats[('DecideNode', 'exec')]['wall'], 0.03)
+        self.assertLess(stats[('DecideNode', 'exec')]['cpu'], stats[('DecideNode', 'exec')]['wall'])
+        self.assertEqual(stats[('SearchNode', 'post')]['calls'], 2)
+        
+        edges = {(e['node'], e['action']): e['count'] for e in prof.to_dict()['edges']}
+        self.assertEqual(edges, {
+            ('DecideNode', 'search'): 2,
+            ('SearchNode', 'decide'): 2,
+            ('DecideNode', 'answer'): 1,
+            ('Node', 'default'): 1,
+        })
+    
+    def test_retry_and_fallback_counts(self):
+        with Profiler() as prof:
+            FailingNode(max_retries=3).run({})
+        stats = {(r['node'], r['phase']): r['calls'] for r in prof.to_dict()['phases']}
+        self.assertEqual(stats[('FailingNode', 'retry')], 2)
+        self.assertEqual(stats[('FailingNode', 'fallback')], 1)
+    
+    def test_failed_calls_recorded(self):
+        class SlowFailingNode(Node):
+            def exec(self, prep_result):
+                time.sleep(0.01)
+                raise ValueError("boom")
+        with Profiler() as prof:
+            with self.assertRaises(ValueError):
+                Flow(start=SlowFailingNode()).run({})
+        stats = {(r['node'], r['phase']): r for r in prof.to_dict()['phases']}
+        self.assertEqual((stats[('SlowFailingNode', 'exec')]['calls'], stats[('SlowFailingNode', 'exec')]['errors']), (1, 1))
+        self.assertGreaterEqual(stats[('SlowFailingNode', 'exec')]['wall'], 0.01)
+        self.assertNotIn(('SlowFailingNode', 'post'), stats)
+
+    def test_async_nodes(self):
+        with Profiler() as prof:
+            asyncio.run(AsyncFlow(start=AsyncWorkNode()).run_async({}))
+        stats = {(r['node'], r['phase']): r for r in prof.to_dict()['phases']}
+        self.assertGreaterEqual(stats[('AsyncWorkNode', 'exec')]['wall'], 0.01)
+        self.assertIsNone(stats[('AsyncWorkNode', 'exec')]['cpu'])  # Would include other coroutines
+        self.assertEqual(prof.edges, {('AsyncWorkNode', 'done'): 1})
+    
+    def test_exports(self):
+        with Profiler() as prof:
+            DecideNode().run({'steps': 1})
+        data = json.loads(prof.to_json())
+        self.assertEqual(data['phases'][0]['phase'], 'exec')  # Sorted by wall time
+        table = prof.table()
+        self.assertIn('DecideNode', table)
+        self.assertIn('-[answer]->', table)
+    
+    def test_disabled_after_exit(self):
+        with Profiler() as prof:
+            pass
+        DecideNode().run({'steps': 1})
+        self.assertEqual(prof.stats, {})
+
+if __name__ == '__main__':
+    unittest.main()
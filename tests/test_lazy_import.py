@@ -0,0 +1,53 @@
+import unittest
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+import pocketflow
+
+HEAVY = ["asyncio", "concurrent.futures", "multiprocessing", "sqlite3", "inspect", "json", "pickle", "re", "typing",
+         "pocketflow.dag", "pocketflow.isolation", "pocketflow.nodes", "pocketflow.policies", "pocketflow.profiler",
+         "pocketflow.storage"]
+
+def loaded_after(code):
+    """Run `code` in a fresh interpreter and return which HEAVY modules it loaded."""
+    probe = f"import sys; sys.path.insert(0, {str(ROOT)!r}); {code}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout.strip()
+    return out.split(",") if out else []
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_pocketflow_is_light(self):
+        self.assertEqual(loaded_after("import pocketflow"), [])
+
+    def test_import_tools_is_light(self):
+        self.assertEqual(loaded_after("import pocketflow_tools"), [])
+
+    def test_sync_flow_stays_light(self):
+        code = "from pocketflow import Node, Flow; Flow(start=Node()).run({})"
+        self.assertEqual(loaded_after(code), [])
+
+    def test_optional_features_load_on_first_use(self):
+        code = "from pocketflow import Node, Flow, RetryPolicy, SharedStore; Flow(start=Node(retry=RetryPolicy())).run(SharedStore())"
+        self.assertEqual(loaded_after(code), ["pocketflow.policies", "pocketflow.storage"])
+
+    def test_lazy_module_is_replaced_on_first_use(self):
+        pocketflow.asyncio.sleep  # Any attribute access loads the module
+        import asyncio
+        self.assertIs(pocketflow.asyncio, asyncio)
+
+    def test_star_import_exports_public_api_only(self):
+        namespace = {}
+        exec("from pocketflow import *", namespace)
+        self.assertIn("AsyncFlow", namespace)
+        self.assertIn("time_left", namespace)
+        for name in ("asyncio", "copy", "json", "sqlite3", "MutableMapping", "time"):
+            self.assertNotIn(name, namespace)
+
+    def test_async_classes_load_asyncio_on_use(self):
+        code = "import asyncio; from pocketflow import AsyncNode; asyncio.run(AsyncNode().run_async({}))"
+        self.assertIn("asyncio", loaded_after(code))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, AsyncNode, Flow, ParallelBatchFlow, AsyncParallelBatchFlow, Appended
+
+GRADES = {
+    'class_a': {'ann': [90, 80], 'bob': [70, 60]},
+    'class_b': {'cat': [100, 100], 'dan': [50, 70], 'eve': [80, 80]},
+}
+
+class LoadGrades(Node):
+    def prep(self, shared_storage):
+        return self.params['class'], self.params['student']
+    def exec(self, key):
+        time.sleep(0.05)  # Simulate slow I/O
+        class_name, student = key
+        return GRADES[class_name][student]
+    def post(self, shared_storage, prep_result, grades):
+        shared_storage['grades'] = grades  # Same key in every branch
+        return "calculate"
+
+class CalculateAverage(Node):
+    def prep(self, shared_storage):
+        return shared_storage['grades']
+    def exec(self, grades):
+        return sum(grades) / len(grades)
+    def post(self, shared_storage, prep_result, average):
+        if 'results' not in shared_storage:
+            shared_storage['results'] = {}
+        class_name, student = self.params['class'], self.params['student']
+        shared_storage['results'].setdefault(class_name, {})[student] = average
+
+class ClassBatchFlow(ParallelBatchFlow):
+    def prep(self, shared_storage):
+        return [{'student': s} for s in GRADES[self.params['class']]]
+    def post(self, shared_storage, prep_result, exec_result):
+        results = shared_storage['results'][self.params['class']]
+        shared_storage.setdefault('class_averages', {})[self.params['class']] = sum(results.values()) / len(results)
+
+class SchoolBatchFlow(ParallelBatchFlow):
+    def prep(self, shared_storage):
+        return [{'class': c} for c in GRADES]
+
+def create_school_flow():
+    load, calc = LoadGrades(), CalculateAverage()
+    load - "calculate" >> calc
+    return SchoolBatchFlow(start=ClassBatchFlow(start=Flow(start=load)))
+
+class AppendTag(Node):
+    def prep(self, shared_storage):
+        if self.params['tag'] == 'writer':
+            shared_storage['log'].append('written')
+        shared_storage['seen_' + self.params['tag']] = list(shared_storage['log'])
+
+class TagFlow(ParallelBatchFlow):
+    def prep(self, shared_storage):
+        return [{'tag': 'writer'}, {'tag': 'reader'}]
+
+class TestParallelBatchFlow(unittest.TestCase):
+    def test_nested_parallel_batches(self):
+        """
+        Test nested batch flows running in threads with isolated shared stores
+        """
+        shared_storage = {}
+        start_time = time.perf_counter()
+        create_school_flow().run(shared_storage)
+        execution_time = time.perf_counter() - start_time
+        
+        self.assertEqual(shared_storage['results'], {
+            'class_a': {'ann': 85.0, 'bob': 65.0},
+            'class_b': {'cat': 100.0, 'dan': 60.0, 'eve': 80.0},
+        })
+        self.assertEqual(shared_storage['class_averages'], {'class_a': 75.0, 'class_b': 80.0})
+        self.assertLess(execution_time, 0.15)  # 5 students would take 0.25s serially
+    
+    def test_branches_do_not_see_each_other(self):
+        shared_storage = {'log': []}
+        TagFlow(start=AppendTag()).run(shared_storage)
+        
+        self.assertEqual(shared_storage['seen_writer'], ['written'])
+        self.assertEqual(shared_storage['seen_reader'], [])
+        # The reader's untouched copy of 'log' must not overwrite the writer's append
+        self.assertEqual(shared_storage['log'], ['written'])
+    
+    def test_custom_merge(self):
+        class SumFlow(ParallelBatchFlow):
+            def prep(self, shared_storage):
+                return [{'n': n} for n in range(1, 5)]
+            def merge(self, shared_storage, prep_result, updates):
+                shared_storage['total'] += sum(u['total'] - shared_storage['total'] for u in updates)
+        
+        class AddN(Node):
+            def post(self, shared_storage, prep_result, exec_result):
+                shared_storage['total'] += self.params['n']
+        
+        shared_storage = {'total': 100}
+        SumFlow(start=AddN(), max_workers=2).run(shared_storage)
+        self.assertEqual(shared_storage['total'], 110)
+    
+    def test_container_changes_merged_from_every_branch(self):
+        class Collect(Node):
+            def post(self, shared_storage, prep_result, exec_result):
+                i = self.params['i']
+                shared_storage['log'].append(i)
+                shared_storage['tags'].add(i)
+                shared_storage['tags'].discard('stale')
+                shared_storage['counts'][i] = shared_storage['counts'].get(i, 0) + 1
+                if i == 0:
+                    del shared_storage['scratch']
+
+        class CollectFlow(ParallelBatchFlow):
+            def prep(self, shared_storage):
+                return [{'i': i} for i in range(4)]
+
+        shared_storage = {'log': ['old'], 'tags': {'stale'}, 'counts': {0: 5}, 'scratch': 1}
+        CollectFlow(start=Collect(), max_workers=4).run(shared_storage)
+        self.assertEqual(shared_storage['log'], ['old', 0, 1, 2, 3])  # Appends in prep() order
+        self.assertEqual(shared_storage['tags'], {0, 1, 2, 3})
+        self.assertEqual(shared_storage['counts'], {0: 6, 1: 1, 2: 1, 3: 1})
+        self.assertNotIn('scratch', shared_storage)
+
+    def test_merge_receives_only_branch_changes(self):
+        class Append(Node):
+            def post(self, shared_storage, prep_result, exec_result):
+                shared_storage['log'].append(self.params['i'])
+
+        class LogFlow(ParallelBatchFlow):
+            def prep(self, shared_storage):
+                return [{'i': i} for i in range(3)]
+            def merge(self, shared_storage, prep_result, updates):
+                self.seen = updates
+                for u in updates:
+                    shared_storage['log'].extend(u['log'])
+
+        flow = LogFlow(start=Append())
+        shared_storage = {'log': ['old']}
+        flow.run(shared_storage)
+        self.assertEqual(flow.seen, [{'log': [0]}, {'log': [1]}, {'log': [2]}])
+        self.assertIsInstance(flow.seen[0]['log'], Appended)
+        self.assertEqual(shared_storage['log'], ['old', 0, 1, 2])
+
+    def test_readonly_keys_not_copied(self):
+        class ReadDocs(Node):
+            def prep(self, shared_storage):
+                shared_storage['seen'] = shared_storage['docs']
+                shared_storage['total'] = sum(len(d) for d in shared_storage['docs'])
+
+        class OverwriteDocs(Node):
+            def prep(self, shared_storage):
+                shared_storage['docs'] = []
+
+        class DocFlow(ParallelBatchFlow):
+            def prep(self, shared_storage):
+                return [{'i': i} for i in range(3)]
+
+        docs = ['a', 'bb', 'ccc']
+        shared_storage = {'docs': docs}
+        DocFlow(start=ReadDocs(), readonly=('docs',)).run(shared_storage)
+        self.assertIs(shared_storage['seen'], docs)  # Branches read the parent's list itself
+        self.assertIs(shared_storage['docs'], docs)
+        self.assertEqual(shared_storage['total'], 6)
+        with self.assertRaises(TypeError):
+            DocFlow(start=OverwriteDocs(), readonly=('docs',)).run(shared_storage)
+
+    def test_shared_mode(self):
+        """
+        Test that isolate=False runs branches directly on the shared store
+        """
+        shared_storage = {'log': []}
+        TagFlow(start=AppendTag(), isolate=False).run(shared_storage)
+        self.assertEqual(shared_storage['log'], ['written'])
+        self.assertIn(shared_storage['seen_reader'], ([], ['written']))
+
+class TestAsyncIsolatedBatchFlow(unittest.TestCase):
+    def test_async_isolate(self):
+        class AsyncCounter(AsyncNode):
+            async def prep_async(self, shared_storage):
+                count = shared_storage['counts'].get('n', 0)
+                await asyncio.sleep(0.01)  # Interleave branches
+                shared_storage['counts']['n'] = count + 1
+                shared_storage['counts'][self.params['key']] = True
+        
+        class KeyFlow(AsyncParallelBatchFlow):
+            async def prep_async(self, shared_storage):
+                return [{'key': k} for k in 'abc']
+        
+        shared_storage = {'counts': {}}
+        asyncio.run(KeyFlow(start=AsyncCounter(), isolate=True).run_async(shared_storage))
+        self.assertEqual(shared_storage['counts'], {'n': 1, 'a': True, 'b': True, 'c': True})
+
+if __name__ == '__main__':
+    unittest.main()
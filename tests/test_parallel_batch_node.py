@@ -0,0 +1,121 @@
+import unittest
+import threading
+import time
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import ParallelBatchNode, Flow
+
+class SlowDoubler(ParallelBatchNode):
+    def __init__(self, delay=0.1, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+    
+    def prep(self, shared_storage):
+        return shared_storage.get('input_numbers', [])
+    
+    def exec(self, number):
+        time.sleep(self.delay * (1 if number % 2 else 0.5))  # Uneven latency
+        return number * 2
+        
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['processed_numbers'] = exec_result
+        shared_storage['latencies'] = self.latencies
+        return "processed"
+
+class FlakyNode(ParallelBatchNode):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()
+        self.attempts = {}
+    
+    def prep(self, shared_storage):
+        return shared_storage['items']
+    
+    def exec(self, item):
+        with self.lock:
+            self.attempts[item] = self.attempts.get(item, 0) + 1
+            attempt = self.attempts[item]
+        if item == 'always_fails' or attempt < 2:
+            raise ValueError(f"Failed on {item}")
+        return f"{item}@{self.cur_retry}"
+    
+    def exec_fallback(self, prep_result, exc):
+        return f"fallback:{prep_result}"
+    
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['results'] = exec_result
+
+class TestParallelBatchNode(unittest.TestCase):
+    def test_parallel_processing(self):
+        """
+        Test that items run concurrently while preserving input order
+        """
+        shared_storage = {'input_numbers': list(range(5))}
+        processor = SlowDoubler(delay=0.1, max_workers=5)
+        
+        start_time = time.perf_counter()
+        action = processor.run(shared_storage)
+        execution_time = time.perf_counter() - start_time
+        
+        self.assertEqual(action, "processed")
+        self.assertEqual(shared_storage['processed_numbers'], [0, 2, 4, 6, 8])
+        self.assertLess(execution_time, 0.2)
+    
+    def test_per_item_latency(self):
+        """
+        Test that per-item latencies are reported in item order
+        """
+        shared_storage = {'input_numbers': [0, 1]}
+        SlowDoubler(delay=0.1, max_workers=2).run(shared_storage)
+        
+        fast, slow = shared_storage['latencies']
+        self.assertGreaterEqual(fast, 0.05)
+        self.assertGreaterEqual(slow, 0.1)
+        self.assertLess(fast, slow)
+    
+    def test_max_workers_limits_concurrency(self):
+        """
+        Test that max_workers bounds the number of items in flight
+        """
+        shared_storage = {'input_numbers': [1, 3, 5, 7]}
+        start_time = time.perf_counter()
+        SlowDoubler(delay=0.1, max_workers=2).run(shared_storage)
+        execution_time = time.perf_counter() - start_time
+        
+        self.assertEqual(shared_storage['processed_numbers'], [2, 6, 10, 14])
+        self.assertGreaterEqual(execution_time, 0.2)
+    
+    def test_per_item_retry_and_fallback(self):
+        """
+        Test that retries and fallback are applied to each item independently
+        """
+        shared_storage = {'items': ['a', 'b', 'always_fails', 'c']}
+        FlakyNode(max_retries=3, max_workers=4).run(shared_storage)
+        
+        self.assertEqual(
+            shared_storage['results'],
+            ['a@1', 'b@1', 'fallback:always_fails', 'c@1']
+        )
+    
+    def test_empty_input(self):
+        """
+        Test that an empty prep result yields an empty result list
+        """
+        shared_storage = {'input_numbers': []}
+        SlowDoubler(max_workers=2).run(shared_storage)
+        self.assertEqual(shared_storage['processed_numbers'], [])
+        self.assertEqual(shared_storage['latencies'], [])
+    
+    def test_in_flow(self):
+        """
+        Test a ParallelBatchNode chained inside a Flow
+        """
+        shared_storage = {'input_numbers': list(range(4))}
+        flow = Flow(start=SlowDoubler(delay=0.01, max_workers=4))
+        flow.run(shared_storage)
+        self.assertEqual(shared_storage['processed_numbers'], [0, 2, 4, 6])
+
+if __name__ == '__main__':
+    unittest.main()
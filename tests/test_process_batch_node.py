@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, ProcessBatchNode, Flow
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class SquareNode(ProcessBatchNode):
+    def prep(self, shared_storage):
+        shared_storage['prep_pid'] = os.getpid()
+        return shared_storage['numbers']
+    
+    def exec(self, number):
+        if number < 0:
+            raise ValueError("negative")
+        return number * number, os.getpid()
+    
+    def exec_fallback(self, prep_result, exc):
+        return None, os.getpid()
+        
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['squares'] = [r for r, _ in exec_result]
+        shared_storage['exec_pids'] = {pid for _, pid in exec_result}
+        shared_storage['post_pid'] = os.getpid()
+        shared_storage['latencies'] = self.latencies
+        return "done"
+
+class UnpicklableNode(SquareNode):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()
+
+class LockedNode(Node):
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+
+class InvertNode(ProcessBatchNode):
+    def prep(self, shared_storage):
+        return shared_storage['arrays']
+    
+    def exec(self, array):
+        array_sum = float(array.sum())  # Read from shared memory
+        return 255 - array, array_sum
+        
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage['inverted'] = exec_result
+
+class TestProcessBatchNode(unittest.TestCase):
+    def test_results_in_order(self):
+        """
+        Test that items are processed in worker processes and returned in order
+        """
+        shared_storage = {'numbers': list(range(20))}
+        action = SquareNode(max_workers=2).run(shared_storage)
+        
+        self.assertEqual(action, "done")
+        self.assertEqual(shared_storage['squares'], [i * i for i in range(20)])
+        self.assertNotIn(os.getpid(), shared_storage['exec_pids'])
+        self.assertEqual(shared_storage['prep_pid'], os.getpid())
+        self.assertEqual(shared_storage['post_pid'], os.getpid())
+        self.assertEqual(len(shared_storage['latencies']), 20)
+    
+    def test_chunked_submission(self):
+        shared_storage = {'numbers': list(range(10))}
+        SquareNode(max_workers=2, chunksize=5).run(shared_storage)
+        self.assertEqual(shared_storage['squares'], [i * i for i in range(10)])
+    
+    def test_per_item_fallback(self):
+        shared_storage = {'numbers': [1, -1, 2]}
+        SquareNode(max_retries=2, max_workers=2).run(shared_storage)
+        self.assertEqual(shared_storage['squares'], [1, None, 4])
+    
+    def test_unpicklable_node(self):
+        """
+        Test that a node that cannot be pickled fails fast with a clear error
+        """
+        with self.assertRaises(TypeError) as ctx:
+            UnpicklableNode(max_workers=2).run({'numbers': [1, 2]})
+        self.assertIn("must be picklable", str(ctx.exception))
+    
+    def test_successors_not_shipped(self):
+        """
+        Test that unpicklable successors do not block the node itself
+        """
+        node = SquareNode(max_workers=2)
+        node - "done" >> LockedNode()
+        shared_storage = {'numbers': [3]}
+        Flow(start=node).run(shared_storage)
+        self.assertEqual(shared_storage['squares'], [9])
+    
+    def test_empty_input(self):
+        shared_storage = {'numbers': []}
+        SquareNode(max_workers=2).run(shared_storage)
+        self.assertEqual(shared_storage['squares'], [])
+    
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_shared_memory(self):
+        """
+        Test that large arrays are sent through shared memory and small ones by pickling
+        """
+        big = np.full((512, 1024, 3), 7, dtype=np.uint8)  # Above the 1 MiB threshold
+        small = np.arange(6, dtype=np.uint8).reshape(2, 3)
+        shared_storage = {'arrays': [big, small]}
+        InvertNode(max_workers=2).run(shared_storage)
+        
+        (big_out, big_sum), (small_out, small_sum) = shared_storage['inverted']
+        self.assertTrue((big_out == 248).all())
+        self.assertEqual(big_sum, float(big.sum()))
+        self.assertEqual(small_out.tolist(), (255 - small).tolist())
+        self.assertEqual(small_sum, 15.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import AsyncFlow, AsyncQuorumBatchNode
+
+class VoteNode(AsyncQuorumBatchNode):
+    """Attempt i answers `answers[i]` after `delays[i]` seconds."""
+    def __init__(self, answers, delays=None, **kwargs):
+        super().__init__(**kwargs)
+        self.answers = answers
+        self.delays = delays or [0.01 * (i + 1) for i in range(len(answers))]
+        self.finished = []
+
+    async def prep_async(self, shared_storage):
+        return list(range(len(self.answers)))
+
+    async def exec_async(self, i):
+        await asyncio.sleep(self.delays[i])
+        self.finished.append(i)
+        if isinstance(self.answers[i], Exception):
+            raise self.answers[i]
+        return self.answers[i]
+
+    async def exec_fallback_async(self, i, exc):
+        return None
+
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['answer'] = exec_result
+        shared_storage['votes'] = dict(self.votes)
+        shared_storage['cancelled'] = self.cancelled
+
+class TestAsyncQuorumBatchNode(unittest.TestCase):
+    def test_stops_when_lead_is_insurmountable(self):
+        # After three matching answers, the two outstanding attempts can't change the result
+        node = VoteNode(["a", "a", "a", "b", "b"], delays=[0.01, 0.02, 0.03, 1.0, 1.0])
+        shared_storage = {}
+        start = time.perf_counter()
+        asyncio.run(node.run_async(shared_storage))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(shared_storage['answer'], "a")
+        self.assertEqual(shared_storage['votes'], {"a": 3})
+        self.assertEqual(shared_storage['cancelled'], 2)
+        self.assertEqual(sorted(node.finished), [0, 1, 2])
+
+    def test_waits_while_outcome_is_open(self):
+        node = VoteNode(["a", "b", "a", "b", "b"])
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['answer'], "b")
+        self.assertEqual(shared_storage['votes'], {"a": 2, "b": 3})
+        self.assertEqual(shared_storage['cancelled'], 0)
+
+    def test_quorum_stops_early(self):
+        node = VoteNode(["a", "b", "a", "c", "d", "e", "f"], quorum=2)
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['answer'], "a")
+        self.assertEqual(shared_storage['votes'], {"a": 2, "b": 1})
+        self.assertEqual(shared_storage['cancelled'], 4)
+
+    def test_failed_attempts_abstain(self):
+        node = VoteNode([ValueError("bad yaml"), "a", ValueError("bad yaml"), "a", "b"])
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['answer'], "a")
+        self.assertEqual(shared_storage['votes'], {"a": 2})  # Failures don't count; "b" can't catch up
+
+    def test_no_votes(self):
+        node = VoteNode([ValueError("bad yaml")] * 3)
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertIsNone(shared_storage['answer'])
+        self.assertEqual(shared_storage['votes'], {})
+
+    def test_custom_vote_key(self):
+        class RoundedVote(VoteNode):
+            def vote(self, exec_res):
+                return None if exec_res is None else round(exec_res["answer"], 2)
+
+        answers = [{"answer": 0.3331, "why": "x"}, {"answer": 0.3329, "why": "y"}, {"answer": 0.6, "why": "z"}]
+        node = RoundedVote(answers, delays=[0.01, 0.02, 1.0])
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['answer'], answers[0])  # First result with the winning key
+        self.assertEqual(shared_storage['votes'], {0.33: 2})
+
+    def test_respects_max_concurrency(self):
+        node = VoteNode(["a"] * 9, max_concurrency=2)
+        shared_storage = {}
+        asyncio.run(AsyncFlow(start=node).run_async(shared_storage))
+        self.assertEqual(shared_storage['votes'], {"a": 5})
+        self.assertLessEqual(len(node.finished), 6)
+
+    def test_unhandled_error_cancels_attempts(self):
+        class Strict(VoteNode):
+            async def exec_fallback_async(self, i, exc):
+                raise exc
+
+        node = Strict([ValueError("boom"), "a", "a"], delays=[0.01, 1.0, 1.0])
+        start = time.perf_counter()
+        with self.assertRaises(ValueError):
+            asyncio.run(node.run_async({}))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
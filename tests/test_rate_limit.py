@@ -0,0 +1,159 @@
+import unittest
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import AsyncParallelBatchNode, AsyncFlow, RateLimiter
+
+class TrackingNode(AsyncParallelBatchNode):
+    def __init__(self, delay=0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def prep_async(self, shared_storage):
+        return shared_storage['items']
+    
+    async def exec_async(self, item):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return item * 10
+    
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['results'] = exec_result
+        shared_storage['peak'] = self.peak
+        shared_storage['wait_times'] = self.wait_times
+        return "done"
+
+class TokenHeavyNode(TrackingNode):
+    def estimate_tokens(self, item):
+        return len(item)
+    
+    async def exec_async(self, item):
+        return item.upper()
+
+class TestBoundedConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+    
+    def tearDown(self):
+        self.loop.close()
+    
+    def test_max_concurrency(self):
+        """
+        Test that no more than max_concurrency items run at once
+        """
+        shared_storage = {'items': list(range(10))}
+        node = TrackingNode(max_concurrency=3)
+        self.loop.run_until_complete(node.run_async(shared_storage))
+        
+        self.assertEqual(shared_storage['results'], [i * 10 for i in range(10)])
+        self.assertEqual(shared_storage['peak'], 3)
+        self.assertEqual(len(shared_storage['wait_times']), 10)
+        self.assertGreater(max(shared_storage['wait_times']), 0.1)
+    
+    def test_unbounded_by_default(self):
+        """
+        Test that all items run concurrently when no limit is configured
+        """
+        shared_storage = {'items': list(range(10))}
+        node = TrackingNode()
+        self.loop.run_until_complete(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['peak'], 10)
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+    
+    def tearDown(self):
+        self.loop.close()
+    
+    def test_requests_per_second(self):
+        """
+        Test that the request bucket spaces out calls beyond the burst
+        """
+        limiter = RateLimiter(rps=20)  # Burst of 20, then one every 50ms
+        shared_storage = {'items': list(range(25))}
+        node = TrackingNode(delay=0, rate_limiter=limiter)
+        
+        start = self.loop.time()
+        self.loop.run_until_complete(node.run_async(shared_storage))
+        elapsed = self.loop.time() - start
+        
+        self.assertEqual(len(shared_storage['results']), 25)
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(limiter.acquired, 25)
+        self.assertEqual(limiter.waiting, 0)
+        self.assertGreater(limiter.max_waiting, 1)
+        self.assertGreater(limiter.wait_time, 0)
+    
+    def test_tokens_per_second(self):
+        """
+        Test that token cost is drawn from the token bucket
+        """
+        limiter = RateLimiter(tps=100)
+        shared_storage = {'items': ['x' * 50] * 3}  # 150 tokens vs 100 burst
+        node = TokenHeavyNode(rate_limiter=limiter)
+        
+        start = self.loop.time()
+        self.loop.run_until_complete(node.run_async(shared_storage))
+        elapsed = self.loop.time() - start
+        
+        self.assertEqual(shared_storage['results'], ['X' * 50] * 3)
+        self.assertGreaterEqual(elapsed, 0.45)
+    
+    def test_shared_limiter_across_nodes(self):
+        """
+        Test that one limiter instance throttles every node in a flow
+        """
+        limiter = RateLimiter(rps=10)
+        first = TrackingNode(delay=0, rate_limiter=limiter)
+        second = TrackingNode(delay=0, rate_limiter=limiter)
+        first - "done" >> second
+        shared_storage = {'items': list(range(8))}
+        
+        start = self.loop.time()
+        self.loop.run_until_complete(AsyncFlow(start=first).run_async(shared_storage))
+        elapsed = self.loop.time() - start
+        
+        self.assertEqual(limiter.acquired, 16)
+        self.assertGreaterEqual(elapsed, 0.5)
+
+    def test_shared_limiter_across_event_loops(self):
+        """
+        Test that one limiter keeps working when flows run one after another in new event loops
+        """
+        limiter = RateLimiter(rps=5)
+        for _ in range(2):
+            shared_storage = {'items': list(range(8))}
+            asyncio.run(AsyncFlow(start=TrackingNode(delay=0, rate_limiter=limiter)).run_async(shared_storage))
+            self.assertEqual(shared_storage['results'], [i * 10 for i in range(8)])
+        self.assertEqual(limiter.acquired, 16)
+
+    def test_cancelled_wait_returns_its_slot(self):
+        """
+        Test that a waiter cancelled before its slot comes up gives the slot back
+        """
+        limiter = RateLimiter(rps=2)  # Burst of 2, then one every 500ms
+
+        async def main():
+            await limiter.acquire()
+            await limiter.acquire()
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(limiter.acquire(), 0.05)
+            start = asyncio.get_running_loop().time()
+            await limiter.acquire()
+            return asyncio.get_running_loop().time() - start
+
+        self.assertLess(self.loop.run_until_complete(main()), 0.5)
+        self.assertEqual(limiter.acquired, 3)
+
+if __name__ == '__main__':
+    unittest.main()
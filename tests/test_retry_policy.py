@@ -0,0 +1,131 @@
+import unittest
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, AsyncNode, Flow, RetryPolicy, RetryBudget
+
+class FlakyNode(Node):
+    def __init__(self, failures, error=ValueError, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.error = error
+        self.attempts = 0
+    
+    def exec(self, prep_result):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.error(f"attempt {self.attempts}")
+        return "ok"
+    
+    def exec_fallback(self, prep_result, exc):
+        return f"fallback after {self.attempts}"
+    
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage.setdefault('results', []).append(exec_result)
+
+class AsyncFlakyNode(AsyncNode):
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.attempts = 0
+    
+    async def exec_async(self, prep_result):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ValueError("async failure")
+        return "ok"
+
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['result'] = exec_result
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(backoff=2, max_wait=5)
+        delays = [policy.delay(1, attempt, ValueError()) for attempt in range(5)]
+        self.assertEqual(delays, [1, 2, 4, 5, 5])
+        self.assertEqual(policy.retries, 5)
+    
+    def test_full_jitter(self):
+        policy = RetryPolicy(backoff=2, jitter=True)
+        for attempt in range(4):
+            delay = policy.delay(1, attempt, ValueError())
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 2 ** attempt)
+    
+    def test_node_sleeps_with_backoff(self):
+        node = FlakyNode(failures=3, max_retries=4, wait=0.5, retry=RetryPolicy(backoff=3))
+        shared_storage = {}
+        with patch('pocketflow.time.sleep') as sleep:
+            node.run(shared_storage)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.5, 1.5, 4.5])
+        self.assertEqual(shared_storage['results'], ["ok"])
+    
+    def test_retry_on_exception_types(self):
+        """
+        Test that non-retryable exceptions go straight to the fallback
+        """
+        policy = RetryPolicy(retry_on=(TimeoutError, ConnectionError))
+        node = FlakyNode(failures=5, error=KeyError, max_retries=5, retry=policy)
+        shared_storage = {}
+        node.run(shared_storage)
+        self.assertEqual(shared_storage['results'], ["fallback after 1"])
+        self.assertEqual(policy.retries, 0)
+        self.assertEqual(policy.giveups, 1)
+    
+    def test_retry_on_predicate(self):
+        policy = RetryPolicy(retry_on=lambda exc: "attempt 1" in str(exc))
+        node = FlakyNode(failures=5, max_retries=5, retry=policy)
+        shared_storage = {}
+        node.run(shared_storage)
+        self.assertEqual(shared_storage['results'], ["fallback after 2"])
+    
+    def test_exhausted_retries_counted(self):
+        policy = RetryPolicy()
+        node = FlakyNode(failures=5, max_retries=3, retry=policy)
+        shared_storage = {}
+        node.run(shared_storage)
+        self.assertEqual(shared_storage['results'], ["fallback after 3"])
+        self.assertEqual((policy.retries, policy.giveups), (2, 1))
+    
+    def test_shared_budget_across_flow(self):
+        """
+        Test that a retry budget shared by several nodes stops retries once spent
+        """
+        budget = RetryBudget(retries=3, per=3600)
+        policy = RetryPolicy(budget=budget)
+        first = FlakyNode(failures=10, max_retries=3, retry=policy)
+        second = FlakyNode(failures=10, max_retries=3, retry=policy)
+        first >> second
+        shared_storage = {}
+        Flow(start=first).run(shared_storage)
+        
+        self.assertEqual(shared_storage['results'], ["fallback after 3", "fallback after 2"])
+        self.assertEqual(budget.spent, 3)
+        self.assertEqual(budget.rejected, 1)
+    
+    def test_budget_refills(self):
+        budget = RetryBudget(retries=2, per=0.1)
+        self.assertTrue(budget.spend())
+        self.assertTrue(budget.spend())
+        self.assertFalse(budget.spend())
+        with patch('pocketflow.time.monotonic', return_value=budget.last + 0.05):
+            self.assertTrue(budget.spend())
+    
+    def test_async_node(self):
+        node = AsyncFlakyNode(failures=2, max_retries=3, wait=0.01, retry=RetryPolicy(backoff=2))
+        shared_storage = {}
+        asyncio.run(node.run_async(shared_storage))
+        self.assertEqual(shared_storage['result'], "ok")
+        self.assertEqual(node.retry.retries, 2)
+    
+    def test_default_fixed_wait_unchanged(self):
+        node = FlakyNode(failures=2, max_retries=3, wait=0.2)
+        with patch('pocketflow.time.sleep') as sleep:
+            node.run({})
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.2, 0.2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import copy
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, Flow, ParallelBatchFlow, SharedStore, FileCheckpoint, DELETED
+
+class QAState(SharedStore):
+    __slots__ = ("question", "docs", "answer")
+
+class ChatState(QAState):
+    __slots__ = ("history",)
+
+class TestSharedStore(unittest.TestCase):
+    def test_mapping_interface(self):
+        store = QAState(question="why?", topic="sky")
+        self.assertEqual(store["question"], "why?")
+        self.assertEqual(store["topic"], "sky")  # Undeclared keys are allowed
+        self.assertEqual(store.question, "why?")
+        self.assertEqual(dict(store), {"question": "why?", "topic": "sky"})
+        self.assertEqual(len(store), 2)
+        self.assertIn("question", store)
+        self.assertNotIn("answer", store)
+        self.assertIsNone(store.get("answer"))
+        self.assertEqual(store.setdefault("docs", []), [])
+        with self.assertRaises(KeyError):
+            store["answer"]
+        del store["topic"]
+        with self.assertRaises(KeyError):
+            del store["answer"]
+        self.assertEqual(list(store), ["question", "docs"])
+
+    def test_declared_fields_use_slots(self):
+        self.assertEqual(list(ChatState._fields), ["question", "docs", "answer", "history"])
+        store = ChatState(history=[])
+        with self.assertRaises(AttributeError):
+            store.__dict__
+        store.answer = "42"
+        self.assertEqual(store["answer"], "42")
+
+    def test_versions_and_dirty_tracking(self):
+        store = QAState(question="q")
+        self.assertEqual(store.version("question"), 1)
+        self.assertEqual(store.version("answer"), 0)
+        store.mark_clean()
+        self.assertEqual(store.changes(), {})
+        store["answer"] = "a"
+        store.answer = "b"  # Attribute writes are tracked too
+        store["extra"] = 1
+        self.assertEqual(store.version("answer"), 2)
+        self.assertEqual(store.changes(), {"answer": "b", "extra": 1})
+        store.mark_clean()
+        self.assertEqual(store.changes(), {})
+
+    def test_deletions_reported(self):
+        store = QAState(question="q", answer="a", extra=1)
+        snap = store.snapshot()
+        store.mark_clean()
+        del store["answer"]
+        del store.question
+        del store["extra"]
+        expected = {"answer": DELETED, "question": DELETED, "extra": DELETED}
+        self.assertEqual(store.changes(), expected)
+        self.assertEqual(store.changes(since=snap), expected)
+
+    def test_snapshot_is_independent(self):
+        store = QAState(question="q", docs=["d1"])
+        snap = store.snapshot()
+        store["answer"] = "a"
+        store["question"] = "q2"
+        self.assertEqual(dict(snap), {"question": "q", "docs": ["d1"]})
+        self.assertEqual(snap.changes(), {})
+        self.assertEqual(store.changes(since=snap), {"answer": "a", "question": "q2"})
+        self.assertIs(snap["docs"], store["docs"])  # Values are shared, not copied
+
+    def test_pickle_round_trip(self):
+        store = QAState(question="q", extra={"k": 1})
+        restored = pickle.loads(pickle.dumps(store))
+        self.assertIsInstance(restored, QAState)
+        self.assertEqual(dict(restored), dict(store))
+        self.assertEqual(restored.version("question"), 1)
+        self.assertEqual(restored.changes(), {})
+        self.assertEqual(dict(copy.deepcopy(store)), dict(store))
+
+class AnswerNode(Node):
+    def prep(self, shared_storage):
+        return shared_storage["question"]
+
+    def exec(self, question):
+        return question.upper()
+
+    def post(self, shared_storage, prep_result, exec_result):
+        shared_storage["answer"] = exec_result
+
+class Crash(Exception):
+    pass
+
+class CrashOnce(Node):
+    crashed = False
+
+    def post(self, shared_storage, prep_result, exec_result):
+        if not CrashOnce.crashed:
+            CrashOnce.crashed = True
+            raise Crash()
+        shared_storage["docs"] = ["done"]
+
+class TestSharedStoreInFlows(unittest.TestCase):
+    def test_flow_with_store(self):
+        store = QAState(question="why?")
+        store.mark_clean()
+        Flow(start=AnswerNode()).run(store)
+        self.assertEqual(store.answer, "WHY?")
+        self.assertEqual(store.changes(), {"answer": "WHY?"})
+
+    def test_checkpoint_resume(self):
+        with tempfile.TemporaryDirectory() as d:
+            checkpoint = FileCheckpoint(os.path.join(d, "state.pkl"))
+            answer = AnswerNode()
+            answer >> CrashOnce()
+            flow = Flow(start=answer)
+            store = QAState(question="q")
+            with self.assertRaises(Crash):
+                flow.run(store, checkpoint=checkpoint)
+            resumed = QAState()
+            flow.resume(resumed, checkpoint)
+            self.assertEqual(dict(resumed), {"question": "q", "docs": ["done"], "answer": "Q"})
+
+    def test_parallel_batch_flow_merges_into_store(self):
+        class Count(Node):
+            def post(self, shared_storage, prep_result, exec_result):
+                shared_storage["docs"] = shared_storage["docs"] + [self.params["i"]]
+
+        class Fanout(ParallelBatchFlow):
+            def prep(self, shared_storage):
+                return [{"i": i} for i in range(3)]
+
+            def merge(self, shared_storage, prep_result, updates):
+                shared_storage["docs"] = sorted(d for u in updates for d in u["docs"])
+
+        store = QAState(docs=[])
+        store.mark_clean()
+        Fanout(start=Count(), max_workers=3).run(store)
+        self.assertEqual(store.docs, [0, 1, 2])
+        self.assertEqual(store.changes(), {"docs": [0, 1, 2]})
+
+if __name__ == '__main__':
+    unittest.main()
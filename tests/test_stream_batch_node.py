@@ -0,0 +1,101 @@
+import unittest
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import Node, StreamBatchNode, Flow, Profiler
+
+class LineCounter(StreamBatchNode):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.produced = 0
+        self.peak_in_flight = 0
+    
+    def prep(self, shared_storage):
+        for line in shared_storage['lines']:  # Lazily yields lines
+            self.produced += 1
+            yield line
+    
+    def exec(self, line):
+        if line == 'bad':
+            raise ValueError("bad line")
+        return len(line)
+    
+    def exec_fallback(self, prep_result, exc):
+        return -1
+    
+    def post_item(self, shared_storage, line, length):
+        shared_storage.setdefault('lengths', []).append(length)
+    
+    def post_batch(self, shared_storage, lines, lengths):
+        self.peak_in_flight = max(self.peak_in_flight, self.produced - shared_storage.get('flushed', 0))
+        shared_storage['flushed'] = shared_storage.get('flushed', 0) + len(lines)
+        shared_storage.setdefault('windows', []).append(sum(lengths))
+    
+    def post(self, shared_storage, prep_result, count):
+        shared_storage['count'] = count
+        shared_storage['peak_in_flight'] = self.peak_in_flight
+        return "done"
+
+class SlowStream(StreamBatchNode):
+    def prep(self, shared_storage):
+        return iter(range(6))
+    
+    def exec(self, item):
+        time.sleep(0.05)
+        return item * 2
+    
+    def post_batch(self, shared_storage, items, results):
+        shared_storage.setdefault('results', []).extend(results)
+
+class TestStreamBatchNode(unittest.TestCase):
+    def test_incremental_delivery(self):
+        shared_storage = {'lines': ['a', 'bb', 'ccc', 'dddd', 'e']}
+        action = LineCounter(window=2).run(shared_storage)
+        
+        self.assertEqual(action, "done")
+        self.assertEqual(shared_storage['lengths'], [1, 2, 3, 4, 1])
+        self.assertEqual(shared_storage['windows'], [3, 7, 1])
+        self.assertEqual(shared_storage['count'], 5)
+    
+    def test_memory_bounded_by_window(self):
+        """
+        Test that prep is consumed lazily, one window at a time
+        """
+        shared_storage = {'lines': ['x'] * 1000}
+        LineCounter(window=10).run(shared_storage)
+        self.assertEqual(shared_storage['peak_in_flight'], 10)
+        self.assertEqual(len(shared_storage['windows']), 100)
+    
+    def test_per_item_retry(self):
+        node = LineCounter(window=3, max_retries=2)
+        shared_storage = {'lines': ['ok', 'bad', 'fine']}
+        node.run(shared_storage)
+        self.assertEqual(shared_storage['lengths'], [2, -1, 4])
+    
+    def test_threaded_windows(self):
+        shared_storage = {}
+        start = time.perf_counter()
+        SlowStream(window=3, max_workers=3).run(shared_storage)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(shared_storage['results'], [0, 2, 4, 6, 8, 10])
+        self.assertLess(elapsed, 0.25)  # Two windows of 3 concurrent items
+    
+    def test_empty_and_in_flow(self):
+        shared_storage = {'lines': []}
+        after = Node()
+        node = LineCounter()
+        node - "done" >> after
+        Flow(start=node).run(shared_storage)
+        self.assertEqual(shared_storage['count'], 0)
+        self.assertNotIn('windows', shared_storage)
+    
+    def test_profiled(self):
+        with Profiler() as prof:
+            LineCounter(window=2).run({'lines': ['a', 'b', 'c']})
+        phases = {r['phase'] for r in prof.to_dict()['phases']}
+        self.assertEqual(phases, {'prep', 'exec', 'post'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pocketflow import AsyncNode, AsyncFlow, AsyncStreamNode, Stream
+
+class AsyncTokens(AsyncStreamNode):
+    """Yields `n` tokens, `delay` seconds apart, logging when each one is produced."""
+    def __init__(self, n=5, delay=0.02, **kwargs):
+        super().__init__(**kwargs)
+        self.n, self.delay = n, delay
+
+    async def prep_async(self, shared_storage):
+        return shared_storage.setdefault('log', [])
+
+    async def exec_async(self, log):
+        for i in range(self.n):
+            await asyncio.sleep(self.delay)
+            log.append(('produced', i))
+            yield f"t{i}"
+
+    async def post_async(self, shared_storage, prep_result, stream):
+        shared_storage['stream'] = stream
+
+class SyncTokens(AsyncStreamNode):
+    def prep(self, shared_storage):
+        return shared_storage.setdefault('log', [])
+
+    def exec(self, log):
+        for i in range(5):
+            time.sleep(0.02)  # e.g. a blocking SDK stream
+            log.append(('produced', i))
+            yield f"t{i}"
+
+    async def prep_async(self, shared_storage):
+        return self.prep(shared_storage)
+
+    async def post_async(self, shared_storage, prep_result, stream):
+        shared_storage['stream'] = stream
+
+class Consumer(AsyncNode):
+    async def prep_async(self, shared_storage):
+        return shared_storage['stream'], shared_storage['log']
+
+    async def exec_async(self, prep_result):
+        stream, log = prep_result
+        chunks = []
+        async for chunk in stream:
+            log.append(('consumed', chunk))
+            chunks.append(chunk)
+        return chunks
+
+    async def post_async(self, shared_storage, prep_result, exec_result):
+        shared_storage['chunks'] = exec_result
+
+class TestAsyncStreamNode(unittest.TestCase):
+    def assert_pipelined(self, log):
+        # The consumer sees the first chunk before the producer is done
+        self.assertLess(log.index(('consumed', 't0')), log.index(('produced', 4)))
+
+    def test_async_generator_is_pipelined(self):
+        producer = AsyncTokens()
+        producer >> Consumer()
+        shared_storage = {}
+        asyncio.run(AsyncFlow(start=producer).run_async(shared_storage))
+        self.assertEqual(shared_storage['chunks'], ["t0", "t1", "t2", "t3", "t4"])
+        self.assert_pipelined(shared_storage['log'])
+
+    def test_sync_generator_is_pipelined(self):
+        producer = SyncTokens()
+        producer >> Consumer()
+        shared_storage = {}
+        asyncio.run(AsyncFlow(start=producer).run_async(shared_storage))
+        self.assertEqual(shared_storage['chunks'], ["t0", "t1", "t2", "t3", "t4"])
+        self.assert_pipelined(shared_storage['log'])
+
+    def test_backpressure(self):
+        async def main():
+            shared_storage = {}
+            producer = AsyncTokens(n=20, delay=0, maxsize=2)
+            await producer.run_async(shared_storage)
+            await asyncio.sleep(0.05)  # Nobody consumes; the producer must stall
+            produced = len(shared_storage['log'])
+            chunks = await shared_storage['stream'].collect()
+            return produced, chunks
+        produced, chunks = asyncio.run(main())
+        self.assertLessEqual(produced, 3)
+        self.assertEqual(len(chunks), 20)
+
+    def test_exec_async_returning_iterable_is_retried(self):
+        class OpenStream(AsyncStreamNode):
+            attempts = 0
+            async def exec_async(self, prep_result):
+                OpenStream.attempts += 1
+                if OpenStream.attempts == 1:
+                    raise ConnectionError("connect failed")
+                return iter("abc")
+
+        async def main():
+            stream = await OpenStream(max_retries=2)._exec(None)
+            return await stream.collect(), stream.chunks
+        self.assertEqual(asyncio.run(main()), (["a", "b", "c"], 3))
+        self.assertEqual(OpenStream.attempts, 2)
+
+    def test_producer_error_reaches_consumer(self):
+        async def broken():
+            yield "ok"
+            raise ValueError("stream broke")
+
+        async def main():
+            stream = Stream(broken())
+            chunks = []
+            with self.assertRaises(ValueError):
+                async for chunk in stream:
+                    chunks.append(chunk)
+            return chunks
+        self.assertEqual(asyncio.run(main()), ["ok"])
+
+    def test_aclose_cancels_producer(self):
+        async def main():
+            shared_storage = {}
+            producer = AsyncTokens(n=100, delay=0.01, maxsize=1)
+            await producer.run_async(shared_storage)
+            stream = shared_storage['stream']
+            async for chunk in stream:
+                break  # Consumer only needs the first chunk
+            await stream.aclose()
+            await asyncio.sleep(0.05)
+            return len(shared_storage['log']), stream.task.cancelled()
+        produced, cancelled = asyncio.run(main())
+        self.assertTrue(cancelled)
+        self.assertLess(produced, 5)
+
+    def test_exhausted_stream_stays_exhausted(self):
+        async def main():
+            stream = Stream(iter([1, 2]))
+            first = await stream.collect()
+            second = await stream.collect()
+            return first, second
+        self.assertEqual(asyncio.run(main()), ([1, 2], []))
+
+if __name__ == '__main__':
+    unittest.main()